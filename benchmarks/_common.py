@@ -0,0 +1,57 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+"""
+Generate data for benchmarks.
+"""
+
+import json
+
+import numpy
+import pandas as pd
+
+
+def performance(n_problems, n_platforms, n_applications, seed=0):
+    """
+    Generate performance data in which every application runs on every
+    platform, except for approximately 10% of (platform, application) pairs.
+    """
+    rng = numpy.random.default_rng(seed)
+    problems = [f"problem{i}" for i in range(n_problems)]
+    platforms = [f"platform{i}" for i in range(n_platforms)]
+    applications = [f"application{i}" for i in range(n_applications)]
+    index = pd.MultiIndex.from_product(
+        [problems, platforms, applications],
+        names=["problem", "platform", "application"],
+    )
+    df = index.to_frame(index=False)
+    df["fom"] = rng.uniform(1, 10, len(df))
+    df.loc[rng.random(len(df)) < 0.1, "fom"] = numpy.nan
+    return df
+
+
+def coverage(n_platforms, n_applications, n_lines, seed=0):
+    """
+    Generate performance data for a single problem, and coverage data in
+    which each platform uses approximately half of a common code base of
+    n_lines lines, plus some platform-specific code.
+    """
+    rng = numpy.random.default_rng(seed)
+    df = performance(1, n_platforms, n_applications, seed)
+    df["coverage_key"] = [str(i) for i in range(len(df))]
+
+    strings = []
+    for p in range(len(df)):
+        common = numpy.flatnonzero(rng.random(n_lines) < 0.5)
+        specific = n_lines + numpy.arange(rng.integers(n_lines // 10 + 1))
+        used = numpy.concatenate([common, specific])
+        entry = {
+            "file": "file.cpp",
+            "id": "0",
+            "used_lines": used.tolist(),
+            "unused_lines": [],
+        }
+        strings.append(json.dumps([entry]))
+    cov = pd.DataFrame(
+        {"coverage_key": df["coverage_key"], "coverage": strings},
+    )
+    return df, cov
@@ -0,0 +1,121 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+"""
+Compare approximate (MinHash) and exact code divergence.
+
+The benchmarks follow the conventions of airspeed velocity (asv): time_*
+methods are timed, and track_* methods record the absolute error of the
+approximation. Running this file directly prints a summary instead.
+"""
+
+import os
+import time
+
+import numpy
+import pandas as pd
+
+import p3analysis
+
+_CASE_STUDIES = os.path.join(os.path.dirname(__file__), "..", "case-studies")
+
+
+def _babelstream():
+    """
+    Load the BabelStream case study.
+    """
+    path = os.path.join(_CASE_STUDIES, "babelstream")
+    df = pd.read_csv(os.path.join(path, "performance.csv"))
+    cov = pd.read_csv(os.path.join(path, "coverage.csv"))
+    df = p3analysis.data.projection(
+        df,
+        problem=["name"],
+        platform=["arch"],
+        application=["language"],
+    )
+    return df, cov
+
+
+def _synthetic(n_applications=4, n_platforms=16, n_files=10, seed=0):
+    """
+    Generate synthetic coverage, in which each platform uses a random subset
+    of a common code base plus some platform-specific code.
+    """
+    rng = numpy.random.default_rng(seed)
+    rows = []
+    coverage = []
+    for a in range(n_applications):
+        for p in range(n_platforms):
+            key = f"{a}-{p}"
+            entries = []
+            for f in range(n_files):
+                common = rng.choice(5000, 2500, replace=False)
+                specific = 5000 + p * 1000 + numpy.arange(rng.integers(1000))
+                lines = numpy.concatenate([common, specific])
+                entries.append(
+                    {
+                        "file": f"file{f}.cpp",
+                        "id": str(f),
+                        "used_lines": numpy.sort(lines).astype(numpy.int32),
+                        "unused_lines": numpy.zeros(0, dtype=numpy.int32),
+                    },
+                )
+            rows.append(("synthetic", f"app{a}", f"platform{p}", key))
+            coverage.append((key, entries))
+    df = pd.DataFrame(
+        rows,
+        columns=["problem", "application", "platform", "coverage_key"],
+    )
+    cov = pd.DataFrame(coverage, columns=["coverage_key", "coverage"])
+    return df, cov
+
+
+_DATASETS = {"babelstream": _babelstream, "synthetic": _synthetic}
+
+
+class ApproximateDivergence:
+    params = (list(_DATASETS), [32, 128, 512])
+    param_names = ["dataset", "num_perm"]
+
+    def setup(self, dataset, num_perm):
+        self.df, self.cov = _DATASETS[dataset]()
+        self.exact = p3analysis.metrics.divergence(self.df, self.cov)
+
+    def time_exact(self, dataset, num_perm):
+        p3analysis.metrics.divergence(self.df, self.cov)
+
+    def time_approximate(self, dataset, num_perm):
+        p3analysis.metrics.divergence(
+            self.df,
+            self.cov,
+            approximate=True,
+            num_perm=num_perm,
+        )
+
+    def track_max_error(self, dataset, num_perm):
+        approximate = p3analysis.metrics.divergence(
+            self.df,
+            self.cov,
+            approximate=True,
+            num_perm=num_perm,
+        )
+        error = approximate["divergence"] - self.exact["divergence"]
+        return float(error.abs().max())
+
+
+if __name__ == "__main__":
+    benchmark = ApproximateDivergence()
+    print("dataset      num_perm  exact (s)  approximate (s)  max error")
+    for dataset in _DATASETS:
+        for num_perm in ApproximateDivergence.params[1]:
+            benchmark.setup(dataset, num_perm)
+            start = time.perf_counter()
+            benchmark.time_exact(dataset, num_perm)
+            exact = time.perf_counter() - start
+            start = time.perf_counter()
+            benchmark.time_approximate(dataset, num_perm)
+            approximate = time.perf_counter() - start
+            error = benchmark.track_max_error(dataset, num_perm)
+            print(
+                f"{dataset:<12} {num_perm:>8} {exact:>10.3f} "
+                f"{approximate:>16.3f} {error:>10.4f}",
+            )
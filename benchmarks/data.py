@@ -0,0 +1,35 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import p3analysis
+
+from ._common import performance
+
+
+class Projection:
+    params = ([8, 64], [8, 64])
+    param_names = ["platforms", "applications"]
+
+    def setup(self, n_platforms, n_applications):
+        df = performance(16, n_platforms, n_applications)
+        self.df = df.rename(
+            columns={
+                "problem": "name",
+                "platform": "arch",
+                "application": "language",
+            },
+        )
+
+    def _projection(self):
+        return p3analysis.data.projection(
+            self.df,
+            problem=["name"],
+            platform=["arch"],
+            application=["language"],
+        )
+
+    def time_projection(self, n_platforms, n_applications):
+        self._projection()
+
+    def peakmem_projection(self, n_platforms, n_applications):
+        self._projection()
@@ -0,0 +1,50 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import p3analysis
+
+from ._common import coverage, performance
+
+
+class ApplicationEfficiency:
+    params = ([8, 64], [8, 64])
+    param_names = ["platforms", "applications"]
+
+    def setup(self, n_platforms, n_applications):
+        self.df = performance(16, n_platforms, n_applications)
+
+    def time_application_efficiency(self, n_platforms, n_applications):
+        p3analysis.metrics.application_efficiency(self.df)
+
+    def peakmem_application_efficiency(self, n_platforms, n_applications):
+        p3analysis.metrics.application_efficiency(self.df)
+
+
+class PerformancePortability:
+    params = ([8, 64], [8, 64])
+    param_names = ["platforms", "applications"]
+
+    def setup(self, n_platforms, n_applications):
+        # pp() requires one efficiency per (platform, application) pair
+        df = performance(1, n_platforms, n_applications)
+        self.effs = p3analysis.metrics.application_efficiency(df)
+
+    def time_pp(self, n_platforms, n_applications):
+        p3analysis.metrics.pp(self.effs)
+
+    def peakmem_pp(self, n_platforms, n_applications):
+        p3analysis.metrics.pp(self.effs)
+
+
+class Divergence:
+    params = ([4, 16], [1000, 10000])
+    param_names = ["platforms", "lines"]
+
+    def setup(self, n_platforms, n_lines):
+        self.df, self.cov = coverage(n_platforms, 4, n_lines)
+
+    def time_divergence(self, n_platforms, n_lines):
+        p3analysis.metrics.divergence(self.df, self.cov)
+
+    def peakmem_divergence(self, n_platforms, n_lines):
+        p3analysis.metrics.divergence(self.df, self.cov)
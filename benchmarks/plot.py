@@ -0,0 +1,61 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import importlib.util
+
+import matplotlib
+import matplotlib.pyplot as plt
+
+import p3analysis
+
+from ._common import coverage, performance
+
+matplotlib.use("Agg")
+
+
+def _require_backend(backend):
+    """
+    Skip benchmarks for backends with dependencies that are not installed.
+    """
+    if backend == "pgfplots" and importlib.util.find_spec("jinja2") is None:
+        raise NotImplementedError("The pgfplots backend requires jinja2.")
+
+
+class Cascade:
+    params = (["matplotlib", "pgfplots"], [4, 16], [4, 16])
+    param_names = ["backend", "platforms", "applications"]
+
+    def setup(self, backend, n_platforms, n_applications):
+        _require_backend(backend)
+        df = performance(1, n_platforms, n_applications)
+        self.effs = p3analysis.metrics.application_efficiency(df)
+
+    def teardown(self, backend, n_platforms, n_applications):
+        plt.close("all")
+
+    def time_cascade(self, backend, n_platforms, n_applications):
+        p3analysis.plot.cascade(self.effs, backend=backend)
+
+    def peakmem_cascade(self, backend, n_platforms, n_applications):
+        p3analysis.plot.cascade(self.effs, backend=backend)
+
+
+class NavChart:
+    params = (["matplotlib", "pgfplots"], [4, 16])
+    param_names = ["backend", "applications"]
+
+    def setup(self, backend, n_applications):
+        _require_backend(backend)
+        df, cov = coverage(4, n_applications, 1000)
+        effs = p3analysis.metrics.application_efficiency(df)
+        self.pp = p3analysis.metrics.pp(effs)
+        self.div = p3analysis.metrics.divergence(df, cov)
+
+    def teardown(self, backend, n_applications):
+        plt.close("all")
+
+    def time_navchart(self, backend, n_applications):
+        p3analysis.plot.navchart(self.pp, self.div, backend=backend)
+
+    def peakmem_navchart(self, backend, n_applications):
+        p3analysis.plot.navchart(self.pp, self.div, backend=backend)
@@ -0,0 +1,42 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import os
+import tempfile
+
+import matplotlib
+import matplotlib.pyplot as plt
+
+import p3analysis
+
+from ._common import coverage
+
+matplotlib.use("Agg")
+
+
+class Snapshot:
+    params = ([4, 16], [1000, 10000])
+    param_names = ["applications", "lines"]
+    timeout = 300
+
+    def setup(self, n_applications, n_lines):
+        self.df, self.cov = coverage(4, n_applications, n_lines)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.count = 0
+
+    def teardown(self, n_applications, n_lines):
+        plt.close("all")
+        self.tmp.cleanup()
+
+    def _snapshot(self):
+        # Each call must write to a new directory
+        self.count += 1
+        directory = os.path.join(self.tmp.name, f"snapshot{self.count}")
+        p3analysis.report.snapshot(self.df, self.cov, directory)
+        plt.close("all")
+
+    def time_snapshot(self, n_applications, n_lines):
+        self._snapshot()
+
+    def peakmem_snapshot(self, n_applications, n_lines):
+        self._snapshot()
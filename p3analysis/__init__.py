@@ -4,6 +4,7 @@
 import p3analysis.data
 import p3analysis.metrics
 import p3analysis.plot
+import p3analysis.profiling
 import p3analysis.report
 
 __version__ = "0.2.0"
@@ -0,0 +1,9 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import sys
+
+from p3analysis._cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
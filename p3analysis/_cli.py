@@ -0,0 +1,409 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+import pandas as pd
+
+import p3analysis
+from p3analysis.profiling import profile
+from p3analysis.profiling._profile import _stage
+
+# Files containing results for every problem, combined from the results of
+# each problem once all problems are complete.
+_RESULTS = ["efficiency.csv", "pp.csv", "divergence.csv"]
+
+# Results for each problem are written to a temporary directory, which is
+# renamed once the problem is complete.
+_TMP_SUFFIX = ".tmp"
+
+
+def _positive_int(string):
+    """
+    Convert a command-line argument to a positive integer.
+    """
+    try:
+        value = int(string)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError("must be a positive integer")
+    return value
+
+
+def _parser():
+    """
+    Return the parser for command-line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="p3analysis",
+        description="Calculate P3 metrics and generate plots and reports "
+        + "for every problem in a performance data file.",
+    )
+    parser.add_argument(
+        "performance",
+        help="performance data, as a CSV, Parquet or Arrow IPC file",
+    )
+    parser.add_argument(
+        "-c",
+        "--coverage",
+        metavar="PATH",
+        help="coverage data, as a CSV file (enables code divergence)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="DIR",
+        default="p3analysis-output",
+        help="directory in which to write results " + "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        metavar="N",
+        type=_positive_int,
+        default=1,
+        help="number of problems to process in parallel (default: 1)",
+    )
+    for label in ["problem", "application", "platform"]:
+        parser.add_argument(
+            f"--{label}",
+            metavar="COLUMN",
+            nargs="+",
+            help=f"columns defining the {label} (default: {label})",
+        )
+    parser.add_argument(
+        "--foms",
+        choices=["lower", "higher"],
+        default="lower",
+        help="whether lower or higher FOMs are better (default: lower)",
+    )
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="generate an HTML snapshot for each problem",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="discard results from previous runs instead of resuming",
+    )
+    return parser
+
+
+def _read_performance(path, options):
+    """
+    Read performance data, and project it onto the requested definitions
+    of problem, application and platform.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in [".parquet", ".arrow", ".feather", ".ipc"]:
+        df = p3analysis.data.read_performance(path)
+    else:
+        df = pd.read_csv(path)
+
+    definitions = [options.problem, options.application, options.platform]
+    if any(definitions):
+        df = p3analysis.data.projection(
+            df,
+            problem=options.problem or ["problem"],
+            application=options.application or ["application"],
+            platform=options.platform or ["platform"],
+        )
+    return df
+
+
+def _dirname(problem):
+    """
+    Return a unique directory name for a problem that is safe to use on
+    any filesystem.
+    """
+    name = str(problem)
+    digest = hashlib.sha256(name.encode()).hexdigest()[:12]
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("._")[:40]
+    return f"{slug}-{digest}" if slug else digest
+
+
+def _digest(df, cov, settings):
+    """
+    Return a digest identifying the inputs of a problem, used to decide
+    whether results from a previous run can be reused.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    digest.update(df.to_csv(index=False).encode())
+    if cov is not None:
+        digest.update(cov.to_csv(index=False).encode())
+    return digest.hexdigest()
+
+
+def _is_complete(path, digest):
+    """
+    Check whether a directory contains the complete results of a problem
+    with the same inputs.
+    """
+    try:
+        with open(os.path.join(path, "manifest.json")) as fp:
+            return json.load(fp)["digest"] == digest
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def _run_problem(task):
+    """
+    Process a single problem, writing results to a temporary directory that
+    is renamed once all results are written.
+
+    Returns the name of the problem and the stage records.
+    """
+    import matplotlib.pyplot as plt
+
+    matplotlib.use("Agg")
+    df = task["df"]
+    cov = task["cov"]
+    tmp = task["path"] + _TMP_SUFFIX
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    with profile() as profiler:
+        effs = p3analysis.metrics.application_efficiency(df, task["foms"])
+
+        # Only the latest result for each (platform, application) is used
+        latest = effs.drop_duplicates(
+            ["platform", "application"],
+            keep="last",
+            ignore_index=True,
+        ).dropna(subset=["app eff"])
+        pp = p3analysis.metrics.pp(latest)
+        div = None
+        if cov is not None:
+            div = p3analysis.metrics.divergence(
+                df,
+                cov,
+                n_jobs=task["n_jobs"],
+            )
+
+        with _stage("write"):
+            effs.to_csv(os.path.join(tmp, "efficiency.csv"), index=False)
+            pp.to_csv(os.path.join(tmp, "pp.csv"), index=False)
+            if div is not None:
+                div.to_csv(os.path.join(tmp, "divergence.csv"), index=False)
+
+        plt.figure(figsize=(6, 5))
+        p3analysis.plot.cascade(latest)
+        with _stage("savefig"):
+            plt.savefig(os.path.join(tmp, "cascade.png"), bbox_inches="tight")
+        plt.close("all")
+
+        if div is not None:
+            plt.figure(figsize=(5, 5))
+            p3analysis.plot.navchart(pp, div)
+            with _stage("savefig"):
+                plt.savefig(
+                    os.path.join(tmp, "navchart.png"),
+                    bbox_inches="tight",
+                )
+            plt.close("all")
+
+        if task["snapshot"] and cov is not None:
+            p3analysis.report.snapshot(
+                df,
+                cov,
+                os.path.join(tmp, "snapshot"),
+                foms=task["foms"],
+                n_jobs=task["n_jobs"],
+            )
+            plt.close("all")
+
+    # The manifest is written last, and the directory is only renamed once
+    # complete, so interrupted problems are always repeated
+    manifest = {"problem": str(task["problem"]), "digest": task["digest"]}
+    with open(os.path.join(tmp, "manifest.json"), "w") as fp:
+        json.dump(manifest, fp)
+    shutil.rmtree(task["path"], ignore_errors=True)
+    os.replace(tmp, task["path"])
+
+    return task["problem"], profiler.records
+
+
+def _combine(output, directories):
+    """
+    Combine the results of each problem into a single file per result,
+    reading the results of one problem at a time.
+
+    `directories` is a list of (directory, digest) pairs. Directories whose
+    results were not produced from the current inputs (e.g. results left
+    by a previous run, for a problem that failed in this run) are skipped.
+    """
+    directories = [
+        directory
+        for directory, digest in directories
+        if _is_complete(directory, digest)
+    ]
+    for name in _RESULTS:
+        tmp = os.path.join(output, name + _TMP_SUFFIX)
+        header = True
+        with open(tmp, "w", newline="") as fp:
+            for directory in directories:
+                path = os.path.join(directory, name)
+                if not os.path.exists(path):
+                    continue
+                pd.read_csv(path).to_csv(fp, header=header, index=False)
+                header = False
+        if header:
+            os.remove(tmp)
+            if os.path.exists(os.path.join(output, name)):
+                os.remove(os.path.join(output, name))
+        else:
+            os.replace(tmp, os.path.join(output, name))
+
+
+def _summary(records):
+    """
+    Summarize the time spent in each stage.
+    """
+    records = pd.DataFrame(
+        records,
+        columns=["stage", "parent", "wall time", "cpu time", "rows"],
+    )
+    summary = records.groupby("stage").agg(
+        calls=("wall time", "size"),
+        wall=("wall time", "sum"),
+        cpu=("cpu time", "sum"),
+    )
+    summary = summary.sort_values("wall", ascending=False)
+    summary.columns = ["calls", "wall time (s)", "cpu time (s)"]
+    return summary
+
+
+def main(argv=None):
+    """
+    Run the P3 Analysis Library from the command line.
+
+    Every problem in the performance data is processed independently, and
+    its results are written to a separate directory as soon as it is
+    complete. Problems with complete results from a previous run (using the
+    same inputs and settings) are skipped, so an interrupted run can be
+    resumed by running the same command again.
+
+    Parameters
+    ----------
+    argv: list, optional
+        The command-line arguments. If no value is provided, the arguments
+        passed to the Python interpreter are used.
+
+    Returns
+    -------
+    int
+        The exit status: 0 if every problem was processed successfully, and
+        1 otherwise.
+    """
+    matplotlib.use("Agg")
+    parser = _parser()
+    options = parser.parse_args(argv)
+    if options.snapshot and not options.coverage:
+        parser.error("--snapshot requires --coverage")
+    start = time.perf_counter()
+
+    with profile() as profiler:
+        with _stage("read"):
+            df = _read_performance(options.performance, options)
+            cov = None
+            if options.coverage:
+                cov = pd.read_csv(options.coverage, dtype={"coverage": str})
+
+    output = options.output
+    if options.restart:
+        shutil.rmtree(output, ignore_errors=True)
+    problems_dir = os.path.join(output, "problems")
+    os.makedirs(problems_dir, exist_ok=True)
+
+    settings = {"foms": options.foms, "snapshot": options.snapshot}
+    directories = []
+    tasks = []
+    skipped = 0
+    for problem, group in df.groupby("problem", sort=False):
+        group_cov = None
+        if cov is not None:
+            keys = group["coverage_key"].unique()
+            group_cov = cov[cov["coverage_key"].isin(keys)]
+        path = os.path.join(problems_dir, _dirname(problem))
+        digest = _digest(group, group_cov, settings)
+        directories.append((path, digest))
+        if _is_complete(path, digest):
+            skipped += 1
+            continue
+        tasks.append(
+            {
+                "problem": problem,
+                "df": group,
+                "cov": group_cov,
+                "path": path,
+                "digest": digest,
+                "foms": options.foms,
+                "snapshot": options.snapshot,
+                "n_jobs": None,
+            },
+        )
+
+    if skipped:
+        print(f"Skipping {skipped} problem(s) with complete results.")
+
+    records = profiler.records
+    failed = 0
+
+    def _report(i, task, error=None):
+        status = "done" if error is None else f"failed: {error}"
+        print(f"[{i}/{len(tasks)}] {task['problem']}: {status}", flush=True)
+        if error is not None:
+            # Results from a previous run are no longer valid
+            shutil.rmtree(task["path"], ignore_errors=True)
+
+    if options.jobs == 1 or len(tasks) < 2:
+        for i, task in enumerate(tasks, 1):
+            # A single problem can use all processes for divergence
+            task["n_jobs"] = options.jobs
+            try:
+                _, task_records = _run_problem(task)
+                records += task_records
+                _report(i, task)
+            except Exception as e:
+                failed += 1
+                _report(i, task, e)
+    else:
+        with ProcessPoolExecutor(max_workers=options.jobs) as executor:
+            futures = {
+                executor.submit(_run_problem, task): task for task in tasks
+            }
+            for i, future in enumerate(as_completed(futures), 1):
+                try:
+                    _, task_records = future.result()
+                    records += task_records
+                    _report(i, futures[future])
+                except Exception as e:
+                    failed += 1
+                    _report(i, futures[future], e)
+
+    with profile() as profiler:
+        with _stage("combine"):
+            _combine(output, directories)
+    records += profiler.records
+
+    print()
+    print("Stage timing summary (nested stages are included in parents):")
+    print(_summary(records).to_string(float_format="{:.3f}".format))
+    print(f"Total elapsed time: {time.perf_counter() - start:.3f}s")
+
+    if failed:
+        print(f"{failed} problem(s) failed.", file=sys.stderr)
+        return 1
+    return 0
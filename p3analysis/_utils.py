@@ -1,6 +1,9 @@
 # Copyright (c) 2022-2023 Intel Corporation
 # SPDX-License-Identifier: MIT
 
+import importlib
+
+import numpy
 import pandas as pd
 
 
@@ -32,3 +35,108 @@ def _cast_to_numeric(df, columns):
             msg = "Column '%s' must contain only numeric values."
             raise TypeError(msg % (column))
     return result
+
+
+def _subsets(n, max_size):
+    """
+    Enumerate all non-empty subsets of range(n) with at most max_size
+    elements, in lexicographic order.
+
+    Each subset is yielded alongside the subset it extends by one element
+    (or None), so that values can be computed incrementally.
+    """
+    stack = [(None, i) for i in reversed(range(n))]
+    while stack:
+        parent, i = stack.pop()
+        subset = (parent or ()) + (i,)
+        yield parent, subset
+        if len(subset) < max_size:
+            for j in reversed(range(i + 1, n)):
+                stack.append((subset, j))
+
+
+def _evaluate_subsets(
+    platforms,
+    max_size,
+    chunksize,
+    groups,
+    columns,
+    start,
+    extend,
+    evaluate,
+):
+    """
+    Generate DataFrames of values for all subsets of platforms, for each
+    (problem, application) pair in groups, each containing approximately
+    chunksize rows (or all rows, if chunksize is None).
+
+    The partial state of each subset is computed from the state of the
+    subset it extends: start(i) returns the state of the subset {i},
+    extend(state, i) returns the state of a subset extended by i, and
+    evaluate(state, size) returns an array of values with one row for each
+    group and one column for each of the named columns.
+    """
+    problems, applications = (pd.Index(values) for values in groups)
+    ngroups = len(problems)
+    n = len(platforms)
+
+    def _frame(subsets, results):
+        frame = pd.DataFrame(
+            {
+                "problem": numpy.tile(problems.to_numpy(), len(subsets)),
+                "application": numpy.tile(
+                    applications.to_numpy(),
+                    len(subsets),
+                ),
+                "platforms": [s for s in subsets for _ in range(ngroups)],
+            },
+        )
+        if results:
+            results = numpy.concatenate(results)
+        else:
+            results = numpy.zeros((0, len(columns)))
+        for c, column in enumerate(columns):
+            frame[column] = results[:, c]
+        return frame
+
+    partials = {}
+    subsets = []
+    results = []
+    for parent, subset in _subsets(n, max_size):
+        i = subset[-1]
+        if parent is None:
+            state = start(i)
+        else:
+            state = extend(partials[parent], i)
+        if len(subset) < max_size and i < n - 1:
+            partials[subset] = state
+
+        # Partial states are only required until all children are visited
+        if i == n - 1 and parent is not None:
+            del partials[parent]
+
+        result = evaluate(state, len(subset))
+        subsets.append(tuple(platforms[j] for j in subset))
+        results.append(numpy.reshape(result, (ngroups, len(columns))))
+
+        if chunksize and len(subsets) * ngroups >= chunksize:
+            yield _frame(subsets, results)
+            subsets = []
+            results = []
+
+    if subsets or not chunksize:
+        yield _frame(subsets, results)
+
+
+def _import_optional(name, extra):
+    """
+    Import an optional dependency, explaining how to install it if missing.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        msg = (
+            "This functionality requires the optional dependency '%s'. "
+            "Install it with: pip install p3analysis[%s]"
+        )
+        raise ImportError(msg % (name, extra))
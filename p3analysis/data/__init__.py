@@ -1,6 +1,25 @@
 # Copyright (c) 2022-2023 Intel Corporation
 # SPDX-License-Identifier: MIT
 
-from p3analysis.data._projection import projection
+from p3analysis.data._coverage import (
+    deduplicate_coverage,
+    parse_coverage,
+    read_coverage,
+)
+from p3analysis.data._performance import read_performance, write_performance
+from p3analysis.data._projection import projection, projection_iter
+from p3analysis.data._store import read_coverage_store, write_coverage_store
+from p3analysis.data._synthetic import synthetic
 
-__all__ = ["projection"]
+__all__ = [
+    "deduplicate_coverage",
+    "parse_coverage",
+    "projection",
+    "projection_iter",
+    "read_coverage",
+    "read_coverage_store",
+    "read_performance",
+    "synthetic",
+    "write_coverage_store",
+    "write_performance",
+]
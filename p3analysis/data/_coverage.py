@@ -0,0 +1,404 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import json
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import jsonschema
+import numpy
+import pandas as pd
+
+from p3analysis._utils import _require_columns
+from p3analysis.data._intervals import _to_array, _to_lines
+from p3analysis.data._trace import _CoverageTrace
+from p3analysis.data._validation import (
+    _coverage_validator,
+    _validate_coverage_json,
+)
+from p3analysis.profiling._profile import _staged
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+
+# The stages of parsing timed by parse_coverage
+_STAGES = ["decode", "validate", "convert"]
+
+
+def _iter_json_array(string):
+    """
+    Decode the elements of a JSON array one at a time.
+    """
+    index = _whitespace.match(string, 0).end()
+    if string[index : index + 1] != "[":
+        raise ValueError("Coverage data failed schema validation")
+    index = _whitespace.match(string, index + 1).end()
+
+    delimiter = string[index : index + 1]
+    while delimiter != "]":
+        element, index = _decoder.raw_decode(string, index)
+        yield element
+        index = _whitespace.match(string, index).end()
+        delimiter = string[index : index + 1]
+        if delimiter == ",":
+            index = _whitespace.match(string, index + 1).end()
+        elif delimiter != "]":
+            raise ValueError("Coverage data is not a valid JSON array")
+
+    if string[index + 1 :].strip():
+        raise ValueError("Coverage data is not a valid JSON array")
+
+
+def _parse_coverage(string, unused_lines=False, timings=None):
+    """
+    Parse a coverage string one entry at a time, storing lines as compact
+    NumPy arrays.
+
+    If timings is provided, the time spent in each stage is added to it.
+    """
+    if not isinstance(string, str):
+        raise TypeError("Coverage data must be a JSON string")
+    if timings is None:
+        timings = dict.fromkeys(_STAGES, 0.0)
+
+    validator = _coverage_validator(entry=True)
+    coverage = []
+    entries = _iter_json_array(string)
+    while True:
+        start = time.perf_counter()
+        entry = next(entries, entries)
+        decoded = time.perf_counter()
+        timings["decode"] += decoded - start
+        if entry is entries:
+            break
+
+        try:
+            validator.validate(entry)
+        except jsonschema.exceptions.ValidationError:
+            msg = "Coverage data failed schema validation"
+            raise ValueError(msg)
+        validated = time.perf_counter()
+        timings["validate"] += validated - decoded
+
+        entry["used_lines"] = _to_array(entry["used_lines"], numpy.int32)
+        if unused_lines:
+            entry["unused_lines"] = _to_array(
+                entry["unused_lines"],
+                numpy.int32,
+            )
+        else:
+            entry["unused_lines"] = numpy.empty(0, dtype=numpy.int32)
+        coverage.append(entry)
+        timings["convert"] += time.perf_counter() - validated
+    return coverage
+
+
+def _parse_chunk(strings, unused_lines):
+    """
+    Parse a list of coverage strings, returning the results and the time
+    spent in each stage.
+    """
+    timings = dict.fromkeys(_STAGES, 0.0)
+    results = [_parse_coverage(s, unused_lines, timings) for s in strings]
+    return results, timings
+
+
+@_staged("parse_coverage")
+def parse_coverage(
+    coverage,
+    *,
+    unused_lines=False,
+    n_jobs=None,
+    chunksize=16,
+    timings=None,
+):
+    """
+    Parse and validate a batch of coverage strings, storing lines of code as
+    compact NumPy arrays.
+
+    Decoding JSON and validating it against the coverage schema are both
+    CPU-bound, so coverage strings can be parsed by a pool of `n_jobs`
+    processes. Strings are submitted to the pool `chunksize` at a time, and
+    the results are returned in the same order as `coverage`.
+
+    Values that have already been parsed (e.g. by
+    :py:func:`p3analysis.data.read_coverage`) are validated but are not
+    converted, and are never sent to the pool.
+
+    Parameters
+    ----------
+    coverage: iterable
+        The coverage traces to parse. Each value must be a JSON string or a
+        list of coverage entries adhering to the P3 Analysis Library coverage
+        schema.
+
+    unused_lines: bool, default: False
+        Whether to keep the "unused_lines" of each coverage entry. If False,
+        "unused_lines" is replaced by an empty array, since these lines are
+        not required to calculate code divergence.
+
+    n_jobs: int, optional
+        The number of processes used to parse coverage strings. If no value
+        is provided, coverage strings are parsed in the current process.
+
+    chunksize: int, default: 16
+        The number of coverage strings submitted to a process at a time.
+
+    timings: dict, optional
+        If provided, the time (in seconds) spent in each stage is added to
+        this dictionary: "decode" (decoding JSON), "validate" (validating
+        against the coverage schema), "convert" (converting lines to arrays)
+        and "elapsed" (the wall-clock time of the whole call). The time spent
+        in each stage is summed over all processes.
+
+    Returns
+    -------
+    list
+        The coverage entries of each coverage trace, in the same order as
+        `coverage`.
+
+    Raises
+    ------
+    ValueError
+        If any coverage string fails to validate against the P3 coverage
+        schema.
+        If `n_jobs` or `chunksize` is not a positive integer.
+
+    TypeError
+        If any value in `coverage` is not a JSON string or a list.
+
+    Examples
+    --------
+    >>> timings = {}
+    >>> coverage = p3analysis.data.parse_coverage(
+    ...     cov["coverage"],
+    ...     n_jobs=8,
+    ...     timings=timings,
+    ... )
+    """
+    if n_jobs is not None and (not isinstance(n_jobs, int) or n_jobs < 1):
+        raise ValueError("'n_jobs' must be a positive integer.")
+    if not isinstance(chunksize, int) or chunksize < 1:
+        raise ValueError("'chunksize' must be a positive integer.")
+
+    start = time.perf_counter()
+    totals = dict.fromkeys(_STAGES, 0.0)
+    results = list(coverage)
+
+    # Values that are already parsed only need to be validated
+    strings = []
+    for i, value in enumerate(results):
+        if isinstance(value, str):
+            strings.append(i)
+        elif isinstance(value, list | _CoverageTrace):
+            validated = time.perf_counter()
+            results[i] = _validate_coverage_json(value)
+            totals["validate"] += time.perf_counter() - validated
+        else:
+            raise TypeError("Coverage data must be a JSON string or list")
+
+    chunks = [
+        [results[i] for i in strings[first : first + chunksize]]
+        for first in range(0, len(strings), chunksize)
+    ]
+    if n_jobs is None or n_jobs == 1 or len(chunks) < 2:
+        parsed = [_parse_chunk(chunk, unused_lines) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            parsed = list(
+                executor.map(
+                    _parse_chunk,
+                    chunks,
+                    [unused_lines] * len(chunks),
+                ),
+            )
+
+    # map() preserves the order of the chunks
+    indices = iter(strings)
+    for chunk, chunk_timings in parsed:
+        for value in chunk:
+            results[next(indices)] = value
+        for stage in _STAGES:
+            totals[stage] += chunk_timings[stage]
+
+    if timings is not None:
+        totals["elapsed"] = time.perf_counter() - start
+        for stage, seconds in totals.items():
+            timings[stage] = timings.get(stage, 0.0) + seconds
+    return results
+
+
+def read_coverage(path, *, unused_lines=False, chunksize=1000):
+    """
+    Read coverage data from a CSV file, storing lines of code as compact
+    NumPy arrays.
+
+    The file is read `chunksize` rows at a time, and each coverage string is
+    decoded one entry at a time. The list of lines in each entry is converted
+    to a :py:class:`numpy.ndarray` of 32-bit integers as soon as it is
+    decoded, such that peak memory usage is proportional to the size of
+    the compact representation rather than the size of the text.
+
+    The result can be passed as the `cov` argument of
+    :py:func:`p3analysis.metrics.divergence` and
+    :py:func:`p3analysis.report.snapshot`.
+
+    Parameters
+    ----------
+    path: str or path-like
+        The path to a CSV file storing coverage data. The following columns
+        are required: "coverage_key", "coverage".
+
+    unused_lines: bool, default: False
+        Whether to keep the "unused_lines" of each coverage entry. If False,
+        "unused_lines" is replaced by an empty array, since these lines are
+        not required to calculate code divergence.
+
+    chunksize: int, default: 1000
+        The number of rows to read from the CSV file at a time.
+
+    Returns
+    -------
+    DataFrame
+        A new pandas DataFrame storing the coverage data. Values of the
+        "coverage" column are lists of coverage entries.
+
+    Raises
+    ------
+    ValueError
+        If any of the required columns are missing.
+        If any coverage string fails to validate against the P3 coverage
+        schema.
+
+    TypeError
+        If any value in the "coverage" column is not a JSON string.
+    """
+    frames = []
+    reader = pd.read_csv(path, chunksize=chunksize, dtype={"coverage": str})
+    for chunk in reader:
+        _require_columns(chunk, ["coverage_key", "coverage"])
+        chunk["coverage"] = [
+            _parse_coverage(string, unused_lines)
+            for string in chunk["coverage"]
+        ]
+        frames.append(chunk)
+
+    if not frames:
+        return pd.DataFrame(columns=["coverage_key", "coverage"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def _canonical_coverage(coverage):
+    """
+    Convert coverage into a canonical JSON string, in which entries are
+    sorted by (file, id) and lines are sorted and unique.
+    """
+    entries = []
+    for entry in _validate_coverage_json(coverage):
+        entries.append(
+            {
+                "file": entry["file"],
+                "id": entry["id"],
+                "used_lines": numpy.unique(
+                    _to_lines(entry["used_lines"]),
+                ).tolist(),
+                "unused_lines": numpy.unique(
+                    _to_lines(entry["unused_lines"]),
+                ).tolist(),
+            },
+        )
+    entries.sort(key=lambda entry: (entry["file"], entry["id"]))
+    return json.dumps(entries, sort_keys=True, separators=(",", ":"))
+
+
+def deduplicate_coverage(df, cov=None):
+    """
+    Identify coverage data by its content, storing each distinct coverage
+    trace only once.
+
+    Each coverage trace is converted into a canonical form (with entries
+    sorted by file and lines sorted and unique) and identified by the
+    SHA-256 hash of that canonical form. Traces that differ only in the
+    order of their entries or lines are therefore stored once, and
+    functions accepting a `cov` argument process each distinct trace only
+    once.
+
+    Parameters
+    ----------
+    df: DataFrame
+        A pandas DataFrame storing performance data.
+
+        If `cov` is None, a "coverage" column is required. Values of the
+        "coverage" column must be coverage traces adhering to the P3 Analysis
+        Library coverage schema. Otherwise, a "coverage_key" column is
+        required.
+
+    cov: DataFrame, optional
+        A pandas DataFrame storing coverage data. The following columns are
+        required: "coverage_key", "coverage".
+
+        Values of the "coverage" column must be coverage traces adhering to the
+        P3 Analysis Library coverage schema.
+
+    Returns
+    -------
+    tuple of DataFrames
+        A new pandas DataFrame storing the performance data, in which the
+        "coverage_key" column stores the hash of each row's coverage (and
+        any "coverage" column is removed), and a new pandas DataFrame storing
+        each distinct coverage trace in its canonical form.
+
+    Raises
+    ------
+    ValueError
+        If any of the required columns are missing.
+        If any coverage string fails to validate against the P3 coverage
+        schema.
+        If any "coverage_key" in `df` is missing from `cov`.
+
+    TypeError
+        If any value in the "coverage" column is not a JSON string.
+
+    Examples
+    --------
+    >>> df, cov = p3analysis.data.deduplicate_coverage(df)
+    >>> div = p3analysis.metrics.divergence(df, cov)
+    """
+    if cov is None:
+        _require_columns(df, ["coverage"])
+        coverage = df["coverage"]
+    else:
+        _require_columns(df, ["coverage_key"])
+        _require_columns(cov, ["coverage_key", "coverage"])
+        coverage = cov.set_index("coverage_key")["coverage"]
+        coverage = coverage[~coverage.index.duplicated(keep="last")]
+        missing = ~df["coverage_key"].isin(coverage.index)
+        if missing.any():
+            key = df["coverage_key"][missing].iloc[0]
+            raise ValueError(f"No coverage data for coverage_key '{key}'.")
+
+    # Identical strings only need to be converted once
+    if coverage.map(lambda value: isinstance(value, str)).all():
+        unique = {string: None for string in coverage}
+        for string in unique:
+            unique[string] = _canonical_coverage(string)
+        canonical = coverage.map(unique)
+    else:
+        canonical = coverage.apply(_canonical_coverage)
+    keys = canonical.apply(
+        lambda string: hashlib.sha256(string.encode()).hexdigest(),
+    )
+
+    result = df.drop(columns=["coverage"], errors="ignore")
+    if cov is None:
+        result["coverage_key"] = keys
+    else:
+        result["coverage_key"] = df["coverage_key"].map(keys)
+
+    unique = pd.DataFrame(
+        {"coverage_key": keys.to_numpy(), "coverage": canonical.to_numpy()},
+    )
+    unique = unique.drop_duplicates("coverage_key", ignore_index=True)
+    return result, unique
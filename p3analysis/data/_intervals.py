@@ -0,0 +1,96 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import numbers
+
+import numpy
+
+
+def _to_array(lines, dtype=numpy.int64):
+    """
+    Convert a list of lines into a NumPy array.
+
+    If the list contains only line numbers, the result is a one-dimensional
+    array of line numbers. Otherwise, the result is an array of inclusive
+    [start, end] intervals, in which each line number is an interval of one.
+
+    Line numbers may be any number (e.g. integral floats such as 1.0, which
+    the coverage schema accepts as integers), and are cast to `dtype`.
+
+    Raises
+    ------
+    ValueError
+        If any item is neither a line number nor a [start, end] interval.
+    """
+    if isinstance(lines, numpy.ndarray):
+        return lines.astype(dtype, copy=False)
+    scalars = [isinstance(line, numbers.Number) for line in lines]
+    if all(scalars):
+        return numpy.array(lines, dtype=dtype)
+    intervals = []
+    for line, scalar in zip(lines, scalars):
+        if scalar:
+            intervals.append([line, line])
+        elif isinstance(line, list | tuple | numpy.ndarray) and len(line) == 2:
+            intervals.append(line)
+        else:
+            raise ValueError(
+                "Each line must be a line number or a [start, end] interval.",
+            )
+    return numpy.array(intervals, dtype=dtype).reshape(-1, 2)
+
+
+def _to_intervals(lines):
+    """
+    Convert a list of lines into sorted, non-overlapping, half-open
+    intervals of lines.
+
+    Returns
+    -------
+    tuple of ndarray
+        The start and end of each interval.
+
+    Raises
+    ------
+    ValueError
+        If the end of any interval precedes its start.
+    """
+    array = _to_array(lines)
+    if array.ndim == 1:
+        starts = array
+        ends = array + 1
+    else:
+        starts = array[:, 0]
+        ends = array[:, 1] + 1
+        if (ends <= starts).any():
+            raise ValueError(
+                "The end of an interval must not precede its start.",
+            )
+
+    if len(starts) == 0:
+        return starts, ends
+
+    order = numpy.argsort(starts, kind="stable")
+    starts = starts[order]
+    ends = ends[order]
+
+    # Merge intervals that overlap with (or are adjacent to) the previous one
+    reach = numpy.maximum.accumulate(ends)
+    gaps = numpy.flatnonzero(starts[1:] > reach[:-1]) + 1
+    first = numpy.concatenate([[0], gaps])
+    return starts[first], numpy.maximum.reduceat(ends, first)
+
+
+def _to_lines(lines):
+    """
+    Convert a list of lines into a one-dimensional array of line numbers,
+    expanding any intervals.
+    """
+    array = _to_array(lines)
+    if array.ndim == 1:
+        return array
+    starts, ends = _to_intervals(array)
+    lengths = ends - starts
+    offsets = numpy.cumsum(lengths) - lengths
+    positions = numpy.arange(lengths.sum())
+    return numpy.repeat(starts - offsets, lengths) + positions
@@ -0,0 +1,171 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import os
+
+import pandas as pd
+
+from p3analysis._utils import _import_optional, _require_columns
+
+_FORMATS = {
+    ".parquet": "parquet",
+    ".arrow": "ipc",
+    ".feather": "ipc",
+    ".ipc": "ipc",
+}
+
+_LABELS = ["problem", "application", "platform"]
+
+
+def _format(path, format):
+    """
+    Determine the file format from the format argument or the file extension.
+    """
+    if format is None:
+        extension = os.path.splitext(os.fspath(path))[1].lower()
+        if extension not in _FORMATS:
+            msg = "Cannot infer format from extension '%s'. Use one of: %s"
+            raise ValueError(msg % (extension, list(_FORMATS.keys())))
+        return _FORMATS[extension]
+    if format not in ["parquet", "ipc"]:
+        raise ValueError("'format' must be 'parquet' or 'ipc'.")
+    return format
+
+
+def write_performance(df, path, format=None):
+    """
+    Write projected performance data to a Parquet or Arrow IPC file.
+
+    The "problem", "application" and "platform" columns are stored as
+    dictionary-encoded columns, and the "fom" column is stored as 64-bit
+    floating-point values. All other columns are stored with their pandas
+    data types, so no information is lost when the file is read back with
+    :py:func:`p3analysis.data.read_performance`.
+
+    Requires the optional dependency :py:mod:`pyarrow`.
+
+    Parameters
+    ----------
+    df: DataFrame
+        A pandas DataFrame storing projected performance data. The following
+        columns are required: "problem", "application", "platform".
+
+    path: str or path-like
+        The path of the file to write.
+
+    format: str, {"parquet", "ipc"}, optional
+        The file format to use. If no value is provided, the format is
+        inferred from the extension of `path`: ".parquet" for Parquet, or
+        ".arrow", ".feather" or ".ipc" for Arrow IPC.
+
+    Raises
+    ------
+    ValueError
+        If any of the required columns are missing from `df`.
+        If the format is not supported, or cannot be inferred.
+
+    TypeError
+        If any value in the "fom" column of `df` is a non-numeric value.
+
+    ImportError
+        If :py:mod:`pyarrow` is not installed.
+    """
+    _require_columns(df, _LABELS)
+    format = _format(path, format)
+    pa = _import_optional("pyarrow", "arrow")
+
+    df = df.astype({label: "category" for label in _LABELS})
+    if "fom" in df:
+        try:
+            df = df.astype({"fom": "float64"})
+        except (TypeError, ValueError):
+            raise TypeError("Column 'fom' must contain only numeric values.")
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if format == "parquet":
+        pq = _import_optional("pyarrow.parquet", "arrow")
+        pq.write_table(table, path)
+    else:
+        feather = _import_optional("pyarrow.feather", "arrow")
+        feather.write_feather(table, path)
+
+
+def read_performance(
+    path,
+    columns=None,
+    *,
+    problem=None,
+    application=None,
+    platform=None,
+    format=None,
+):
+    """
+    Read projected performance data from a Parquet or Arrow IPC file.
+
+    Only the requested columns are read, and rows are filtered by problem,
+    application and platform while the file is read, such that rows that
+    are not required are skipped (where the file format allows).
+
+    Requires the optional dependency :py:mod:`pyarrow`.
+
+    Parameters
+    ----------
+    path: str or path-like
+        The path of a file written by
+        :py:func:`p3analysis.data.write_performance`.
+
+    columns: list, optional
+        The names of the columns to read. If no value is provided, all
+        columns are read.
+
+    problem,application,platform: list, optional
+        If provided, only rows with a "problem", "application" or "platform"
+        in the corresponding list are read.
+
+    format: str, {"parquet", "ipc"}, optional
+        The file format to use. If no value is provided, the format is
+        inferred from the extension of `path`.
+
+    Returns
+    -------
+    DataFrame
+        A new pandas DataFrame storing the projected performance data.
+
+    Raises
+    ------
+    ValueError
+        If the format is not supported, or cannot be inferred.
+
+    TypeError
+        If `columns`, `problem`, `application` or `platform` are not lists.
+
+    ImportError
+        If :py:mod:`pyarrow` is not installed.
+    """
+    format = _format(path, format)
+    ds = _import_optional("pyarrow.dataset", "arrow")
+
+    if columns is not None and not isinstance(columns, list):
+        raise TypeError("'columns' must be a list.")
+
+    expression = None
+    for label, values in zip(_LABELS, [problem, application, platform]):
+        if values is None:
+            continue
+        if not isinstance(values, list):
+            raise TypeError(f"'{label}' must be a list.")
+        condition = ds.field(label).isin(values)
+        if expression is not None:
+            condition = expression & condition
+        expression = condition
+
+    dataset = ds.dataset(path, format=format)
+    table = dataset.to_table(columns=columns, filter=expression)
+
+    # Restore dictionary-encoded labels to the type of their values, so that
+    # missing and non-string labels are preserved
+    df = table.to_pandas()
+    for label in _LABELS:
+        if label in df and isinstance(df[label].dtype, pd.CategoricalDtype):
+            df[label] = df[label].astype(df[label].cat.categories.dtype)
+    return df
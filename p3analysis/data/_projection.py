@@ -4,6 +4,7 @@
 import pandas as pd
 
 from p3analysis._utils import _require_columns
+from p3analysis.profiling._profile import _staged
 
 
 def _join(series):
@@ -28,6 +29,37 @@ def _collapse(df, columns, name):
     df[name] = df[name].astype(str)
 
 
+def _check_definitions(problem, application, platform):
+    """
+    Check that each projection definition is a list of column names.
+    """
+    for definition in [problem, application, platform]:
+        if not isinstance(definition, list):
+            raise TypeError("Projection definition must be a list.")
+        for column in definition:
+            if not isinstance(column, str):
+                raise TypeError("Column name(s) must be a string.")
+
+
+def _project(df, problem, application, platform, deep):
+    """
+    Project a DataFrame, copying the data in all of its columns if deep is
+    True, or only its column labels otherwise.
+    """
+    definitions = problem + application + platform
+    _require_columns(df, definitions)
+
+    result = df.copy(deep=deep)
+
+    # Create new columns for problem, application and platform
+    _collapse(result, problem, "problem")
+    _collapse(result, application, "application")
+    _collapse(result, platform, "platform")
+
+    return result
+
+
+@_staged("projection")
 def projection(
     df,
     problem=["problem"],
@@ -88,21 +120,60 @@ def projection(
     0  1.0  DGEMM-1024-1024-1024     OpenMP-master  CPU-gcc
     1  2.0  DGEMM-1024-1024-1024  OpenMP-optimized  CPU-icc
     """
-    for definition in [problem, application, platform]:
-        if not isinstance(definition, list):
-            raise TypeError("Projection definition must be a list.")
-        for column in definition:
-            if not isinstance(column, str):
-                raise TypeError("Column name(s) must be a string.")
+    _check_definitions(problem, application, platform)
+    return _project(df, problem, application, platform, deep=True)
 
-    definitions = problem + application + platform
-    _require_columns(df, definitions)
 
-    result = df.copy(deep=True)
+def projection_iter(
+    chunks,
+    problem=["problem"],
+    application=["application"],
+    platform=["platform"],
+):
+    """
+    Project chunks of data onto definitions of problem, application and
+    platform.
 
-    # Create new columns for problem, application and platform
-    _collapse(result, problem, "problem")
-    _collapse(result, application, "application")
-    _collapse(result, platform, "platform")
+    Each chunk is projected as it is read, without copying the data in any
+    of its columns, so that data that does not fit in memory can be
+    projected one chunk at a time (e.g. when reading a file with
+    :py:func:`pandas.read_csv` and a `chunksize`).
 
-    return result
+    Parameters
+    ----------
+    chunks : iterable of DataFrames
+        Pandas DataFrames storing raw performance data.
+
+    problem,application,platform : list,optional
+        A list of column names in each chunk that define the required
+        projection. See :py:func:`p3analysis.data.projection`.
+
+    Returns
+    -------
+    iterator of DataFrames
+        An iterator of new pandas DataFrames storing the projected data for
+        each chunk.
+
+    Raises
+    ------
+    ValueError
+        If any of the column names provided in `problem`, `application` or
+        `platform` are missing from a chunk.
+
+    TypeError
+        If `problem`, `application` or `platform` are not lists of strings.
+
+    Examples
+    --------
+    >>> chunks = pd.read_csv("performance.csv", chunksize=100000)
+    >>> for chunk in p3analysis.data.projection_iter(chunks,
+    ...                                              problem=["kernel"],
+    ...                                              application=["language"],
+    ...                                              platform=["compiler"]):
+    ...     chunk.to_csv("projected.csv", mode="a")
+    """
+    _check_definitions(problem, application, platform)
+    return (
+        _project(chunk, problem, application, platform, deep=False)
+        for chunk in chunks
+    )
@@ -0,0 +1,182 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+
+import numpy
+import pandas as pd
+
+from p3analysis._utils import _require_columns
+from p3analysis.data._intervals import _to_intervals
+from p3analysis.data._trace import _CoverageTrace
+from p3analysis.data._validation import _validate_coverage_json
+
+_VERSION = 2
+
+# Arrays stored in a coverage store, each as a separate .npy file:
+# - entries: the index of the (file, id) pair for each entry
+# - offsets: the first entry of each coverage trace (and the total)
+# - used_offsets: the first used interval of each entry (and the total)
+# - used_starts, used_ends: the half-open intervals of used lines
+# - unused_offsets: the first unused interval of each entry (and the total)
+# - unused_starts, unused_ends: the half-open intervals of unused lines
+_ARRAYS = [
+    "entries",
+    "offsets",
+    "used_offsets",
+    "used_starts",
+    "used_ends",
+    "unused_offsets",
+    "unused_starts",
+    "unused_ends",
+]
+
+
+def _concatenate(arrays, dtype):
+    """
+    Concatenate a list of arrays, returning the result and offsets.
+    """
+    sizes = numpy.array([len(a) for a in arrays], dtype=numpy.int64)
+    offsets = numpy.zeros(len(arrays) + 1, dtype=numpy.int64)
+    numpy.cumsum(sizes, out=offsets[1:])
+    if arrays:
+        values = numpy.concatenate(arrays).astype(dtype, copy=False)
+    else:
+        values = numpy.empty(0, dtype=dtype)
+    return values, offsets
+
+
+def write_coverage_store(cov, directory):
+    """
+    Write coverage data to a binary columnar coverage store.
+
+    A coverage store is a directory containing a JSON index (storing the
+    coverage keys and a dictionary of unique (file, id) pairs) and a set of
+    NumPy ``.npy`` files storing the lines of all coverage entries as flat
+    arrays of 32-bit integers, with offsets marking where each entry begins.
+    The lines of each entry are sorted and merged into intervals, and only
+    the start and end of each interval are stored, so runs of consecutive
+    lines take the same space regardless of their length. Reading a coverage
+    store does not require any text to be parsed.
+
+    Parameters
+    ----------
+    cov: DataFrame
+        A pandas DataFrame storing coverage data. The following columns are
+        required: "coverage_key", "coverage".
+
+        Values of the "coverage" column must be coverage traces adhering to the
+        P3 Analysis Library coverage schema.
+
+    directory: str or path-like
+        The directory in which to create the coverage store.
+
+    Raises
+    ------
+    ValueError
+        If any of the required columns are missing.
+        If any coverage string fails to validate against the P3 coverage
+        schema.
+
+    TypeError
+        If any value in the "coverage" column is not a JSON string.
+
+    FileExistsError
+        If the directory specified by `directory` already exists.
+    """
+    _require_columns(cov, ["coverage_key", "coverage"])
+
+    files = {}
+    entries = []
+    offsets = [0]
+    intervals = {"used": ([], []), "unused": ([], [])}
+    for coverage in cov["coverage"]:
+        for entry in _validate_coverage_json(coverage):
+            unique_fn = (entry["file"], entry["id"])
+            entries.append(files.setdefault(unique_fn, len(files)))
+            for kind, (starts, ends) in intervals.items():
+                s, e = _to_intervals(entry[f"{kind}_lines"])
+                starts.append(s)
+                ends.append(e)
+        offsets.append(len(entries))
+
+    arrays = {}
+    arrays["entries"] = numpy.array(entries, dtype=numpy.int32)
+    arrays["offsets"] = numpy.array(offsets, dtype=numpy.int64)
+    for kind, (starts, ends) in intervals.items():
+        values, kind_offsets = _concatenate(starts, numpy.int32)
+        arrays[f"{kind}_starts"] = values
+        arrays[f"{kind}_offsets"] = kind_offsets
+        arrays[f"{kind}_ends"], _ = _concatenate(ends, numpy.int32)
+
+    index = {
+        "version": _VERSION,
+        "keys": cov["coverage_key"].tolist(),
+        "files": [list(unique_fn) for unique_fn in files],
+    }
+
+    os.makedirs(directory, exist_ok=False)
+    with open(os.path.join(directory, "index.json"), "x") as fp:
+        json.dump(index, fp)
+    for name in _ARRAYS:
+        with open(os.path.join(directory, f"{name}.npy"), "xb") as fp:
+            numpy.save(fp, arrays[name], allow_pickle=False)
+
+
+def read_coverage_store(directory, *, mmap=True):
+    """
+    Read coverage data from a binary columnar coverage store.
+
+    Each coverage trace is returned as a lightweight view of arrays that are
+    memory-mapped from disk (unless `mmap` is False), so that loading
+    coverage data does not require any copies. The result can be passed as
+    the `cov` argument of :py:func:`p3analysis.metrics.divergence`, which
+    reads the intervals of used lines directly from the stored arrays.
+
+    Parameters
+    ----------
+    directory: str or path-like
+        The directory containing a coverage store created by
+        :py:func:`p3analysis.data.write_coverage_store`.
+
+    mmap: bool, default: True
+        Whether to memory-map the stored arrays, rather than reading them into
+        memory.
+
+    Returns
+    -------
+    DataFrame
+        A new pandas DataFrame storing the coverage data. Values of the
+        "coverage" column are sequences of coverage entries, which are
+        converted into dictionaries only when accessed. The "used_lines" and
+        "unused_lines" of each entry are NumPy arrays of inclusive
+        [start, end] intervals.
+
+    Raises
+    ------
+    ValueError
+        If the coverage store was written by an unsupported version.
+    """
+    with open(os.path.join(directory, "index.json")) as fp:
+        index = json.load(fp)
+    if index.get("version") != _VERSION:
+        raise ValueError("Unsupported coverage store version.")
+
+    mmap_mode = "r" if mmap else None
+    arrays = {}
+    for name in _ARRAYS:
+        path = os.path.join(directory, f"{name}.npy")
+        arrays[name] = numpy.load(path, mmap_mode=mmap_mode)
+
+    files = [tuple(unique_fn) for unique_fn in index["files"]]
+    offsets = arrays["offsets"].tolist()
+    return pd.DataFrame(
+        {
+            "coverage_key": index["keys"],
+            "coverage": [
+                _CoverageTrace(arrays, files, offsets[i], offsets[i + 1])
+                for i in range(len(index["keys"]))
+            ],
+        },
+    )
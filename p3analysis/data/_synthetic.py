@@ -0,0 +1,217 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+
+import numpy
+import pandas as pd
+
+
+def _check_count(value, name):
+    """
+    Check that value is a positive integer.
+    """
+    if not isinstance(value, int) or value < 1:
+        raise ValueError(f"'{name}' must be a positive integer.")
+
+
+def _check_fraction(value, name):
+    """
+    Check that value is a number in the range [0, 1].
+    """
+    if not isinstance(value, int | float) or not 0 <= value <= 1:
+        raise ValueError(f"'{name}' must be in range [0, 1].")
+
+
+def _performance(rng, problem, platforms, applications, support_density):
+    """
+    Generate performance data for a single problem.
+
+    Each platform has a base FOM, and each application is slower than the
+    base by a random factor. Applications do not support a platform (and
+    have no FOM) with probability 1 - support_density.
+    """
+    n_platforms = len(platforms)
+    n_applications = len(applications)
+    base = rng.uniform(1, 10, size=(n_platforms, 1))
+    factor = rng.uniform(1, 4, size=(n_platforms, n_applications))
+    fom = base * factor
+    fom[rng.random((n_platforms, n_applications)) >= support_density] = (
+        numpy.nan
+    )
+    return pd.DataFrame(
+        {
+            "problem": problem,
+            "platform": numpy.repeat(platforms, n_applications),
+            "application": numpy.tile(applications, n_platforms),
+            "fom": fom.ravel(),
+            "coverage_key": [
+                f"{application}-{platform}"
+                for platform in platforms
+                for application in applications
+            ],
+        },
+    )
+
+
+def _coverage(rng, application, platforms, n_lines, sharing):
+    """
+    Generate coverage data for a single application.
+
+    The first (sharing * n_lines) lines are used by every platform, and each
+    of the remaining lines is used by exactly one platform.
+    """
+    n_platforms = len(platforms)
+    n_shared = round(sharing * n_lines)
+    owners = rng.integers(n_platforms, size=n_lines - n_shared)
+    order = numpy.argsort(owners, kind="stable")
+    offsets = numpy.searchsorted(owners[order], numpy.arange(n_platforms + 1))
+    specific = (order + n_shared).tolist()
+
+    strings = []
+    for p in range(n_platforms):
+        used_lines = specific[offsets[p] : offsets[p + 1]]
+        if n_shared > 0:
+            used_lines = [[0, n_shared - 1]] + used_lines
+        entry = {
+            "file": f"{application}.cpp",
+            "id": application,
+            "used_lines": used_lines,
+            "unused_lines": [],
+        }
+        strings.append(json.dumps([entry]))
+    return pd.DataFrame(
+        {
+            "coverage_key": [
+                f"{application}-{platform}" for platform in platforms
+            ],
+            "coverage": strings,
+        },
+    )
+
+
+def synthetic(
+    n_problems=1,
+    n_platforms=4,
+    n_applications=4,
+    n_lines=1000,
+    support_density=1.0,
+    seed=None,
+    *,
+    sharing=0.5,
+    directory=None,
+):
+    """
+    Generate synthetic performance and coverage data.
+
+    The performance data contains a row for every (problem, platform,
+    application), but each application is only run on a random selection
+    of platforms for each problem (controlled by `support_density`); the
+    "fom" of an application that was not run is NaN. Each application has
+    its own code base of `n_lines` lines. A fraction of these lines
+    (controlled by `sharing`) is used by every platform, and each of the
+    remaining lines is used by exactly one platform, so code divergence
+    decreases as `sharing` increases. No lines are shared by a subset of
+    the platforms: each line is either shared by all platforms or specific
+    to one. Coverage does not depend on the problem, so the coverage data
+    contains one trace for each (application, platform) pair.
+
+    Parameters
+    ----------
+    n_problems, n_platforms, n_applications: int
+        The number of problems, platforms and applications.
+
+    n_lines: int, default: 1000
+        The number of lines of code in each application.
+
+    support_density: float, default: 1.0
+        The probability that an application is run on a platform, chosen
+        independently for each problem. The "fom" of an application that
+        was not run on a platform is NaN.
+
+    seed: int, optional
+        A seed for the random number generator.
+
+    sharing: float, default: 0.5
+        The fraction of each application's lines of code that is used by
+        every platform.
+
+    directory: str or path-like, optional
+        If provided, the data is written to "performance.csv" and
+        "coverage.csv" in this directory one problem and one application at
+        a time, so that datasets larger than the available memory can be
+        generated. The results are the same as those returned when no
+        directory is provided. The files can be read with
+        :py:func:`pandas.read_csv` and
+        :py:func:`p3analysis.data.read_coverage`.
+
+    Returns
+    -------
+    tuple of DataFrames or None
+        A new pandas DataFrame storing performance data (with columns
+        "problem", "platform", "application", "fom" and "coverage_key"), and
+        a new pandas DataFrame storing coverage data (with columns
+        "coverage_key" and "coverage"). If `directory` is provided, nothing
+        is returned.
+
+    Raises
+    ------
+    ValueError
+        If `n_problems`, `n_platforms`, `n_applications` or `n_lines` is not
+        a positive integer.
+        If `support_density` or `sharing` is not in range [0, 1].
+
+    FileExistsError
+        If the directory specified by `directory` already exists.
+
+    Examples
+    --------
+    >>> df, cov = p3analysis.data.synthetic(n_platforms=8, seed=42)
+    >>> div = p3analysis.metrics.divergence(df, cov)
+    """
+    _check_count(n_problems, "n_problems")
+    _check_count(n_platforms, "n_platforms")
+    _check_count(n_applications, "n_applications")
+    _check_count(n_lines, "n_lines")
+    _check_fraction(support_density, "support_density")
+    _check_fraction(sharing, "sharing")
+
+    problems = [f"problem{i}" for i in range(n_problems)]
+    platforms = [f"platform{i}" for i in range(n_platforms)]
+    applications = [f"application{i}" for i in range(n_applications)]
+
+    # Performance and coverage use independent random streams, so that
+    # the results do not depend on the order in which they are generated
+    performance_rng, coverage_rng = [
+        numpy.random.default_rng(s)
+        for s in numpy.random.SeedSequence(seed).spawn(2)
+    ]
+    performance = (
+        _performance(
+            performance_rng,
+            problem,
+            platforms,
+            applications,
+            support_density,
+        )
+        for problem in problems
+    )
+    coverage = (
+        _coverage(coverage_rng, application, platforms, n_lines, sharing)
+        for application in applications
+    )
+
+    if directory is None:
+        df = pd.concat(performance, ignore_index=True)
+        cov = pd.concat(coverage, ignore_index=True)
+        return df, cov
+
+    os.makedirs(directory, exist_ok=False)
+    for name, frames in [
+        ("performance.csv", performance),
+        ("coverage.csv", coverage),
+    ]:
+        with open(os.path.join(directory, name), "x", newline="") as fp:
+            for i, frame in enumerate(frames):
+                frame.to_csv(fp, header=(i == 0), index=False)
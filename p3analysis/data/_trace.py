@@ -0,0 +1,101 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import collections.abc
+
+import numpy
+
+
+class _CoverageTrace(collections.abc.Sequence):
+    """
+    A coverage trace read from a coverage store.
+
+    A trace is a range of entries in arrays shared by all traces in the
+    store, which hold the (file, id) pair of each entry and the half-open
+    intervals of lines used and unused by each entry. Entries are only
+    converted into dictionaries when accessed, storing lines as arrays of
+    inclusive [start, end] intervals. Coverage traces are validated when
+    the store is written, and are not validated again.
+    """
+
+    def __init__(self, arrays, files, first, last):
+        self._arrays = arrays
+        self._files = files
+        self._first = first
+        self._last = last
+
+    def __len__(self):
+        return self._last - self._first
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("coverage entry index out of range")
+
+        e = self._first + index
+        fn, id = self._files[self._arrays["entries"][e]]
+        used_starts, used_ends = self._intervals("used", e, e + 1)
+        unused_starts, unused_ends = self._intervals("unused", e, e + 1)
+        return {
+            "file": fn,
+            "id": id,
+            "used_lines": numpy.column_stack([used_starts, used_ends - 1]),
+            "unused_lines": numpy.column_stack(
+                [unused_starts, unused_ends - 1],
+            ),
+        }
+
+    def __repr__(self):
+        return f"<coverage trace with {len(self)} entries>"
+
+    def _intervals(self, kind, first, last):
+        """
+        Return views of the starts and ends of the intervals of lines of the
+        given kind ("used" or "unused") in entries [first, last).
+        """
+        offsets = self._arrays[f"{kind}_offsets"]
+        lo, hi = offsets[first], offsets[last]
+        starts = self._arrays[f"{kind}_starts"][lo:hi]
+        ends = self._arrays[f"{kind}_ends"][lo:hi]
+        return starts, ends
+
+    def _encode(self, files):
+        """
+        Encode the lines used by this trace in the same way as
+        _encode_coverage, assigning an integer to each new (file, id) pair
+        in files. The starts and ends are views of the stored arrays.
+        """
+        entries = self._arrays["entries"][self._first : self._last]
+        unique, first, inverse = numpy.unique(
+            entries,
+            return_index=True,
+            return_inverse=True,
+        )
+
+        # Assign integers in order of first appearance, as for other traces
+        mapping = numpy.zeros(len(unique), dtype=numpy.int32)
+        for i in numpy.argsort(first, kind="stable").tolist():
+            unique_fn = self._files[unique[i]]
+            mapping[i] = files.setdefault(unique_fn, len(files))
+
+        offsets = self._arrays["used_offsets"]
+        counts = numpy.diff(offsets[self._first : self._last + 1])
+        indices = numpy.repeat(mapping[inverse], counts)
+        starts, ends = self._intervals("used", self._first, self._last)
+        return indices, starts, ends
+
+    def tolist(self):
+        """
+        Return the entries of this trace as a list of JSON objects.
+        """
+        return [
+            dict(
+                entry,
+                used_lines=entry["used_lines"].tolist(),
+                unused_lines=entry["unused_lines"].tolist(),
+            )
+            for entry in self
+        ]
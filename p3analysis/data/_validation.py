@@ -1,16 +1,105 @@
 # Copyright (c) 2022-2023 Intel Corporation
 # SPDX-License-Identifier: MIT
 
+import functools
 import json
 import pkgutil
 
 import jsonschema
+import numpy
+
+from p3analysis.data._trace import _CoverageTrace
+
+_Draft = jsonschema.Draft202012Validator
+
+
+def _is_array(checker, instance):
+    """
+    Treat NumPy arrays as JSON arrays.
+    """
+    return isinstance(instance, list | numpy.ndarray)
+
+
+def _items(validator, items, instance, schema):
+    """
+    Validate the items of a NumPy array using its dtype and shape, rather
+    than validating each item individually.
+
+    NumPy arrays are only used to store lines, so must either be an array of
+    line numbers or an array of [start, end] intervals.
+    """
+    if not isinstance(instance, numpy.ndarray):
+        yield from _Draft.VALIDATORS["items"](
+            validator,
+            items,
+            instance,
+            schema,
+        )
+        return
+    is_integer = numpy.issubdtype(instance.dtype, numpy.integer)
+    is_lines = instance.ndim == 1
+    is_intervals = instance.ndim == 2 and instance.shape[1] == 2
+    if not is_integer or not (is_lines or is_intervals):
+        msg = f"{instance!r} is not an array of lines or intervals"
+        yield jsonschema.exceptions.ValidationError(msg)
+
+
+_Validator = jsonschema.validators.extend(
+    _Draft,
+    validators={"items": _items},
+    type_checker=_Draft.TYPE_CHECKER.redefine("array", _is_array),
+)
+
+
+@functools.cache
+def _coverage_schema():
+    """
+    Load the coverage schema.
+
+    Returns
+    -------
+    dict
+        The coverage schema.
+
+    Raises
+    ------
+    RuntimeError
+        If the schema cannot be located, or is not a valid schema.
+    """
+    schema_string = pkgutil.get_data(__name__, "coverage.schema")
+    if not schema_string:
+        msg = "Could not locate coverage schema file"
+        raise RuntimeError(msg)
+
+    schema = json.loads(schema_string)
+
+    try:
+        _Validator.check_schema(schema)
+    except jsonschema.exceptions.SchemaError:
+        msg = "coverage.schema is not a valid schema"
+        raise RuntimeError(msg)
+
+    return schema
+
+
+@functools.cache
+def _coverage_validator(entry=False):
+    """
+    Return a validator for coverage data, or for a single coverage entry.
+    """
+    schema = _coverage_schema()
+    if entry:
+        schema = schema["items"]
+    return _Validator(schema)
 
 
 def _validate_coverage_json(json_data: str | dict | list) -> object:
     """
     Validate coverage JSON against schema.
 
+    Arrays of lines may be stored as NumPy arrays of integers, as produced by
+    :py:func:`p3analysis.data.read_coverage`.
+
     Parameters
     ----------
     json_data : str | dict | list
@@ -29,27 +118,20 @@ def _validate_coverage_json(json_data: str | dict | list) -> object:
     TypeError
         If the JSON data is not a string, dict or list.
     """
-    if isinstance(json_data, str):
+    if isinstance(json_data, _CoverageTrace):
+        # Coverage traces are validated when a coverage store is written
+        return json_data
+    elif isinstance(json_data, str):
         instance = json.loads(json_data)
     elif isinstance(json_data, dict | list):
         instance = json_data
     else:
         raise TypeError("JSON data must be a string, dict, or list")
 
-    schema_string = pkgutil.get_data(__name__, "coverage.schema")
-    if not schema_string:
-        msg = "Could not locate coverage schema file"
-        raise RuntimeError(msg)
-
-    schema = json.loads(schema_string)
-
     try:
-        jsonschema.validate(instance=instance, schema=schema)
+        _coverage_validator().validate(instance)
     except jsonschema.exceptions.ValidationError:
         msg = "Coverage data failed schema validation"
         raise ValueError(msg)
-    except jsonschema.exceptions.SchemaError:
-        msg = "coverage.schema is not a valid schema"
-        raise RuntimeError(msg)
 
     return instance
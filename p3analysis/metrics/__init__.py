@@ -1,8 +1,20 @@
 # Copyright (c) 2022-2023 Intel Corporation
 # SPDX-License-Identifier: MIT
 
-from p3analysis.metrics._divergence import divergence
-from p3analysis.metrics._efficiency import application_efficiency
-from p3analysis.metrics._pp import pp
+from p3analysis.metrics._accumulator import DivergenceAccumulator
+from p3analysis.metrics._divergence import divergence, divergence_subsets
+from p3analysis.metrics._efficiency import (
+    application_efficiency,
+    application_efficiency_iter,
+)
+from p3analysis.metrics._pp import pp, pp_subsets
 
-__all__ = ["application_efficiency", "pp", "divergence"]
+__all__ = [
+    "application_efficiency",
+    "application_efficiency_iter",
+    "pp",
+    "pp_subsets",
+    "divergence",
+    "divergence_subsets",
+    "DivergenceAccumulator",
+]
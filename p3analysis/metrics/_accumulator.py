@@ -0,0 +1,146 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+from p3analysis.data._validation import _validate_coverage_json
+from p3analysis.metrics._divergence import _coverage_lines
+
+
+class DivergenceAccumulator:
+    r"""
+    Incrementally maintain the code divergence of a single application
+    solving a single problem, as the coverage of platforms is added, replaced
+    or removed.
+
+    Each platform's coverage is stored as a bitset over a dictionary of all
+    lines seen so far, alongside the size of every pairwise intersection.
+    Adding, replacing or removing a platform therefore requires a single pass
+    over that platform's coverage and one bitset intersection per other
+    platform, rather than rebuilding the full map of platform sets.
+
+    The value returned by :py:meth:`divergence` matches the value computed
+    by :py:func:`p3analysis.metrics.divergence` for the same coverage.
+
+    Examples
+    --------
+    >>> acc = p3analysis.metrics.DivergenceAccumulator()
+    >>> acc.add("A", [{"file": "foo.cpp", "id": "0",
+    ...                "used_lines": [1, 2], "unused_lines": []}])
+    >>> acc.add("B", [{"file": "foo.cpp", "id": "0",
+    ...                "used_lines": [2, 3], "unused_lines": []}])
+    >>> acc.divergence()
+    0.6666666666666667
+    """
+
+    def __init__(self):
+        self._lines = {}
+        self._bitsets = {}
+        self._sizes = {}
+        self._intersections = {}
+
+    def __len__(self):
+        return len(self._bitsets)
+
+    def __contains__(self, platform):
+        return platform in self._bitsets
+
+    @property
+    def platforms(self):
+        """
+        list: The platforms currently tracked by the accumulator.
+        """
+        return list(self._bitsets.keys())
+
+    def _bitset(self, coverage):
+        """
+        Convert a coverage map into a bitset, assigning new bits to any
+        lines that have not been seen before.
+        """
+        bits = []
+        for key in _coverage_lines(coverage):
+            bits.append(self._lines.setdefault(key, len(self._lines)))
+
+        # Set bits in a buffer, to avoid quadratic big integer arithmetic
+        buffer = bytearray(len(self._lines) // 8 + 1)
+        for bit in bits:
+            buffer[bit >> 3] |= 1 << (bit & 7)
+        return int.from_bytes(buffer, "little")
+
+    def add(self, platform, coverage):
+        """
+        Add the coverage of a platform, replacing any coverage previously
+        added for the same platform.
+
+        Parameters
+        ----------
+        platform: str
+            The name of the platform.
+
+        coverage: str or list
+            A coverage trace adhering to the P3 Analysis Library coverage
+            schema, either as a JSON string or as a decoded JSON object.
+
+        Raises
+        ------
+        ValueError
+            If `coverage` fails to validate against the P3 coverage schema.
+
+        TypeError
+            If `coverage` is not a JSON string or list.
+        """
+        coverage = _validate_coverage_json(coverage)
+        bitset = self._bitset(coverage)
+
+        if platform in self._bitsets:
+            self.remove(platform)
+
+        for other, other_bitset in self._bitsets.items():
+            count = (bitset & other_bitset).bit_count()
+            self._intersections[frozenset((platform, other))] = count
+        self._bitsets[platform] = bitset
+        self._sizes[platform] = bitset.bit_count()
+
+    def remove(self, platform):
+        """
+        Remove the coverage of a platform.
+
+        Parameters
+        ----------
+        platform: str
+            The name of the platform.
+
+        Raises
+        ------
+        KeyError
+            If no coverage has been added for `platform`.
+        """
+        if platform not in self._bitsets:
+            raise KeyError(f"No coverage for platform '{platform}'.")
+        del self._bitsets[platform]
+        del self._sizes[platform]
+        for other in self._bitsets:
+            del self._intersections[frozenset((platform, other))]
+
+    def divergence(self):
+        """
+        Returns
+        -------
+        float
+            The code divergence of all platforms currently tracked.
+
+            Consistent with :py:func:`p3analysis.metrics.divergence`,
+            platforms that do not use any lines of code are ignored.
+        """
+        platforms = [p for p, size in self._sizes.items() if size > 0]
+
+        d = 0
+        npairs = 0
+        for i, p1 in enumerate(platforms):
+            for p2 in platforms[i + 1 :]:
+                intersection = self._intersections[frozenset((p1, p2))]
+                union = self._sizes[p1] + self._sizes[p2] - intersection
+                d += 1 - intersection / float(union)
+                npairs += 1
+
+        if npairs == 0:
+            return 0
+        return d / float(npairs)
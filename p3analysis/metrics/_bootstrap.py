@@ -0,0 +1,156 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+import pandas as pd
+
+from p3analysis._utils import _cast_to_numeric, _require_columns
+
+# The maximum number of resamples generated by each task, and the approximate
+# memory (in bytes) that each task may use. The number of resamples in each
+# task is derived from the shape of the input (rather than the number of
+# workers) so that results depend only on the input and the seed.
+_CHUNKSIZE = 256
+_MEMORY = 1 << 26
+
+
+def _chunksize(nvalues, shape):
+    """
+    Return the number of resamples generated by each task, given the number
+    of measurements and the shape of the (problem, platform, application)
+    cube.
+
+    Each resample requires several temporary float64 or int64 arrays: four
+    with one element per measurement (random numbers, indices, indices into
+    values, and resampled values), and six with one element per position in
+    the cube (the cube, its best FOMs and ratios, efficiencies, reciprocals,
+    and comparisons).
+    """
+    size = 8 * (4 * nvalues + 6 * int(numpy.prod(shape)))
+    return int(max(1, min(_CHUNKSIZE, _MEMORY // size)))
+
+
+def _resample_means(values, offsets, counts, n, rng):
+    """
+    Resample the values of each group with replacement n times.
+
+    Values must be sorted by group, where each group is described by an
+    offset and a (non-zero) count. Returns an (n, groups) array of means.
+    """
+    group = numpy.repeat(numpy.arange(len(counts)), counts)
+    choice = (rng.random((n, len(values))) * counts[group]).astype(int)
+    samples = values[offsets[group] + choice]
+    return numpy.add.reduceat(samples, offsets, axis=1) / counts
+
+
+def _pp_from_foms(foms, index, shape, interpretation):
+    """
+    Calculate application performance portability from FOMs.
+
+    foms is an (n, groups) array, and index maps each group to a (problem,
+    platform, application) position in a cube of the specified shape.
+    Returns an (n, problems, applications) array.
+    """
+    n = foms.shape[0]
+    fill = numpy.inf if interpretation == "lower" else -numpy.inf
+    cube = numpy.full((n,) + shape, fill)
+    cube[(slice(None),) + index] = numpy.nan_to_num(foms, nan=fill)
+
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        # Identify the best FOM for each (problem, platform) pair
+        if interpretation == "lower":
+            best = cube.min(axis=3, keepdims=True)
+            ratio = best / cube
+        else:
+            best = cube.max(axis=3, keepdims=True)
+            ratio = cube / best
+
+        # Applications that did not run have an efficiency of zero
+        effs = numpy.nan_to_num(ratio, nan=0.0, posinf=0.0, neginf=0.0)
+
+        # Calculate the harmonic mean over platforms
+        unsupported = (effs == 0).any(axis=2)
+        reciprocals = numpy.where(effs > 0, 1 / effs, 0).sum(axis=2)
+        return numpy.where(unsupported, 0.0, shape[1] / reciprocals)
+
+
+def _bootstrap_pp(df, n, ci, foms, seed, n_jobs):
+    """
+    Calculate application performance portability, and bootstrap confidence
+    intervals, from repeated FOM measurements.
+    """
+    _require_columns(df, ["problem", "platform", "application", "fom"])
+    df = _cast_to_numeric(df, ["fom"])
+
+    if foms not in ["lower", "higher"]:
+        raise ValueError("FOM interpretation must be 'lower' or 'higher'")
+    if not isinstance(n, int) or n < 1:
+        raise ValueError("'bootstrap' must be a positive integer.")
+    if not 0 < ci < 1:
+        raise ValueError("'ci' must be in range (0, 1).")
+
+    problems = df["problem"].unique()
+    platforms = df["platform"].unique()
+    applications = df["application"].unique()
+    shape = (len(problems), len(platforms), len(applications))
+
+    # Sort the measurements by (problem, platform, application)
+    # Measurements that did not run are not resampled.
+    key = ["problem", "platform", "application"]
+    runs = df[key + ["fom"]].dropna().astype({"fom": float})
+    runs = runs.sort_values(key, kind="stable")
+    groups = runs.groupby(key, sort=False)["fom"]
+    counts = groups.size().to_numpy()
+    offsets = numpy.concatenate([[0], numpy.cumsum(counts)[:-1]])
+    offsets = offsets.astype(int)
+    values = runs["fom"].to_numpy()
+
+    labels = groups.size().index
+    index = tuple(
+        pd.Index(unique).get_indexer(labels.get_level_values(column))
+        for unique, column in zip([problems, platforms, applications], key)
+    )
+
+    means = groups.mean().to_numpy()[numpy.newaxis, :]
+    estimate = _pp_from_foms(means, index, shape, foms)[0]
+
+    if len(values) == 0:
+        samples = numpy.zeros((n, shape[0], shape[2]))
+    else:
+
+        def _task(task):
+            size, sequence = task
+            rng = numpy.random.default_rng(sequence)
+            resampled = _resample_means(values, offsets, counts, size, rng)
+            return _pp_from_foms(resampled, index, shape, foms)
+
+        chunksize = _chunksize(len(values), shape)
+        nchunks = -(-n // chunksize)
+        sizes = [chunksize] * (nchunks - 1)
+        sizes += [n - chunksize * (nchunks - 1)]
+        sequences = numpy.random.SeedSequence(seed).spawn(nchunks)
+        tasks = list(zip(sizes, sequences))
+
+        # NumPy releases the GIL, so threads are sufficient for parallelism
+        if n_jobs is None or n_jobs == 1:
+            samples = numpy.concatenate([_task(task) for task in tasks])
+        else:
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                samples = numpy.concatenate(list(executor.map(_task, tasks)))
+
+    alpha = (1 - ci) / 2
+    lower = numpy.quantile(samples, alpha, axis=0)
+    upper = numpy.quantile(samples, 1 - alpha, axis=0)
+
+    result = pd.DataFrame(
+        {
+            "problem": numpy.repeat(problems, len(applications)),
+            "application": numpy.tile(applications, len(problems)),
+            "app pp": estimate.ravel(),
+            "app pp lower": lower.ravel(),
+            "app pp upper": upper.ravel(),
+        },
+    )
+    return result
@@ -2,10 +2,21 @@
 # SPDX-License-Identifier: MIT
 
 import collections
+import functools
 import itertools as it
+from concurrent.futures import ProcessPoolExecutor
 
-from p3analysis._utils import _require_columns
-from p3analysis.data._validation import _validate_coverage_json
+import numpy
+import pandas as pd
+
+from p3analysis._utils import _evaluate_subsets, _require_columns
+from p3analysis.data._coverage import parse_coverage
+from p3analysis.data._intervals import _to_intervals, _to_lines
+from p3analysis.data._trace import _CoverageTrace
+from p3analysis.metrics._minhash import _minhash_divergence
+from p3analysis.metrics._polars import _polars_coverage_groups
+from p3analysis.metrics._sparse import _sparse_intersections
+from p3analysis.profiling._profile import _staged
 
 
 def _extract_platforms(setmap):
@@ -48,32 +59,188 @@ def _average_distance(setmap):
     return d / float(npairs)
 
 
-def _coverage_to_divergence(maps):
+def _coverage_lines(coverage):
+    """
+    Yield a unique key for each line used in a coverage map.
+    """
+    for entry in coverage:
+        unique_fn = (entry["file"], entry["id"])
+        for line in _to_lines(entry["used_lines"]).tolist():
+            yield (unique_fn, line)
+
+
+def _encode_coverage(maps):
     """
-    Fold a list of coverage maps into a divergence score.
+    Encode a list of coverage maps as compact integer arrays.
+
+    Each (file, id) pair is replaced by an integer, and the lines used by
+    each coverage map are stored as three arrays: the file of each interval,
+    and the start and end of each half-open interval of lines. Coverage
+    traces read from a coverage store are encoded without copying the
+    stored intervals.
     """
-    linemap = collections.defaultdict(set)
-    for p, coverage in enumerate(maps):
+    files = {}
+    encoded = []
+    for coverage in maps:
+        if isinstance(coverage, _CoverageTrace):
+            encoded.append(coverage._encode(files))
+            continue
+        indices = [numpy.zeros(0, dtype=numpy.int32)]
+        starts = [numpy.zeros(0, dtype=numpy.int64)]
+        ends = [numpy.zeros(0, dtype=numpy.int64)]
         for entry in coverage:
             unique_fn = (entry["file"], entry["id"])
-            for line in entry["used_lines"]:
-                linemap[(unique_fn, line)].add(p)
+            f = files.setdefault(unique_fn, len(files))
+            s, e = _to_intervals(entry["used_lines"])
+            indices.append(numpy.full(len(s), f, dtype=numpy.int32))
+            starts.append(s)
+            ends.append(e)
+        encoded.append(
+            (
+                numpy.concatenate(indices),
+                numpy.concatenate(starts),
+                numpy.concatenate(ends),
+            ),
+        )
+    return encoded
+
+
+def _encoded_to_setmap(encoded):
+    """
+    Fold a list of encoded coverage maps into a setmap, identifying each
+    platform by its position in the list.
+
+    Lines are processed as intervals: sweeping over the boundaries of all
+    intervals in a file identifies runs of lines used by the same platforms.
+    """
+    boundaries = collections.defaultdict(list)
+    for p, (indices, starts, ends) in enumerate(encoded):
+        for f, start, end in zip(
+            indices.tolist(),
+            starts.tolist(),
+            ends.tolist(),
+        ):
+            boundaries[f].append((start, p, 1))
+            boundaries[f].append((end, p, -1))
 
     setmap = collections.defaultdict(int)
-    for key, platforms in linemap.items():
-        setmap[frozenset(platforms)] += 1
+    for events in boundaries.values():
+        events.sort(key=lambda event: event[0])
+        active = collections.Counter()
+        previous = None
+        for position, p, delta in events:
+            if active and position > previous:
+                setmap[frozenset(active)] += position - previous
+            active[p] += delta
+            if active[p] == 0:
+                del active[p]
+            previous = position
+
+    return setmap
+
+
+def _coverage_to_setmap(maps):
+    """
+    Fold a list of coverage maps into a setmap, identifying each platform by
+    its position in the list.
+    """
+    return _encoded_to_setmap(_encode_coverage(maps))
 
-    return _average_distance(setmap)
+
+def _encoded_to_divergence(encoded):
+    """
+    Fold a list of encoded coverage maps into a divergence score.
+    """
+    return _average_distance(_encoded_to_setmap(encoded))
 
 
-def _coverage_string_to_json(string):
+def _sparse_divergence(encoded):
     """
-    Convert a coverage string into a JSON object
+    Fold a list of encoded coverage maps into a divergence score, using a
+    sparse incidence matrix to compute the distance between platforms.
     """
-    return _validate_coverage_json(string)
+    distances, used = _jaccard_distances(_sparse_intersections(encoded))
+    count = used.sum()
+    if count < 2:
+        return 0
+    npairs = count * (count - 1) / 2
+    return numpy.triu(distances, 1).sum() / npairs
 
 
-def divergence(df, cov=None):
+def _distance_matrix(setmap, n):
+    """
+    Compute the distance between all pairs of n platforms identified by
+    their position, and whether each platform uses any lines of code.
+    """
+    intersections = numpy.zeros((n, n))
+    for pset, count in setmap.items():
+        index = list(pset)
+        intersections[numpy.ix_(index, index)] += count
+    return _jaccard_distances(intersections)
+
+
+def _jaccard_distances(intersections):
+    """
+    Compute the distance between all pairs of platforms from the number of
+    lines of code used by each pair, and whether each platform uses any
+    lines of code.
+    """
+    n = intersections.shape[0]
+    sizes = numpy.diag(intersections)
+    unions = sizes[:, numpy.newaxis] + sizes[numpy.newaxis, :] - intersections
+    distances = numpy.divide(
+        unions - intersections,
+        unions,
+        out=numpy.zeros((n, n)),
+        where=unions > 0,
+    )
+
+    # Platforms that do not use any code do not contribute to divergence
+    used = sizes > 0
+    distances[~used, :] = 0
+    distances[:, ~used] = 0
+    return distances, used
+
+
+def _join_coverage(df, cov, n_jobs=None):
+    """
+    Return a copy of df with a "coverage" column containing the coverage
+    JSON object for each row, parsing coverage strings with n_jobs processes.
+    """
+    _require_columns(df, ["problem", "platform", "application"])
+    if cov is None:
+        # The original df must already contain coverage information
+        _require_columns(df, ["coverage"])
+        p3df = df.copy()
+        p3df["coverage"] = parse_coverage(p3df["coverage"], n_jobs=n_jobs)
+    else:
+        # Expand original df by substituting the sha for its coverage, which
+        # is converted only once for each row of cov
+        _require_columns(df, ["coverage_key"])
+        _require_columns(cov, ["coverage_key", "coverage"])
+        cov = cov[["coverage_key", "coverage"]].copy()
+        cov["coverage"] = parse_coverage(cov["coverage"], n_jobs=n_jobs)
+        p3df = df.join(cov.set_index("coverage_key"), on="coverage_key")
+
+        missing = p3df["coverage"].isna()
+        if missing.any():
+            key = p3df["coverage_key"][missing].iloc[0]
+            msg = "No coverage data for coverage_key '%s'."
+            raise TypeError(msg % (key))
+
+    return p3df
+
+
+@_staged("divergence")
+def divergence(
+    df,
+    cov=None,
+    *,
+    n_jobs=None,
+    engine="setmap",
+    approximate=False,
+    num_perm=128,
+):
     r"""
     Calculate code divergence.
 
@@ -118,6 +285,9 @@ def divergence(df, cov=None):
         Library coverage schema. Otherwise, a "coverage_key" column is
         required.
 
+        If `engine` is "polars", `df` may also be a Polars DataFrame or
+        LazyFrame.
+
     cov: DataFrame, optional
         A pandas DataFrame storing coverage data. The following columns are
         required: "coverage_key", "coverage".
@@ -125,12 +295,73 @@ def divergence(df, cov=None):
         Values of the "coverage" column must be coverage traces adhering to the
         P3 Analysis Library coverage schema.
 
+        If `engine` is "polars", `cov` may also be a Polars DataFrame or
+        LazyFrame.
+
+    n_jobs: int, optional
+        The number of processes used to parse coverage strings (see
+        :py:func:`p3analysis.data.parse_coverage`) and to evaluate code
+        divergence. Each (problem, application) pair is evaluated
+        independently, using coverage data encoded as arrays of integers.
+        The results do not depend on the number of processes.
+
+    engine: str, {"setmap", "sparse", "polars"}, default: "setmap"
+        The method used to compute the distance between platforms.
+
+        "setmap" counts the lines of code used by each set of platforms, and
+        compares every pair of platforms using these counts.
+
+        "sparse" builds a sparse incidence matrix :math:`M`, in which each
+        row represents a platform and each column represents a run of lines
+        used by the same platforms, and computes the intersection of every
+        pair of platforms as :math:`M W M^T` (where :math:`W` stores the
+        length of each run). This scales better to large numbers of
+        platforms, and uses SciPy if it is installed. Results may differ
+        from "setmap" due to floating-point rounding.
+
+        "polars" joins `df` with `cov` and groups the coverage data of each
+        (problem, application) pair using Polars, avoiding a conversion to
+        pandas for Polars inputs, and then compares platforms as "setmap"
+        does.
+
+    approximate: bool, default: False
+        Whether to estimate code divergence using MinHash signatures instead
+        of calculating it exactly. If True, `engine` only determines whether
+        the inputs are grouped using Polars.
+
+        The lines used by each platform are summarized by a signature of
+        `num_perm` hash values, and the distance between two platforms is
+        estimated from the fraction of values that differ. Each run of lines
+        used by the same set of platforms is hashed once (weighted by its
+        length), so computing the signatures takes time proportional to the
+        number of runs used by each platform (times `num_perm`), rather than
+        the number of lines. Comparing a pair of platforms takes time
+        proportional only to `num_perm`, so approximation is most useful for
+        exploratory analysis of many platforms (or code variants) with
+        complex patterns of code reuse.
+
+        The estimate of each distance :math:`d` is approximately unbiased,
+        with a standard error of :math:`\sqrt{d (1 - d) / num\_perm}` (at
+        most :math:`0.5 / \sqrt{num\_perm}`). The same hash functions are
+        used for every platform, so results are reproducible but the errors
+        of different pairs of platforms are correlated.
+
+    num_perm: int, default: 128
+        The number of hash values in each MinHash signature when
+        `approximate` is True. Doubling `num_perm` doubles the cost of
+        computing and comparing signatures, and reduces the standard error
+        by a factor of :math:`\sqrt{2}`.
+
     Returns
     -------
     DataFrame
         A new pandas DataFrame storing the code divergence values calculated
         from the configuration and coverage data provided.
 
+        If `engine` is "polars", the result has the same type as `df`. A
+        LazyFrame input returns a LazyFrame, although divergence has already
+        been calculated.
+
     Raises
     ------
     ValueError
@@ -138,27 +369,207 @@ def divergence(df, cov=None):
         If any coverage string fails to validate against the P3 coverage
         schema.
 
+        If `n_jobs` is not a positive integer.
+        If `engine` is not "setmap", "sparse" or "polars".
+        If `num_perm` is not a positive integer.
+
     TypeError
         If any value in the "coverage" column is not a JSON string.
+        If `engine` is "polars" and `df` or `cov` is not a pandas DataFrame,
+        Polars DataFrame or Polars LazyFrame.
 
+    ImportError
+        If `engine` is "polars" and Polars is not installed.
     """
-    _require_columns(df, ["problem", "platform", "application"])
-    if cov is None:
-        # The original df must already contain coverage information
-        _require_columns(df, ["coverage"])
-        p3df = df.copy()
+    if n_jobs is not None and (not isinstance(n_jobs, int) or n_jobs < 1):
+        raise ValueError("'n_jobs' must be a positive integer.")
+    engines = {
+        "setmap": _encoded_to_divergence,
+        "sparse": _sparse_divergence,
+        "polars": _encoded_to_divergence,
+    }
+    if engine not in engines:
+        raise ValueError("'engine' must be 'setmap', 'sparse' or 'polars'.")
+    task_function = engines[engine]
+    if approximate:
+        if not isinstance(num_perm, int) or num_perm < 1:
+            raise ValueError("'num_perm' must be a positive integer.")
+        task_function = functools.partial(
+            _minhash_divergence,
+            num_perm=num_perm,
+        )
+
+    key = ["problem", "application"]
+    if engine == "polars":
+        labels, maps, convert = _polars_coverage_groups(df, cov, n_jobs)
+        tasks = [_encode_coverage(coverage) for coverage in maps]
     else:
-        # Expand original df by substituting the sha for its coverage string
-        _require_columns(df, ["coverage_key"])
-        _require_columns(cov, ["coverage_key", "coverage"])
-        p3df = df.join(cov.set_index("coverage_key"), on="coverage_key")
+        p3df = _join_coverage(df, cov, n_jobs)
+        labels = []
+        tasks = []
+        for label, coverage in p3df.groupby(key)["coverage"]:
+            labels.append(label)
+            tasks.append(_encode_coverage(coverage.tolist()))
+
+    if n_jobs is None or n_jobs == 1 or len(tasks) < 2:
+        values = [task_function(task) for task in tasks]
+    else:
+        # Submit several groups to each process at a time, to amortize the
+        # cost of communication; map() preserves the order of the groups
+        chunksize = max(1, len(tasks) // (4 * n_jobs))
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            values = list(
+                executor.map(
+                    task_function,
+                    tasks,
+                    chunksize=chunksize,
+                ),
+            )
+
+    if engine == "polars":
+        cd = labels.with_columns(divergence=numpy.array(values, dtype=float))
+        return convert(cd.lazy())
+
+    cd = pd.DataFrame(labels, columns=key)
+    cd["divergence"] = values
+
+    return cd
+
 
-    p3df["coverage"] = p3df["coverage"].apply(_coverage_string_to_json)
+def _divergence_subsets(p3df, platforms, max_size, chunksize):
+    """
+    Generate DataFrames of code divergence values for all subsets of
+    platforms, each containing approximately chunksize rows.
+    """
+    n = len(platforms)
+    index = {platform: i for i, platform in enumerate(platforms)}
 
+    problems = []
+    applications = []
+    distances = []
+    used = []
     key = ["problem", "application"]
-    groups = p3df[key + ["coverage"]].groupby(key)
-    cd = groups.agg(_coverage_to_divergence)
-    cd.reset_index(inplace=True)
-    cd.rename(columns={"coverage": "divergence"}, inplace=True)
+    for (problem, application), group in p3df.groupby(key, sort=False):
+        maps = [[] for _ in range(n)]
+        for platform, coverage in zip(group["platform"], group["coverage"]):
+            maps[index[platform]] = coverage
+        d, u = _distance_matrix(_coverage_to_setmap(maps), n)
+        problems.append(problem)
+        applications.append(application)
+        distances.append(d)
+        used.append(u)
+    ngroups = len(problems)
+    distances = numpy.array(distances).reshape(ngroups, n, n)
+    used = numpy.array(used, dtype=int).reshape(ngroups, n)
+
+    # For each subset, track the sum of pair-wise distances, the number of
+    # platforms using code, and the sum of distances to every platform.
+    def start(i):
+        return numpy.zeros(ngroups), used[:, i], distances[:, i, :]
+
+    def extend(state, i):
+        total, count, rowsum = state
+        return (
+            total + rowsum[:, i],
+            count + used[:, i],
+            rowsum + distances[:, i, :],
+        )
+
+    def evaluate(state, size):
+        total, count, _ = state
+        npairs = count * (count - 1) / 2
+        return numpy.divide(
+            total,
+            npairs,
+            out=numpy.zeros(ngroups),
+            where=npairs > 0,
+        )
+
+    return _evaluate_subsets(
+        platforms,
+        max_size,
+        chunksize,
+        (problems, applications),
+        ["divergence"],
+        start,
+        extend,
+        evaluate,
+    )
+
+
+def divergence_subsets(df, cov=None, max_size=None, chunksize=None):
+    """
+    Calculate code divergence for every subset of platforms.
 
-    return cd
+    Code divergence is defined for a specific set of platforms, :math:`H`, as
+    the average of pair-wise distances between the platforms in :math:`H`
+    (see :py:func:`p3analysis.metrics.divergence`). This function computes
+    the distance between every pair of platforms once for each (problem,
+    application) pair, and then evaluates :math:`CD(a, p, H)` for every
+    non-empty subset :math:`H` of the platforms in `df`, reusing the sum of
+    distances from each subset when evaluating the subsets that extend it.
+
+    If there are multiple rows for the same (problem, application, platform),
+    only the coverage from the last row is used.
+
+    Parameters
+    ----------
+    df: DataFrame
+        A pandas DataFrame storing performance data. The following columns are
+        required: "problem", "platform", "application".
+
+        If `cov` is None, a "coverage" column is required. Values of the
+        "coverage" column must be coverage traces adhering to the P3 Analysis
+        Library coverage schema. Otherwise, a "coverage_key" column is
+        required.
+
+    cov: DataFrame, optional
+        A pandas DataFrame storing coverage data. The following columns are
+        required: "coverage_key", "coverage".
+
+        Values of the "coverage" column must be coverage traces adhering to the
+        P3 Analysis Library coverage schema.
+
+    max_size: int, optional
+        The maximum number of platforms in each subset. If no value is
+        provided, subsets of all sizes are evaluated.
+
+    chunksize: int, optional
+        If provided, return an iterator of DataFrames, each containing
+        approximately `chunksize` rows, instead of a single DataFrame. Use
+        this to stream results when the number of platforms is large.
+
+    Returns
+    -------
+    DataFrame or iterator of DataFrames
+        A new pandas DataFrame storing the code divergence values calculated
+        for each subset of platforms. The "platforms" column contains a tuple
+        of the platforms in each subset.
+
+    Raises
+    ------
+    ValueError
+        If any of the required columns are missing.
+        If any coverage string fails to validate against the P3 coverage
+        schema.
+        If `max_size` or `chunksize` is not a positive integer.
+
+    TypeError
+        If any value in the "coverage" column is not a JSON string.
+    """
+    p3df = _join_coverage(df, cov)
+    p3df = p3df.drop_duplicates(
+        ["problem", "application", "platform"],
+        keep="last",
+    )
+    platforms = p3df["platform"].unique()
+
+    if max_size is None:
+        max_size = max(len(platforms), 1)
+    if not isinstance(max_size, int) or max_size < 1:
+        raise ValueError("'max_size' must be a positive integer.")
+    if chunksize is not None:
+        if not isinstance(chunksize, int) or chunksize < 1:
+            raise ValueError("'chunksize' must be a positive integer.")
+        return _divergence_subsets(p3df, platforms, max_size, chunksize)
+    return next(_divergence_subsets(p3df, platforms, max_size, chunksize))
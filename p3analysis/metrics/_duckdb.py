@@ -0,0 +1,184 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import os
+
+import pandas as pd
+
+from p3analysis._utils import _import_optional, _require_columns
+
+_NUMERIC_TYPES = {
+    "tinyint",
+    "smallint",
+    "integer",
+    "bigint",
+    "hugeint",
+    "utinyint",
+    "usmallint",
+    "uinteger",
+    "ubigint",
+    "uhugeint",
+    "float",
+    "double",
+    "decimal",
+    "null",
+}
+
+
+def _relation(df):
+    """
+    Convert a pandas DataFrame, a path to Parquet file(s) or a DuckDB
+    relation into a DuckDB relation.
+
+    Returns the relation, and a function converting a relation back into
+    the type of the input.
+    """
+    duckdb = _import_optional("duckdb", "duckdb")
+    if isinstance(df, duckdb.DuckDBPyRelation):
+        return df, lambda result: result
+    if isinstance(df, str | os.PathLike):
+        return duckdb.read_parquet(os.fspath(df)), lambda result: result
+    if isinstance(df, pd.DataFrame):
+        return duckdb.from_df(df), lambda result: result.df()
+    raise TypeError(
+        "'df' must be a pandas DataFrame, a path to Parquet file(s) or a "
+        + "DuckDB relation.",
+    )
+
+
+def _quote(column):
+    """
+    Quote a column name for use in a SQL expression.
+    """
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _require_numeric(rel, columns):
+    """
+    Check that the named columns of a DuckDB relation are numeric.
+    """
+    types = dict(zip(rel.columns, rel.types))
+    for column in columns:
+        if types[column].id not in _NUMERIC_TYPES:
+            msg = "Column '%s' must contain only numeric values."
+            raise TypeError(msg % (column))
+
+
+def _missing(column):
+    """
+    Return a SQL expression treating NaN values in a column as missing.
+    """
+    value = f"{_quote(column)}::DOUBLE"
+    return f"CASE WHEN isnan({value}) THEN NULL ELSE {value} END"
+
+
+def _duckdb_efficiency(df, foms):
+    """
+    Calculate application efficiency using DuckDB.
+    """
+    rel, convert = _relation(df)
+    required_columns = ["problem", "platform", "application", "fom"]
+    _require_columns(rel.columns, required_columns)
+    _require_numeric(rel, ["fom"])
+
+    # The best FOMs are aggregated separately and joined back onto the
+    # data, so that only one row per (problem, platform) pair is held in
+    # memory at a time
+    columns = required_columns + (["date"] if "date" in rel.columns else [])
+    data = rel.project(
+        ", ".join(_quote(c) for c in columns)
+        + f", {_missing('fom')} AS p3_fom",
+    ).set_alias("data")
+    best = "min" if foms == "lower" else "max"
+    best = data.aggregate(
+        f"problem, platform, {best}(p3_fom) AS p3_best",
+        "problem, platform",
+    ).set_alias("best")
+    joined = data.join(best, "problem, platform", how="left")
+
+    if foms == "lower":
+        eff = "CASE WHEN p3_fom IS NULL THEN 0.0 ELSE p3_best / p3_fom END"
+    else:
+        eff = "p3_fom / p3_best"
+    result = joined.project(
+        ", ".join(_quote(c) for c in columns) + f', {eff} AS "app eff"',
+    )
+    return convert(result)
+
+
+def _duckdb_pp(df):
+    """
+    Calculate performance portability using DuckDB.
+    """
+    rel, convert = _relation(df)
+    _require_columns(rel.columns, ["problem", "platform", "application"])
+
+    efficiencies = [e for e in ["app eff", "arch eff"] if e in rel.columns]
+    if len(efficiencies) == 0:
+        msg = "DataFrame must contain a column named 'arch eff' or 'app eff'."
+        raise ValueError(msg)
+    _require_numeric(rel, efficiencies)
+
+    data = rel.project(
+        "problem, platform, application, "
+        + ", ".join(f"{_missing(e)} AS {_quote(e)}" for e in efficiencies),
+    )
+
+    # Validate all efficiencies using a single pass over the data
+    pairs = data.aggregate(
+        "platform, "
+        + ", ".join(
+            f"count(DISTINCT {_quote(e)}) AS p3_unique_{i}, "
+            + f"bool_and(coalesce({_quote(e)}, 0) BETWEEN 0 AND 1) "
+            + f"AS p3_range_{i}"
+            for i, e in enumerate(efficiencies)
+        ),
+        "platform, application",
+    )
+    checks = pairs.aggregate(
+        "count(DISTINCT platform), "
+        + ", ".join(
+            f"bool_and(p3_range_{i}), bool_and(p3_unique_{i} = 1)"
+            for i in range(len(efficiencies))
+        ),
+    ).fetchone()
+    nplatforms = checks[0]
+    for i, eff in enumerate(efficiencies):
+        if not checks[1 + 2 * i]:
+            raise ValueError(f"{eff} must in range [0, 1]")
+    for i, eff in enumerate(efficiencies):
+        if not checks[2 + 2 * i]:
+            raise ValueError(
+                "Each (application, platform) pair must be associated with "
+                + "exactly one efficiency value.",
+            )
+
+    # An application that did not run on every platform has a "did not
+    # run" efficiency of 0, so its performance portability is 0. This is
+    # equivalent to adding a row for each missing combination.
+    groups = data.aggregate(
+        "problem, application, count(DISTINCT platform) AS p3_platforms, "
+        + "count(*) AS p3_count, "
+        + ", ".join(
+            f"bool_or(coalesce({_quote(e)}, 0) = 0) AS p3_zero_{i}, "
+            + f"sum(1 / {_quote(e)}) AS p3_sum_{i}"
+            for i, e in enumerate(efficiencies)
+        ),
+        "problem, application",
+    ).set_alias("groups")
+    problems = groups.aggregate("problem", "problem").set_alias("problems")
+    applications = groups.aggregate("application", "application")
+    combinations = problems.cross(applications.set_alias("applications"))
+    combinations = combinations.set_alias("combinations")
+    joined = combinations.join(groups, "problem, application", how="left")
+
+    result = joined.project(
+        "problem, application, "
+        + ", ".join(
+            f"CASE WHEN p3_platforms IS NULL OR p3_platforms < {nplatforms} "
+            + f"OR p3_zero_{i} THEN 0.0 ELSE p3_count / p3_sum_{i} END "
+            + f"AS {_quote(e.replace('eff', 'pp'))}"
+            for i, e in enumerate(efficiencies)
+        ),
+    ).order("problem, application")
+    return convert(result)
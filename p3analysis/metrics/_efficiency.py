@@ -1,12 +1,47 @@
 # Copyright (c) 2022-2023 Intel Corporation
 # SPDX-License-Identifier: MIT
 
-import numpy
+import os
+
+import pandas as pd
 
 from p3analysis._utils import _cast_to_numeric, _require_columns
+from p3analysis.metrics._duckdb import _duckdb_efficiency
+from p3analysis.metrics._polars import _polars_efficiency
+from p3analysis.profiling._profile import _staged
+
+
+def _best_foms(df, foms):
+    """
+    Identify the best FOM for each (problem, platform) pair.
+    """
+    key = ["problem", "platform"]
+    groups = df[key + ["fom"]].groupby(key)["fom"]
+    return groups.min() if foms == "lower" else groups.max()
+
+
+def _efficiency(df, best, foms):
+    """
+    Calculate application efficiency relative to the best FOM for each
+    (problem, platform) pair.
+    """
+    required_columns = ["problem", "platform", "application", "fom"]
+    result = df.filter(required_columns + ["date"])
+
+    key = ["problem", "platform"]
+    best_fom = df[key].join(best.rename("best"), on=key)["best"]
+    fom = df["fom"].astype(float)
+    if foms == "lower":
+        eff = (best_fom / fom).where(fom.notna(), 0.0)
+    else:
+        eff = fom / best_fom
+    result["app eff"] = eff.astype(float)
+
+    return result
 
 
-def application_efficiency(df, foms="lower"):
+@_staged("application_efficiency")
+def application_efficiency(df, foms="lower", *, engine="pandas"):
     """
     Calculate application efficiency.
 
@@ -23,10 +58,29 @@ def application_efficiency(df, foms="lower"):
         A pandas DataFrame storing performance data. The following columns are
         required: "problem", "platform", "application", "fom".
 
+        If `engine` is "polars", `df` may also be a Polars DataFrame or
+        LazyFrame. If `engine` is "duckdb", `df` may also be a path to
+        Parquet file(s) (which may contain wildcards) or a DuckDB relation.
+
     foms: string
         The interpretation of the figure of merit: "lower" if lower values are
         better, and "higher" if higher values are better.
 
+    engine: str, {"pandas", "polars", "duckdb"}, default: "pandas"
+        The library used to calculate application efficiency.
+
+        "polars" evaluates the calculation as a lazy, multi-threaded Polars
+        query, avoiding a conversion to pandas for Polars inputs. Missing
+        values are represented by nulls rather than NaN, and the "fom"
+        column must already have a numeric type.
+
+        "duckdb" evaluates the calculation as a SQL query using DuckDB,
+        which uses all available cores and can process data that does not
+        fit in memory (see the DuckDB "memory_limit" setting). The best FOM
+        for each (problem, platform) pair is aggregated separately and
+        joined back onto the data, so the order of the rows is not
+        preserved. The "fom" column must already have a numeric type.
+
     Returns
     -------
     DataFrame
@@ -34,15 +88,36 @@ def application_efficiency(df, foms="lower"):
         calculated from the performance data
         provided in `df`.
 
+        If `engine` is "polars", the result has the same type as `df`: a
+        LazyFrame input returns a LazyFrame that has not been collected.
+        If `engine` is "duckdb", a pandas DataFrame input returns a pandas
+        DataFrame, and any other input returns a DuckDB relation that has
+        not been executed (e.g. to be written with ``write_parquet()``).
+
     Raises
     ------
     ValueError
         If any of the required columns are missing from `df`.
         If `foms` is not "lower" or "higher".
+        If `engine` is not "pandas", "polars" or "duckdb".
 
     TypeError
         If any value in the "fom" column of `df` is a non-numeric value.
+        If `engine` is "polars" or "duckdb", and `df` is not one of the
+        types supported by the engine.
+
+    ImportError
+        If `engine` is "polars" or "duckdb", and the engine is not
+        installed.
     """
+    engines = {"polars": _polars_efficiency, "duckdb": _duckdb_efficiency}
+    if engine not in ["pandas"] + list(engines):
+        raise ValueError("'engine' must be 'pandas', 'polars' or 'duckdb'.")
+    if engine in engines:
+        if foms not in ["lower", "higher"]:
+            raise ValueError("FOM interpretation must be 'lower' or 'higher'")
+        return engines[engine](df, foms)
+
     required_columns = ["problem", "platform", "application", "fom"]
     _require_columns(df, required_columns)
     df = _cast_to_numeric(df, ["fom"])
@@ -50,24 +125,107 @@ def application_efficiency(df, foms="lower"):
     if foms not in ["lower", "higher"]:
         raise ValueError("FOM interpretation must be 'lower' or 'higher'")
 
-    result = df.filter(required_columns + ["date"])
+    best = _best_foms(df, foms)
+    return _efficiency(df, best, foms)
 
-    # Identify the best FOM for each (problem, platform) triple
-    key = ["problem", "platform"]
-    groups = df[key + ["fom"]].groupby(key)
-    best = groups.agg("min") if foms == "lower" else groups.agg("max")
-    best.reset_index(inplace=True)
-
-    # Calculate application efficiency
-    def app_eff(row):
-        value = [row["problem"], row["platform"]]
-        fom = float(row["fom"])
-        best_fom = float(best.loc[(best[key] == value).all(1)]["fom"].iloc[0])
-        if foms == "lower":
-            return 0.0 if numpy.isnan(fom) else (best_fom / fom)
-        else:
-            return fom / best_fom
-
-    result["app eff"] = result.apply(app_eff, axis=1)
 
-    return result
+def _chunk_reader(chunks, chunksize):
+    """
+    Return a function that creates a new iterator over the chunks for each
+    pass over the data.
+    """
+    if isinstance(chunks, str | os.PathLike):
+        return lambda: pd.read_csv(chunks, chunksize=chunksize)
+    if callable(chunks):
+        return chunks
+    if iter(chunks) is chunks:
+        raise TypeError(
+            "Chunks must be a path, a callable or a re-iterable collection, "
+            + "since the data is read twice.",
+        )
+    return lambda: iter(chunks)
+
+
+def application_efficiency_iter(chunks, foms="lower", chunksize=1000000):
+    """
+    Calculate application efficiency for data that does not fit in memory.
+
+    The data is read twice. The first pass identifies the best-known
+    performance for each combination of "platform" and "problem", and the
+    second pass calculates application efficiency one chunk at a time.
+    Memory usage is therefore bounded by the size of a chunk and the number
+    of (problem, platform) pairs, rather than by the number of rows.
+
+    Parameters
+    ----------
+    chunks: path, callable or iterable of DataFrames
+        The source of the performance data. If `chunks` is a path, the data
+        is read from a CSV file in chunks of `chunksize` rows. If `chunks` is
+        callable, it must return a new iterator of DataFrames each time it
+        is called. Otherwise, `chunks` must be a collection of DataFrames
+        that can be iterated over more than once (e.g. a list).
+
+        Each DataFrame requires the following columns: "problem",
+        "platform", "application", "fom".
+
+    foms: string
+        The interpretation of the figure of merit: "lower" if lower values are
+        better, and "higher" if higher values are better.
+
+    chunksize: int, default: 1000000
+        The number of rows to read from a CSV file at a time.
+
+    Returns
+    -------
+    iterator of DataFrames
+        An iterator of new pandas DataFrames storing the application
+        efficiency values calculated for each chunk of the performance data.
+
+    Raises
+    ------
+    ValueError
+        If any of the required columns are missing from a chunk.
+        If `foms` is not "lower" or "higher".
+
+    TypeError
+        If any value in the "fom" column of a chunk is a non-numeric value.
+        If `chunks` is an iterator, which can only be read once.
+
+    Examples
+    --------
+    >>> def chunks():
+    ...     return p3analysis.data.projection_iter(
+    ...         pd.read_csv("performance.csv", chunksize=100000),
+    ...         problem=["name"],
+    ...         application=["language"],
+    ...         platform=["arch"],
+    ...     )
+    >>> effs = p3analysis.metrics.application_efficiency_iter(chunks)
+    >>> for i, chunk in enumerate(effs):
+    ...     chunk.to_csv("efficiency.csv", mode="a", header=(i == 0))
+    """
+    if foms not in ["lower", "higher"]:
+        raise ValueError("FOM interpretation must be 'lower' or 'higher'")
+    reader = _chunk_reader(chunks, chunksize)
+
+    def _validate(chunk):
+        required_columns = ["problem", "platform", "application", "fom"]
+        _require_columns(chunk, required_columns)
+        return _cast_to_numeric(chunk, ["fom"])
+
+    # First pass: reduce each chunk to the best FOM for each group
+    best = None
+    for chunk in reader():
+        chunk_best = _best_foms(_validate(chunk), foms)
+        if best is None:
+            best = chunk_best
+            continue
+        groups = pd.concat([best, chunk_best]).groupby(level=[0, 1])
+        best = groups.min() if foms == "lower" else groups.max()
+
+    # Second pass: calculate efficiency relative to the best FOMs
+    def _efficiencies():
+        for chunk in reader():
+            yield _efficiency(_validate(chunk), best, foms)
+
+    return _efficiencies()
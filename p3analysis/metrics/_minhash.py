@@ -0,0 +1,117 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import numpy
+
+from p3analysis.metrics._sparse import _incidence
+
+# Segments are hashed by applying the SplitMix64 finalizer to (a * x + b)
+# mod 2^64, for random 64-bit values a and b. The finalizer ensures that
+# the hashes of consecutive segments are not correlated, which matters when
+# there are only a few segments. NumPy integer arithmetic wraps on overflow.
+_MIX = [
+    (numpy.uint64(30), numpy.uint64(0xBF58476D1CE4E5B9)),
+    (numpy.uint64(27), numpy.uint64(0x94D049BB133111EB)),
+]
+_FINAL_SHIFT = numpy.uint64(31)
+
+# Hashes are converted into uniform values in (0, 1) using their top 53 bits.
+_UNIFORM_SHIFT = numpy.uint64(11)
+_UNIFORM_SCALE = 1.0 / (1 << 53)
+
+# The hash functions are derived from a fixed seed, so that results are
+# reproducible.
+_SEED = 0
+
+# The number of (platform, segment) pairs hashed at a time.
+_CHUNKSIZE = 1 << 14
+
+
+def _hash_functions(num_perm):
+    """
+    Return the coefficients of num_perm random hash functions.
+    """
+    rng = numpy.random.default_rng(_SEED)
+    a = rng.integers(0, 1 << 64, size=(num_perm, 1), dtype=numpy.uint64)
+    b = rng.integers(0, 1 << 64, size=(num_perm, 1), dtype=numpy.uint64)
+    return a, b
+
+
+def _hash(a, b, values):
+    """
+    Hash an array of 64-bit values with each of the hash functions given by
+    a and b, returning an (num_perm, len(values)) array of uniform values in
+    the range (0, 1).
+    """
+    hashes = a * values + b
+    for shift, multiplier in _MIX:
+        hashes = (hashes ^ (hashes >> shift)) * multiplier
+    hashes ^= hashes >> _FINAL_SHIFT
+    return ((hashes >> _UNIFORM_SHIFT) + 0.5) * _UNIFORM_SCALE
+
+
+def _minhash_signatures(encoded, num_perm):
+    """
+    Compute a MinHash signature of the lines used by each platform, given a
+    list of encoded coverage maps.
+
+    Lines are grouped into segments that are used by the same platforms (see
+    _incidence), and each segment is hashed once rather than once per line.
+    Each hash is converted into an exponentially distributed value divided
+    by the length of the segment, so the minimum over the segments used by a
+    platform falls in each segment with probability proportional to its
+    length. Two platforms therefore share a minimum with probability equal
+    to the Jaccard similarity of their lines, as if every line were hashed.
+
+    Returns
+    -------
+    tuple of ndarray
+        An (n, num_perm) array of signatures, and whether each platform uses
+        any lines of code.
+    """
+    n = len(encoded)
+    a, b = _hash_functions(num_perm)
+    signatures = numpy.full((n, num_perm), numpy.inf)
+    used = numpy.zeros(n, dtype=bool)
+
+    rows, first, last, weights = _incidence(encoded)
+    used[rows] = True
+    lengths = last - first
+    offsets = numpy.concatenate([[0], numpy.cumsum(lengths)])
+
+    # Segments are hashed in chunks, and intervals are sorted by platform, so
+    # each chunk contains a contiguous run of segments from each platform
+    for start in range(0, offsets[-1], _CHUNKSIZE):
+        positions = numpy.arange(start, min(start + _CHUNKSIZE, offsets[-1]))
+        interval = numpy.searchsorted(offsets, positions, side="right") - 1
+        columns = first[interval] + (positions - offsets[interval])
+        uniform = _hash(a, b, columns.astype(numpy.uint64))
+        race = -numpy.log(uniform) / weights[columns]
+
+        chunk_rows = rows[interval]
+        boundaries = numpy.flatnonzero(numpy.diff(chunk_rows)) + 1
+        boundaries = numpy.concatenate([[0], boundaries])
+        minima = numpy.minimum.reduceat(race, boundaries, axis=1)
+        platforms = chunk_rows[boundaries]
+        signatures[platforms] = numpy.minimum(signatures[platforms], minima.T)
+
+    return signatures, used
+
+
+def _minhash_divergence(encoded, num_perm):
+    """
+    Fold a list of encoded coverage maps into an estimate of divergence,
+    using MinHash signatures to estimate the distance between platforms.
+    """
+    signatures, used = _minhash_signatures(encoded, num_perm)
+    signatures = signatures[used]
+    count = len(signatures)
+    if count < 2:
+        return 0
+
+    total = 0
+    for i in range(count - 1):
+        matches = signatures[i] == signatures[i + 1 :]
+        total += (1 - matches.mean(axis=1)).sum()
+    npairs = count * (count - 1) / 2
+    return total / npairs
@@ -0,0 +1,216 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import pandas as pd
+
+from p3analysis._utils import _import_optional, _require_columns
+from p3analysis.data._coverage import parse_coverage
+
+
+def _lazy(df, name="df"):
+    """
+    Convert a pandas or Polars DataFrame (or Polars LazyFrame) into a Polars
+    LazyFrame.
+
+    Returns the LazyFrame, and a function converting a LazyFrame back into
+    the type of the input.
+    """
+    pl = _import_optional("polars", "polars")
+    if isinstance(df, pl.LazyFrame):
+        return df, lambda result: result
+    if isinstance(df, pl.DataFrame):
+        return df.lazy(), lambda result: result.collect()
+    if isinstance(df, pd.DataFrame):
+        return pl.from_pandas(df).lazy(), lambda result: (
+            result.collect().to_pandas()
+        )
+    raise TypeError(
+        f"'{name}' must be a pandas DataFrame, or a Polars DataFrame or "
+        + "LazyFrame.",
+    )
+
+
+def _require_numeric(schema, columns):
+    """
+    Check that the named columns of a Polars schema are numeric.
+    """
+    pl = _import_optional("polars", "polars")
+    for column in columns:
+        dtype = schema[column]
+        if not (dtype.is_numeric() or dtype == pl.Null):
+            msg = "Column '%s' must contain only numeric values."
+            raise TypeError(msg % (column))
+
+
+def _missing(column):
+    """
+    Return an expression treating NaN values in a column as missing.
+    """
+    pl = _import_optional("polars", "polars")
+    return pl.col(column).cast(pl.Float64).fill_nan(None)
+
+
+def _polars_efficiency(df, foms):
+    """
+    Calculate application efficiency using Polars.
+    """
+    lf, convert = _lazy(df)
+    schema = lf.collect_schema()
+    required_columns = ["problem", "platform", "application", "fom"]
+    _require_columns(schema.names(), required_columns)
+    _require_numeric(schema, ["fom"])
+
+    key = ["problem", "platform"]
+    fom = _missing("fom")
+    if foms == "lower":
+        best = fom.min().over(key)
+        eff = (best / fom).fill_null(0.0)
+    else:
+        best = fom.max().over(key)
+        eff = fom / best
+
+    columns = required_columns + (["date"] if "date" in schema else [])
+    return convert(lf.select(*columns, eff.alias("app eff")))
+
+
+def _polars_efficiencies(df):
+    """
+    Check that a LazyFrame contains valid efficiency data.
+
+    Returns the LazyFrame, a function converting results back into the type
+    of the input, and the names of the efficiency column(s).
+    """
+    pl = _import_optional("polars", "polars")
+    lf, convert = _lazy(df)
+    schema = lf.collect_schema()
+    _require_columns(schema.names(), ["problem", "platform", "application"])
+
+    efficiencies = [eff for eff in ["app eff", "arch eff"] if eff in schema]
+    if len(efficiencies) == 0:
+        msg = "DataFrame must contain a column named 'arch eff' or 'app eff'."
+        raise ValueError(msg)
+    _require_numeric(schema, efficiencies)
+
+    # Both checks are evaluated together, so the input is only read once
+    ranges = lf.select(
+        [
+            _missing(eff).fill_null(0).is_between(0, 1).all()
+            for eff in efficiencies
+        ],
+    )
+    unique = lf.group_by(["platform", "application"]).agg(
+        [_missing(eff).drop_nulls().n_unique() for eff in efficiencies],
+    )
+    ranges, unique = pl.collect_all([ranges, unique])
+
+    for eff in efficiencies:
+        if not ranges[eff].item():
+            raise ValueError(f"{eff} must in range [0, 1]")
+    for eff in efficiencies:
+        if not (unique[eff] == 1).all():
+            raise ValueError(
+                "Each (application, platform) pair must be associated with "
+                + "exactly one efficiency value.",
+            )
+
+    return lf, convert, efficiencies
+
+
+def _polars_pp(df):
+    """
+    Calculate performance portability using Polars.
+    """
+    pl = _import_optional("polars", "polars")
+    lf, convert, efficiencies = _polars_efficiencies(df)
+
+    combination_keys = ["problem", "platform", "application"]
+    lf = lf.select(
+        *combination_keys,
+        *[_missing(eff).alias(eff) for eff in efficiencies],
+    )
+
+    # Add a "did not run" value for applications that did not run
+    combinations = None
+    for key in combination_keys:
+        unique = lf.select(key).unique(maintain_order=True)
+        if combinations is None:
+            combinations = unique
+        else:
+            combinations = combinations.join(
+                unique,
+                how="cross",
+                maintain_order="left_right",
+            )
+    missing = combinations.join(
+        lf,
+        on=combination_keys,
+        how="anti",
+        nulls_equal=True,
+        maintain_order="left",
+    )
+    lf = pl.concat([lf, missing], how="diagonal")
+
+    # Calculate performance portability for both types of efficiency
+    result = lf.group_by(["problem", "application"], maintain_order=True).agg(
+        [
+            pl.when((pl.col(eff).fill_null(0.0) == 0).any())
+            .then(0.0)
+            .otherwise(pl.len() / (1.0 / pl.col(eff)).sum())
+            .alias(eff.replace("eff", "pp"))
+            for eff in efficiencies
+        ],
+    )
+    return convert(result)
+
+
+def _polars_coverage_groups(df, cov, n_jobs):
+    """
+    Group the coverage data associated with each (problem, application)
+    pair using Polars.
+
+    Returns a DataFrame of (problem, application) pairs in sorted order, the
+    list of parsed coverage maps for each pair, and a function converting
+    results back into the type of the input.
+    """
+    pl = _import_optional("polars", "polars")
+    lf, convert = _lazy(df)
+    schema = lf.collect_schema()
+    key = ["problem", "application"]
+    _require_columns(schema.names(), ["problem", "platform", "application"])
+
+    if cov is None:
+        # The original df must already contain coverage information
+        _require_columns(schema.names(), ["coverage"])
+        coverage = lf.select("coverage").collect()["coverage"].to_list()
+        lf = lf.with_row_index("index")
+    else:
+        # Substitute the position of each coverage_key in cov, so that each
+        # row of cov is converted only once
+        _require_columns(schema.names(), ["coverage_key"])
+        cov, _ = _lazy(cov, "cov")
+        _require_columns(
+            cov.collect_schema().names(),
+            ["coverage_key", "coverage"],
+        )
+        cov = cov.select("coverage_key", "coverage").collect()
+        coverage = cov["coverage"].to_list()
+        keys = cov.lazy().select("coverage_key").with_row_index("index")
+        lf = lf.join(
+            keys,
+            on="coverage_key",
+            how="left",
+            maintain_order="left",
+        )
+
+        missing = lf.filter(pl.col("index").is_null()).select("coverage_key")
+        missing = missing.head(1).collect()
+        if len(missing) > 0:
+            msg = "No coverage data for coverage_key '%s'."
+            raise TypeError(msg % (missing["coverage_key"].item()))
+
+    coverage = parse_coverage(coverage, n_jobs=n_jobs)
+    groups = lf.group_by(key).agg(pl.col("index")).sort(key).collect()
+    maps = [
+        [coverage[i] for i in indices] for indices in groups["index"].to_list()
+    ]
+    return groups.select(key), maps, convert
@@ -4,9 +4,18 @@
 from itertools import product
 from statistics import harmonic_mean
 
+import numpy
 import pandas as pd
 
-from p3analysis._utils import _cast_to_numeric, _require_columns
+from p3analysis._utils import (
+    _cast_to_numeric,
+    _evaluate_subsets,
+    _require_columns,
+)
+from p3analysis.metrics._bootstrap import _bootstrap_pp
+from p3analysis.metrics._duckdb import _duckdb_pp
+from p3analysis.metrics._polars import _polars_pp
+from p3analysis.profiling._profile import _staged
 
 
 def _hmean(series):
@@ -19,7 +28,54 @@ def _hmean(series):
     return harmonic_mean(list(series))
 
 
-def pp(df):
+def _validate_efficiencies(df):
+    """
+    Check that the DataFrame contains valid efficiency data.
+
+    Returns a copy of the DataFrame with numeric efficiency column(s), and
+    the names of the efficiency column(s).
+    """
+    _require_columns(df, ["problem", "platform", "application"])
+
+    # We need at least one efficiency
+    efficiencies = []
+    if "app eff" in df:
+        efficiencies.append("app eff")
+    if "arch eff" in df:
+        efficiencies.append("arch eff")
+    if len(efficiencies) == 0:
+        msg = "DataFrame must contain a column named 'arch eff' or 'app eff'."
+        raise ValueError(msg)
+    df = _cast_to_numeric(df, efficiencies)
+
+    # Check that efficiencies are not given in percentages
+    for eff in efficiencies:
+        if not df[eff].fillna(0).between(0, 1).all():
+            raise ValueError(f"{eff} must in range [0, 1]")
+
+    # Check there is only one entry per (application, platform) pair.
+    for eff in efficiencies:
+        grouped = df.groupby(["platform", "application"])
+        if not (grouped[eff].nunique() == 1).all():
+            raise ValueError(
+                "Each (application, platform) pair must be associated with "
+                + "exactly one efficiency value.",
+            )
+
+    return df, efficiencies
+
+
+@_staged("pp")
+def pp(
+    df,
+    bootstrap=None,
+    ci=0.95,
+    *,
+    foms="lower",
+    seed=None,
+    n_jobs=None,
+    engine="pandas",
+):
     r"""
     Calculate performance portability from architectural and/or application
     efficiency.
@@ -43,6 +99,14 @@ def pp(df):
     .. _A Metric for Performance Portability:
         https://doi.org/10.48550/arXiv.1611.07409
 
+    If `bootstrap` is provided, application efficiency is instead calculated
+    from the mean of repeated "fom" measurements for each (problem, platform,
+    application), and a confidence interval is estimated by resampling those
+    measurements with replacement. All resamples are evaluated together as
+    NumPy array operations, in chunks that may be processed in parallel.
+    Architectural efficiency cannot be derived from "fom" measurements, so
+    only application performance portability can be bootstrapped.
+
     Parameters
     ----------
     df: DataFrame
@@ -50,6 +114,62 @@ def pp(df):
         always required: "problem", "platform", "application". At least one of
         the following two columns are required: "arch eff", "app eff".
 
+        If `bootstrap` is provided, a "fom" column is required instead of
+        the efficiency column(s), and there may be multiple rows for each
+        (problem, platform, application). The "arch eff" and "app eff"
+        columns must not be present, since application efficiency is
+        calculated from the "fom" column.
+
+        If `engine` is "polars", `df` may also be a Polars DataFrame or
+        LazyFrame. If `engine` is "duckdb", `df` may also be a path to
+        Parquet file(s) (which may contain wildcards) or a DuckDB relation.
+
+    bootstrap: int, optional
+        The number of bootstrap resamples used to estimate a confidence
+        interval for application performance portability.
+
+    ci: float, default: 0.95
+        The confidence level of the interval estimated by `bootstrap`.
+
+    foms: string, default: "lower"
+        The interpretation of the figure of merit when `bootstrap` is
+        provided: "lower" if lower values are better, and "higher" if higher
+        values are better.
+
+    seed: int, optional
+        A seed for the random number generator used by `bootstrap`.
+
+    n_jobs: int, optional
+        The number of threads used to evaluate bootstrap resamples.
+
+        Resamples are evaluated in chunks of at most 256. Each resample
+        uses approximately 32 bytes per "fom" measurement and 48 bytes per
+        (problem, platform, application) of temporary memory, and chunks
+        are made smaller for large inputs so that each thread uses at most
+        approximately 64 MiB (or the memory of a single resample, if
+        larger). The results of all resamples are kept until the interval
+        is computed, using 8 bytes per resample for each (problem,
+        application). The results do not depend on `n_jobs`.
+
+    engine: str, {"pandas", "polars", "duckdb"}, default: "pandas"
+        The library used to calculate performance portability.
+
+        "polars" evaluates the calculation as a lazy, multi-threaded Polars
+        query, avoiding a conversion to pandas for Polars inputs. The input
+        is validated eagerly, so a LazyFrame is evaluated once to check the
+        efficiency values and again when the result is collected. The
+        efficiency column(s) must already have a numeric type, and
+        `bootstrap` is not supported.
+
+        "duckdb" evaluates the calculation as SQL aggregate queries using
+        DuckDB, which uses all available cores and can process data that
+        does not fit in memory (see the DuckDB "memory_limit" setting).
+        Applications that did not run on every platform are identified by
+        counting platforms, rather than by adding rows. The input is
+        validated eagerly, and the rows of the result are sorted by
+        problem and application. The efficiency column(s) must already have
+        a numeric type, and `bootstrap` is not supported.
+
     Returns
     -------
     DataFrame
@@ -57,6 +177,14 @@ def pp(df):
         calculated from the architectural efficiency and/or application
         efficiency data provided in `df`.
 
+        If `bootstrap` is provided, the DataFrame stores "app pp", "app pp
+        lower" and "app pp upper" columns.
+
+        If `engine` is "polars", the result has the same type as `df`: a
+        LazyFrame input returns a LazyFrame that has not been collected.
+        If `engine` is "duckdb", a pandas DataFrame input returns a pandas
+        DataFrame, and any other input returns a DuckDB relation.
+
     Raises
     ------
     ValueError
@@ -64,36 +192,41 @@ def pp(df):
         If any (application, platform) pair has multiple efficiency values,
         since the pp metric calculation for each application expects one
         efficiency value per platform.
+        If `bootstrap` is not a positive integer, `ci` is not in range
+        (0, 1), or `foms` is not "lower" or "higher".
+        If `bootstrap` is provided and `df` contains an "arch eff" or "app
+        eff" column.
+        If `engine` is not "pandas", "polars" or "duckdb", or if `engine` is
+        "polars" or "duckdb" and `bootstrap` is provided.
 
     TypeError
         If any of the values in the efficiency column(s) are non-numeric.
-    """
-    _require_columns(df, ["problem", "platform", "application"])
+        If `engine` is "polars" or "duckdb", and `df` is not one of the
+        types supported by the engine.
 
-    # We need at least one efficiency
-    efficiencies = []
-    if "app eff" in df:
-        efficiencies.append("app eff")
-    if "arch eff" in df:
-        efficiencies.append("arch eff")
-    if len(efficiencies) == 0:
-        msg = "DataFrame must contain a column named 'arch eff' or 'app eff'."
-        raise ValueError(msg)
-    df = _cast_to_numeric(df, efficiencies)
-
-    # Check that efficiencies are not given in percentages
-    for eff in efficiencies:
-        if not df[eff].fillna(0).between(0, 1).all():
-            raise ValueError(f"{eff} must in range [0, 1]")
+    ImportError
+        If `engine` is "polars" or "duckdb", and the engine is not
+        installed.
+    """
+    engines = {"polars": _polars_pp, "duckdb": _duckdb_pp}
+    if engine not in ["pandas"] + list(engines):
+        raise ValueError("'engine' must be 'pandas', 'polars' or 'duckdb'.")
+    if engine in engines:
+        if bootstrap is not None:
+            raise ValueError(f"'bootstrap' is not supported by '{engine}'.")
+        return engines[engine](df)
 
-    # Check there is only one entry per (application, platform) pair.
-    for eff in efficiencies:
-        grouped = df.groupby(["platform", "application"])
-        if not (grouped[eff].nunique() == 1).all():
+    if bootstrap is not None:
+        efficiencies = [e for e in ["app eff", "arch eff"] if e in df]
+        if efficiencies:
             raise ValueError(
-                "Each (application, platform) pair must be associated with "
-                + "exactly one efficiency value.",
+                "'bootstrap' calculates application efficiency from 'fom', "
+                + "and cannot be used with an efficiency column: "
+                + str(efficiencies),
             )
+        return _bootstrap_pp(df, bootstrap, ci, foms, seed, n_jobs)
+
+    df, efficiencies = _validate_efficiencies(df)
 
     # Add a "did not run" value for applications that did not run
     rows = []
@@ -131,3 +264,123 @@ def pp(df):
         pp = pp.astype({new_column: "float64"})
 
     return pp
+
+
+def _pp_subsets(df, efficiencies, max_size, chunksize):
+    """
+    Generate DataFrames of performance portability values for all subsets
+    of platforms, each containing approximately chunksize rows.
+    """
+    platforms = df["platform"].unique()
+    key = ["problem", "application"]
+    wide = df.groupby(key + ["platform"])[efficiencies].first().unstack()
+
+    # Add a "did not run" value for applications that did not run, including
+    # applications that did not run on any platform for a problem
+    wide = wide.reindex(
+        pd.MultiIndex.from_product(
+            [df["problem"].unique(), df["application"].unique()],
+            names=key,
+        ),
+    )
+    wide = wide.reindex(
+        pd.MultiIndex.from_product([efficiencies, platforms]),
+        axis=1,
+    )
+    wide = wide.astype(float).fillna(0.0)
+
+    # Store reciprocal efficiencies and unsupported platforms separately,
+    # so that subset sums never contain infinities.
+    ngroups = len(wide.index)
+    values = wide.to_numpy().reshape(ngroups, len(efficiencies), -1)
+    unsupported = values == 0
+    reciprocals = numpy.divide(
+        1.0,
+        values,
+        out=numpy.zeros_like(values),
+        where=~unsupported,
+    )
+
+    def start(i):
+        return reciprocals[:, :, i], unsupported[:, :, i].astype(int)
+
+    def extend(state, i):
+        sums, counts = state
+        return sums + reciprocals[:, :, i], counts + unsupported[:, :, i]
+
+    def evaluate(state, size):
+        sums, counts = state
+        with numpy.errstate(divide="ignore"):
+            return numpy.where(counts > 0, 0.0, size / sums)
+
+    return _evaluate_subsets(
+        platforms,
+        max_size,
+        chunksize,
+        (
+            wide.index.get_level_values("problem"),
+            wide.index.get_level_values("application"),
+        ),
+        [eff.replace("eff", "pp") for eff in efficiencies],
+        start,
+        extend,
+        evaluate,
+    )
+
+
+def pp_subsets(df, max_size=None, chunksize=None):
+    r"""
+    Calculate performance portability for every subset of platforms.
+
+    Performance portability is defined for a specific set of platforms,
+    :math:`H`. This function evaluates :math:`PP(a, p, H)` (see
+    :py:func:`p3analysis.metrics.pp`) for every non-empty subset :math:`H` of
+    the platforms in `df`, reusing the sum of reciprocal efficiencies from
+    each subset when evaluating the subsets that extend it. Each additional
+    subset therefore costs a constant amount of work per (problem,
+    application) pair.
+
+    Parameters
+    ----------
+    df: DataFrame
+        A pandas DataFrame storing performance data. The following columns are
+        always required: "problem", "platform", "application". At least one of
+        the following two columns are required: "arch eff", "app eff".
+
+    max_size: int, optional
+        The maximum number of platforms in each subset. If no value is
+        provided, subsets of all sizes are evaluated.
+
+    chunksize: int, optional
+        If provided, return an iterator of DataFrames, each containing
+        approximately `chunksize` rows, instead of a single DataFrame. Use
+        this to stream results when the number of platforms is large.
+
+    Returns
+    -------
+    DataFrame or iterator of DataFrames
+        A new pandas DataFrame storing the performance portability values
+        calculated for each subset of platforms. The "platforms" column
+        contains a tuple of the platforms in each subset.
+
+    Raises
+    ------
+    ValueError
+        If any of the required columns are missing from `df`.
+        If any (application, platform) pair has multiple efficiency values.
+        If `max_size` or `chunksize` is not a positive integer.
+
+    TypeError
+        If any of the values in the efficiency column(s) are non-numeric.
+    """
+    df, efficiencies = _validate_efficiencies(df)
+
+    if max_size is None:
+        max_size = max(len(df["platform"].unique()), 1)
+    if not isinstance(max_size, int) or max_size < 1:
+        raise ValueError("'max_size' must be a positive integer.")
+    if chunksize is not None:
+        if not isinstance(chunksize, int) or chunksize < 1:
+            raise ValueError("'chunksize' must be a positive integer.")
+        return _pp_subsets(df, efficiencies, max_size, chunksize)
+    return next(_pp_subsets(df, efficiencies, max_size, chunksize))
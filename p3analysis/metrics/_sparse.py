@@ -0,0 +1,172 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import importlib
+
+import numpy
+
+from p3analysis.data._intervals import _to_intervals
+
+# The maximum number of non-zeros (and, when SciPy is not available, the
+# maximum number of columns) in each block of the incidence matrix.
+_MAX_NNZ = 1 << 22
+_BLOCKSIZE = 1 << 16
+
+
+def _scipy_sparse():
+    """
+    Return the scipy.sparse module, or None if SciPy is not installed.
+    """
+    try:
+        return importlib.import_module("scipy.sparse")
+    except ImportError:
+        return None
+
+
+def _layout(encoded):
+    """
+    Lay out the lines used by a list of encoded coverage maps along a single
+    axis, placing all files one after another.
+
+    Returns
+    -------
+    tuple of ndarray
+        The platform of each interval, and the start and end of each
+        half-open interval. The intervals of each platform are sorted and do
+        not overlap.
+    """
+    empty = numpy.zeros(0, dtype=numpy.int64)
+    indices = numpy.concatenate([empty] + [e[0] for e in encoded])
+    starts = numpy.concatenate([empty] + [e[1] for e in encoded])
+    ends = numpy.concatenate([empty] + [e[2] for e in encoded])
+    if len(indices) == 0:
+        return empty, empty, empty
+    indices = indices.astype(numpy.int64)
+
+    # Offset each file so that no two files overlap
+    nfiles = indices.max() + 1
+    first = numpy.full(nfiles, numpy.iinfo(numpy.int64).max)
+    last = numpy.full(nfiles, numpy.iinfo(numpy.int64).min)
+    numpy.minimum.at(first, indices, starts)
+    numpy.maximum.at(last, indices, ends)
+    used = last > first
+    first = numpy.where(used, first, 0)
+    extents = numpy.where(used, last - first, 0)
+    offsets = numpy.concatenate([[0], numpy.cumsum(extents)[:-1]])
+    shift = (offsets - first)[indices]
+
+    # Merge overlapping intervals used by the same platform
+    rows = []
+    merged_starts = []
+    merged_ends = []
+    position = 0
+    for p, (f, s, e) in enumerate(encoded):
+        count = len(f)
+        shifted = shift[position : position + count]
+        position += count
+        if count == 0:
+            continue
+        s, e = _to_intervals(
+            numpy.column_stack([s + shifted, e + shifted - 1]),
+        )
+        rows.append(numpy.full(len(s), p))
+        merged_starts.append(s)
+        merged_ends.append(e)
+    return (
+        numpy.concatenate(rows),
+        numpy.concatenate(merged_starts),
+        numpy.concatenate(merged_ends),
+    )
+
+
+def _incidence(encoded):
+    """
+    Describe a sparse platform-by-segment incidence matrix, given a list of
+    encoded coverage maps.
+
+    The axis containing all lines (see _layout) is split into segments at
+    the boundary of every interval. Each platform either uses all of the
+    lines in a segment or none of them, so each segment can be represented
+    by a single column weighted by its length.
+
+    Returns
+    -------
+    tuple of ndarray
+        The row of each interval, the first column and last column (plus
+        one) of each interval, and the weight of each column.
+    """
+    rows, starts, ends = _layout(encoded)
+    if len(rows) == 0:
+        return rows, starts, ends, numpy.zeros(0)
+
+    # Each interval covers a contiguous range of segments
+    bounds = numpy.unique(numpy.concatenate([starts, ends]))
+    weights = numpy.diff(bounds).astype(float)
+    first = numpy.searchsorted(bounds, starts)
+    last = numpy.searchsorted(bounds, ends)
+    return rows, first, last, weights
+
+
+def _blocks(first, last, ncolumns, max_nnz, max_columns):
+    """
+    Split the columns of an incidence matrix into blocks, each containing
+    at most max_nnz non-zeros (unless a single column contains more) and at
+    most max_columns columns.
+    """
+    delta = numpy.zeros(ncolumns + 1, dtype=numpy.int64)
+    numpy.add.at(delta, first, 1)
+    numpy.add.at(delta, last, -1)
+    nnz = numpy.concatenate([[0], numpy.cumsum(numpy.cumsum(delta[:-1]))])
+
+    start = 0
+    while start < ncolumns:
+        stop = numpy.searchsorted(nnz, nnz[start] + max_nnz, side="right")
+        stop = min(max(stop - 1, start + 1), start + max_columns, ncolumns)
+        yield start, stop
+        start = stop
+
+
+def _sparse_intersections(encoded):
+    """
+    Compute the number of lines used by each pair of platforms, given a list
+    of encoded coverage maps.
+
+    Intersections are computed as M W M^T, where M is the incidence matrix
+    and W is a diagonal matrix of segment lengths, accumulating the product
+    over blocks of columns to bound memory usage. SciPy is used if it is
+    installed; otherwise, each block of M is stored as a dense matrix.
+    """
+    n = len(encoded)
+    rows, first, last, weights = _incidence(encoded)
+    ncolumns = len(weights)
+
+    sparse = _scipy_sparse()
+    if sparse is not None:
+        max_columns = ncolumns
+    else:
+        max_columns = _BLOCKSIZE
+
+    intersections = numpy.zeros((n, n))
+    for start, stop in _blocks(first, last, ncolumns, _MAX_NNZ, max_columns):
+        overlap = (first < stop) & (last > start)
+        lo = numpy.maximum(first[overlap], start) - start
+        hi = numpy.minimum(last[overlap], stop) - start
+        counts = hi - lo
+        offsets = numpy.cumsum(counts) - counts
+        steps = numpy.arange(counts.sum()) - numpy.repeat(offsets, counts)
+        block_rows = numpy.repeat(rows[overlap], counts)
+        block_columns = numpy.repeat(lo, counts) + steps
+        block_weights = weights[start:stop]
+
+        if sparse is not None:
+            m = sparse.csr_matrix(
+                (numpy.ones(len(block_rows)), (block_rows, block_columns)),
+                shape=(n, stop - start),
+            )
+            product = m.multiply(block_weights).tocsr() @ m.T
+            intersections += product.toarray()
+        else:
+            m = numpy.zeros((n, stop - start))
+            m[block_rows, block_columns] = 1
+            intersections += (m * block_weights) @ m.T
+    return intersections
@@ -9,8 +9,10 @@
 import copy
 
 from p3analysis._utils import _cast_to_numeric, _require_columns
+from p3analysis.profiling._profile import _staged
 
 
+@_staged("cascade")
 def cascade(
     df,
     eff=None,
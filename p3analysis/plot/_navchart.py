@@ -4,8 +4,10 @@
 import copy
 
 from p3analysis._utils import _cast_to_numeric, _require_columns
+from p3analysis.profiling._profile import _staged
 
 
+@_staged("navchart")
 def navchart(
     pp,
     cd,
@@ -0,0 +1,16 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+from p3analysis.profiling._profile import (
+    Profiler,
+    add_callback,
+    profile,
+    remove_callback,
+)
+
+__all__ = [
+    "Profiler",
+    "add_callback",
+    "profile",
+    "remove_callback",
+]
@@ -0,0 +1,279 @@
+# Copyright (c) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import contextlib
+import cProfile
+import functools
+import pstats
+import time
+import tracemalloc
+
+import pandas as pd
+
+# Callbacks invoked whenever a stage finishes.
+_callbacks = []
+
+# Profilers that are currently active, innermost last.
+_profilers = []
+
+# Stages that are currently running, innermost last.
+_stages = []
+
+# Whether any stage should be recorded. This is checked before doing any
+# other work, so that instrumentation has no overhead when disabled.
+_enabled = False
+
+_disabled = contextlib.nullcontext()
+
+
+def _update():
+    """
+    Enable or disable instrumentation.
+    """
+    global _enabled
+    _enabled = bool(_callbacks or _profilers)
+
+
+class _Stage:
+    """
+    Measure a single stage, and report the results to all profilers and
+    callbacks when it finishes.
+    """
+
+    def __init__(self, name, rows):
+        self.name = name
+        self.rows = rows
+        self.memory = any(p.memory for p in _profilers)
+        self.cprofile = any(p.cprofile for p in _profilers)
+
+    def __enter__(self):
+        self.parent = _stages[-1] if _stages else None
+        _stages.append(self)
+
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.parent is not None and self.parent.memory:
+                self.parent.peak = max(self.parent.peak, peak)
+            tracemalloc.reset_peak()
+            self.baseline = current
+            self.peak = current
+
+        # Only one cProfile profiler can be active at a time
+        self.profile = None
+        if self.cprofile:
+            if self.parent is not None and self.parent.profile is not None:
+                self.parent.profile.disable()
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *args):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+
+        if self.profile is not None:
+            self.profile.disable()
+            if self.parent is not None and self.parent.profile is not None:
+                self.parent.profile.enable()
+
+        record = {
+            "stage": self.name,
+            "parent": self.parent.name if self.parent is not None else None,
+            "wall time": wall,
+            "cpu time": cpu,
+            "rows": self.rows,
+        }
+        if self.memory:
+            peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            record["peak memory"] = peak - self.baseline
+            if self.parent is not None and self.parent.memory:
+                self.parent.peak = max(self.parent.peak, peak)
+        if self.profile is not None:
+            record["profile"] = pstats.Stats(self.profile)
+
+        _stages.pop()
+        for profiler in _profilers:
+            profiler._records.append(record)
+        for callback in list(_callbacks):
+            callback(record)
+        return False
+
+
+def _stage(name, rows=None):
+    """
+    Return a context manager that measures a stage of the library.
+
+    If instrumentation is disabled, the context manager does nothing.
+    """
+    if not _enabled:
+        return _disabled
+    return _Stage(name, rows)
+
+
+def _staged(name):
+    """
+    Return a decorator that measures each call to a function as a stage,
+    where the number of rows is the length of the first argument.
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            try:
+                rows = len(args[0])
+            except (IndexError, TypeError):
+                rows = None
+            with _Stage(name, rows):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class Profiler:
+    """
+    Records the time and resources used by each stage of the P3 Analysis
+    Library while active. Use :py:func:`p3analysis.profiling.profile` to
+    create a Profiler.
+    """
+
+    def __init__(self, memory=False, cprofile=False):
+        self.memory = memory
+        self.cprofile = cprofile
+        self._records = []
+        self._tracemalloc = False
+
+    def __enter__(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracemalloc = True
+        _profilers.append(self)
+        _update()
+        return self
+
+    def __exit__(self, *args):
+        _profilers.remove(self)
+        _update()
+        if self._tracemalloc:
+            tracemalloc.stop()
+            self._tracemalloc = False
+        return False
+
+    @property
+    def records(self):
+        """
+        The records of all stages that have finished, in the order in which
+        they finished.
+        """
+        return list(self._records)
+
+    def to_dataframe(self):
+        """
+        Return the records of all stages as a DataFrame.
+
+        Returns
+        -------
+        DataFrame
+            A new pandas DataFrame with one row per stage, in the order in
+            which the stages finished. The following columns are always
+            present: "stage", "parent", "wall time", "cpu time", "rows".
+            If memory was profiled, the "peak memory" column stores the peak
+            memory allocated during each stage, in bytes. If cProfile was
+            enabled, the "profile" column stores a :py:class:`pstats.Stats`
+            object for each stage.
+        """
+        columns = ["stage", "parent", "wall time", "cpu time", "rows"]
+        if self.memory:
+            columns.append("peak memory")
+        if self.cprofile:
+            columns.append("profile")
+        return pd.DataFrame(self._records, columns=columns)
+
+
+def profile(memory=False, cprofile=False):
+    """
+    Profile each stage of the P3 Analysis Library.
+
+    While the returned :py:class:`Profiler` is active (i.e. within a
+    ``with`` statement), the following stages are recorded each time they
+    run: "projection", "parse_coverage", "application_efficiency", "pp",
+    "divergence", "cascade", "navchart", "savefig" and "snapshot". Stages
+    may be nested (e.g. "snapshot" contains several other stages).
+
+    For each stage, the profiler records the wall-clock time, the CPU time
+    used by the current process and the number of input rows (where this is
+    meaningful). When no profiler is active and no callback is registered,
+    the library does no additional work.
+
+    Parameters
+    ----------
+    memory: bool, default: False
+        Whether to record the peak memory allocated during each stage, using
+        :py:mod:`tracemalloc`. Tracing memory allocations slows down
+        execution.
+
+    cprofile: bool, default: False
+        Whether to run :py:mod:`cProfile` during each stage. Time spent in
+        nested stages is only included in the profile of the nested stage.
+
+    Returns
+    -------
+    Profiler
+        A context manager recording the results of each stage.
+
+    Examples
+    --------
+    >>> with p3analysis.profiling.profile() as profiler:
+    ...     p3analysis.report.snapshot(df, cov)
+    >>> print(profiler.to_dataframe())
+    """
+    return Profiler(memory=memory, cprofile=cprofile)
+
+
+def add_callback(callback):
+    """
+    Register a function to be called whenever a stage of the P3 Analysis
+    Library finishes.
+
+    Parameters
+    ----------
+    callback: callable
+        A function accepting a single argument: a dictionary describing the
+        stage, with the keys "stage", "parent", "wall time", "cpu time" and
+        "rows" (see :py:func:`p3analysis.profiling.profile`).
+
+    Raises
+    ------
+    TypeError
+        If `callback` is not callable.
+    """
+    if not callable(callback):
+        raise TypeError("'callback' must be callable.")
+    _callbacks.append(callback)
+    _update()
+
+
+def remove_callback(callback):
+    """
+    Unregister a function registered with
+    :py:func:`p3analysis.profiling.add_callback`.
+
+    Parameters
+    ----------
+    callback: callable
+        A function previously passed to
+        :py:func:`p3analysis.profiling.add_callback`.
+
+    Raises
+    ------
+    ValueError
+        If `callback` is not registered.
+    """
+    _callbacks.remove(callback)
+    _update()
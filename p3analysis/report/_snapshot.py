@@ -2,27 +2,50 @@
 # SPDX-License-Identifier: MIT
 
 import collections
+import contextlib
+import hashlib
+import heapq
+import io
+import json
 import os
+import re
+import uuid
 
 import matplotlib.pyplot as plt
 
 import p3analysis.metrics
 import p3analysis.plot
 from p3analysis._utils import _require_columns
-from p3analysis.metrics._divergence import _coverage_string_to_json
+from p3analysis.metrics._divergence import (
+    _coverage_to_setmap,
+    _join_coverage,
+)
+from p3analysis.profiling._profile import _stage, _staged
 
 
 def _tmpdir(prefix):
     """
-    Return the next unused directory name of the form prefix000
+    Create and return a new directory of the form prefix000, with a suffix
+    greater than that of any existing directory.
+
+    The current directory is scanned once, and creating the directory is
+    retried with the next suffix if another process creates it first.
     """
+    pattern = re.compile(re.escape(prefix) + r"(\d{3,})")
     suffix = 0
+    with os.scandir() as entries:
+        for entry in entries:
+            match = pattern.fullmatch(entry.name)
+            if match:
+                suffix = max(suffix, int(match.group(1)) + 1)
     while True:
         name = f"{prefix}{suffix:0>3}"
-        if not os.path.exists(name):
-            break
-        suffix += 1
-    return name
+        try:
+            os.mkdir(name)
+        except FileExistsError:
+            suffix += 1
+            continue
+        return name
 
 
 def _block_symlinks(path):
@@ -52,7 +75,284 @@ def _sort_by_app_order(df, app_order):
     return df
 
 
-def snapshot(df, cov=None, directory=None):
+def _digest(*frames):
+    """
+    Return a digest of the content of one or more DataFrames, identifying
+    the inputs of a snapshot artifact.
+    """
+    digest = hashlib.sha256(p3analysis.__version__.encode())
+    for frame in frames:
+        columns = [column for column in frame.columns if column != "coverage"]
+        digest.update(frame[columns].to_csv(index=False).encode())
+        if "coverage" not in frame:
+            continue
+        for coverage in frame["coverage"]:
+            if not isinstance(coverage, str):
+                coverage = json.dumps(
+                    coverage,
+                    sort_keys=True,
+                    default=lambda value: value.tolist(),
+                )
+            digest.update(b"\0" + coverage.encode())
+    return digest.hexdigest()
+
+
+def _exists(path, dir_fd):
+    """
+    Check whether a path exists relative to dir_fd, without following
+    symbolic links.
+    """
+    try:
+        os.stat(path, dir_fd=dir_fd, follow_symlinks=False)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _setmaps(p3df):
+    """
+    Fold the coverage of the latest result for each (platform, application)
+    pair into a setmap for each application.
+    """
+    p3df = p3df.drop_duplicates(
+        ["platform", "application"],
+        keep="last",
+        ignore_index=True,
+    ).dropna()
+
+    # This function is defined inline so that it can access the platform name.
+    def coverage_to_setmap(maps):
+        """
+        Fold a list of coverage maps into a setmap.
+        """
+        platforms = p3df.loc[maps.index, "platform"].tolist()
+        setmap = collections.defaultdict(int)
+        for pset, count in _coverage_to_setmap(maps.tolist()).items():
+            setmap[frozenset(platforms[p] for p in pset)] += count
+        return setmap
+
+    groups = p3df[["problem", "application", "coverage"]].groupby(
+        ["problem", "application"],
+    )
+    setmaps = groups.agg(coverage_to_setmap)
+    setmaps.reset_index(inplace=True)
+    setmaps.rename(columns={"coverage": "setmap"}, inplace=True)
+
+    return setmaps
+
+
+# Renders the rows of a compact table one page at a time, sorting them when
+# a column header is clicked.
+_TABLE_SCRIPT = """
+(function () {
+  var get = function (id) { return document.getElementById(id); };
+  var rows = JSON.parse(get("divergence-data").textContent).rows;
+  var size = 50, page = 0, column = null, ascending = true;
+  var table = get("divergence-table"), body = table.querySelector("tbody");
+  var pages = function () {
+    return Math.max(1, Math.ceil(rows.length / size));
+  };
+  function render() {
+    body.replaceChildren();
+    rows.slice(page * size, (page + 1) * size).forEach(function (row) {
+      var tr = document.createElement("tr");
+      row.forEach(function (value) {
+        var td = document.createElement("td");
+        td.textContent = value;
+        tr.appendChild(td);
+      });
+      body.appendChild(tr);
+    });
+    get("divergence-page").textContent = "Page " + (page + 1) + " of " +
+      pages() + " (" + rows.length + " rows)";
+  }
+  table.querySelectorAll("th").forEach(function (th, i) {
+    th.addEventListener("click", function () {
+      ascending = column === i ? !ascending : i !== 2;
+      column = i;
+      rows.sort(function (a, b) {
+        var order = a[i] < b[i] ? -1 : a[i] > b[i] ? 1 : 0;
+        return ascending ? order : -order;
+      });
+      page = 0;
+      render();
+    });
+  });
+  get("divergence-prev").onclick = function () {
+    page = Math.max(page - 1, 0);
+    render();
+  };
+  get("divergence-next").onclick = function () {
+    page = Math.min(page + 1, pages() - 1);
+    render();
+  };
+  render();
+})();
+"""
+
+
+def _compact_rows(setmaps, max_sets):
+    """
+    Return the rows of a compact table, including only the `max_sets`
+    platform sets using the most lines of code for each application.
+
+    The remaining platform sets of each application are aggregated into a
+    single row.
+    """
+    rows = []
+    for _, row in setmaps.iterrows():
+        application = str(row["application"])
+        setmap = row["setmap"]
+        top = heapq.nlargest(max_sets, setmap.items(), key=lambda x: x[1])
+        for platforms, lines in top:
+            pstring = "{" + ", ".join(sorted(platforms)) + "}"
+            rows.append([application, pstring, int(lines)])
+        others = len(setmap) - len(top)
+        if others > 0:
+            lines = sum(setmap.values()) - sum(lines for _, lines in top)
+            plural = "s" if others > 1 else ""
+            pstring = f"({others} other platform set{plural})"
+            rows.append([application, pstring, int(lines)])
+    return rows
+
+
+def _compact_table(setmaps, max_sets):
+    """
+    Return the HTML for a compact table, which embeds its rows as a JSON
+    payload paginated and sorted by the browser.
+    """
+    payload = json.dumps(
+        {"rows": _compact_rows(setmaps, max_sets)},
+        separators=(",", ":"),
+    )
+    # Prevent the payload from closing the script element early
+    payload = payload.replace("</", "<\\/")
+    html = []
+    html += ['<table id="divergence-table">']
+    html += [
+        """<thead><tr>
+                <th>Application</th>
+                <th>Platform Set</th>
+                <th>LOC</th>
+            </tr></thead>""",
+    ]
+    html += ["<tbody></tbody>"]
+    html += ["</table>"]
+    html += ['<p class="pagination">']
+    html += ['<button id="divergence-prev">Previous</button>']
+    html += ['<span id="divergence-page"></span>']
+    html += ['<button id="divergence-next">Next</button>']
+    html += ["</p>"]
+    html += [
+        f'<script type="application/json" id="divergence-data">{payload}'
+        + "</script>",
+    ]
+    html += [f"<script>{_TABLE_SCRIPT}</script>"]
+    return html
+
+
+def _html(
+    setmaps,
+    cascade='<img src="cascade.png" alt="cascade-plot" />',
+    navchart='<img src="navchart.png" alt="navchart" />',
+    table="full",
+    max_sets=100,
+):
+    """
+    Return the HTML report, including a table of the lines of code used by
+    each set of platforms.
+
+    The cascade plot and navigation chart are included using the markup
+    provided, which either links to an image or embeds the figure. If
+    `table` is "compact", the table is generated by _compact_table().
+    """
+    # Generate an HTML report
+    # this is a minified CSS to be embedded in the HTML report
+    css = """
+td,th{padding-left:10px;padding-right:10px}body{margin:24px}html{font-family:'Gill Sans','Gill Sans MT',Calibri,'Trebuchet MS',sans-serif}@media only screen and (min-width:768px){html{width:auto}}.cascade-navchart{display:inline-flex;align-content:end;margin:auto;gap:15px;min-width:100%}.cascade-navchart>figure>img,.cascade-navchart>figure>svg{max-width:40vw;max-height:40vw;height:auto}figcaption::before{content:"Figure:"}figcaption{font-style:italic}table{border-collapse:collapse;max-width:60%}th{font-size:1.1rem}#divergence-table th{cursor:pointer}.pagination{display:flex;gap:10px;align-items:center}tr:nth-of-type(2n){background-color:rgba(0,0,0,.15)}tr:first-of-type{border-top:2px solid #000}tr:last-of-type{border-bottom:2px solid #000}    # noqa: E501
+    """
+    html = []
+    html += ["<html>"]
+    html += ['<meta charset="UTF-8">']
+    html += [
+        '<meta name="viewport" content="width=device-width, initial-scale=1.0">',  # noqa: E501
+    ]
+    html += ['<meta http-equiv="X-UA-Compatible" content="ie=edge">']
+    html += [
+        "<title>Performance, Portability & Productivity (P3) Snapshot</title>",
+    ]
+    html += [f"<style>{css}</style>"]
+
+    # now start working on the material
+    html += ["<body>"]
+    html += ["<header>"]
+    html += ["<h1>Performance, Portability & Productivity (P3) Snapshot</h1>"]
+    html += ["</header>"]
+
+    # section containing the plots
+    html += [
+        f"""<section>
+        <h2>Performance Portability, Code Convergence</h2>
+        <div class="cascade-navchart">
+            <figure>
+                {cascade}
+                <figcaption>
+                    <p>Performance Portability</p>
+                </figcaption>
+            </figure>
+            <figure>
+                {navchart}
+                <figcaption>
+                    <p>Performance Portability vs Code Convergence</p>
+                </figcaption>
+            </figure>
+        </div>
+    </section>""",
+    ]
+
+    html += ["<section>"]
+    html += ["<h2>Code Divergence</h2>"]
+    if table == "compact":
+        html += _compact_table(setmaps, max_sets)
+    else:
+        html += ["<table>"]
+        # table header
+        html += [
+            """<tr>
+                    <th>Application</th>
+                    <th>Platform Set</th>
+                    <th>LOC</th>
+                </tr>""",
+        ]
+        for index, row in setmaps.iterrows():
+            application = row["application"]
+            for platforms, lines in row["setmap"].items():
+                pstring = "{" + ", ".join(sorted(platforms)) + "}"
+                html += ["<tr>"]
+                html += [
+                    f"<td>{application}</td><td>{pstring}</td>"
+                    + f"<td>{lines}</td>",
+                ]
+                html += ["</tr>"]
+        html += ["</table>"]
+    html += ["</body>"]
+    html += ["</html>"]
+    return "\n".join(html)
+
+
+@_staged("snapshot")
+def snapshot(
+    df,
+    cov=None,
+    directory=None,
+    *,
+    foms="lower",
+    n_jobs=None,
+    update=False,
+    format="png",
+    table="full",
+    max_sets=100,
+):
     """
     Generate an HTML report representing a snapshot of P3 characteristics.
 
@@ -85,8 +385,54 @@ def snapshot(df, cov=None, directory=None):
 
     directory: string, optional
         The directory in which to generate the HTML report. If no value is
-        provided, a directory name of the form snapshot000 will be chosen
-        automatically.
+        provided, a new directory of the form snapshot000 will be created,
+        numbered after any existing snapshot directories.
+
+    foms: string, default: "lower"
+        The interpretation of the figure of merit: "lower" if lower values are
+        better, and "higher" if higher values are better (see
+        :py:func:`p3analysis.metrics.application_efficiency`).
+
+    n_jobs: int, optional
+        The number of processes used to parse coverage data and to calculate
+        code divergence (see :py:func:`p3analysis.metrics.divergence`).
+
+    update: bool, default: False
+        Whether to update an existing report in `directory`.
+
+        Each file in the report is regenerated only if the data it depends
+        on has changed since the report was generated: the cascade plot
+        depends on the latest efficiencies, the navigation chart on the
+        performance portability and coverage data, and the table on the
+        coverage data of the latest results. Coverage data is only parsed
+        if a file depending on it must be regenerated. Digests of these
+        inputs are stored in "manifest.json".
+
+        Every file is written to a temporary file that replaces the
+        original only once complete, so an interrupted update never leaves
+        a partially written file.
+
+    format: {"png", "svg-inline"}, default: "png"
+        How figures are included in the report. If "png", the figures are
+        written to "cascade.png" and "navchart.png" alongside "index.html".
+        If "svg-inline", the figures are rendered as SVG and embedded in
+        "index.html", producing a single self-contained file without
+        rasterizing the figures.
+
+    table: {"full", "compact"}, default: "full"
+        How the table is included in the report. If "full", the table
+        contains a row for every set of platforms used by each application.
+        If "compact", the table contains only the `max_sets` sets of
+        platforms using the most lines of code for each application, and
+        aggregates the remaining sets into a single row. The rows are
+        embedded as JSON, and are paginated and sortable in the browser.
+
+        A compact table keeps the size of the report bounded when the
+        number of distinct sets of platforms is large.
+
+    max_sets: int, default: 100
+        The number of sets of platforms shown for each application in a
+        compact table.
 
     Raises
     ------
@@ -94,6 +440,12 @@ def snapshot(df, cov=None, directory=None):
         If any of the required columns are missing.
         If any coverage string fails to validate against the P3 coverage
         schema.
+        If `foms` is not "lower" or "higher".
+        If `n_jobs` is not a positive integer.
+        If `update` is True and no `directory` is provided.
+        If `format` is not "png" or "svg-inline".
+        If `table` is not "full" or "compact".
+        If `max_sets` is not a positive integer.
 
     TypeError
         If any of the values in the "fom" column of `df` are non-numeric.
@@ -104,7 +456,8 @@ def snapshot(df, cov=None, directory=None):
         by the snapshot cannot be written.
 
     FileExistsError
-        If the directory specified by `directory` already exists.
+        If the directory specified by `directory` already exists and
+        `update` is False.
     """
     _require_columns(
         df,
@@ -116,6 +469,24 @@ def snapshot(df, cov=None, directory=None):
         _require_columns(df, ["coverage_key"])
         _require_columns(cov, ["coverage_key", "coverage"])
 
+    if foms not in ["lower", "higher"]:
+        raise ValueError("FOM interpretation must be 'lower' or 'higher'")
+
+    if n_jobs is not None and (not isinstance(n_jobs, int) or n_jobs < 1):
+        raise ValueError("'n_jobs' must be a positive integer.")
+
+    if update and not directory:
+        raise ValueError("'update' requires a 'directory'.")
+
+    if format not in ["png", "svg-inline"]:
+        raise ValueError("'format' must be 'png' or 'svg-inline'.")
+
+    if table not in ["full", "compact"]:
+        raise ValueError("'table' must be 'full' or 'compact'.")
+
+    if not isinstance(max_sets, int) or max_sets < 1:
+        raise ValueError("'max_sets' must be a positive integer.")
+
     if len(df["problem"].unique()) > 1:
         raise NotImplementedError(
             "Handling multiple problems is currently not implemented.",
@@ -126,8 +497,8 @@ def snapshot(df, cov=None, directory=None):
         directory = _tmpdir("snapshot")
     else:
         directory = os.path.join(cwd, directory)
-    _block_symlinks(directory)
-    os.makedirs(directory, exist_ok=False)
+        _block_symlinks(directory)
+        os.makedirs(directory, exist_ok=update)
 
     # Always open files relative to the snapshot directory,
     # without following symbolic links
@@ -137,11 +508,37 @@ def snapshot(df, cov=None, directory=None):
         safe_flags = flags | os.O_TRUNC | os.O_NOFOLLOW
         return os.open(path, safe_flags, 0o666, dir_fd=dir_fd)
 
+    def _read_opener(path, flags):
+        return os.open(path, flags | os.O_NOFOLLOW, dir_fd=dir_fd)
+
+    def _atomic_write(path, mode, write):
+        """
+        Write a file via a temporary file, which replaces the file at path
+        only once complete.
+        """
+        tmp = f".{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp, mode, opener=_safe_opener) as fp:
+                write(fp)
+            os.replace(tmp, path, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp, dir_fd=dir_fd)
+            raise
+
+    manifest = {}
+    if update and _exists("manifest.json", dir_fd):
+        with open("manifest.json", opener=_read_opener) as fp:
+            manifest = json.load(fp)
+
+    def _write_manifest():
+        _atomic_write("manifest.json", "x", lambda fp: json.dump(manifest, fp))
+
     # Identify a consistent application order to use across all plots
     app_order = df["application"].unique()
 
     # Calculate the efficiencies using all available data
-    effs = p3analysis.metrics.application_efficiency(df)
+    effs = p3analysis.metrics.application_efficiency(df, foms)
 
     # Limit the plots to the latest results
     snap = effs.drop_duplicates(
@@ -151,129 +548,114 @@ def snapshot(df, cov=None, directory=None):
     ).dropna()
     snap = _sort_by_app_order(snap, app_order)
 
-    plt.figure(figsize=(6, 5))
-    p3analysis.plot.cascade(snap)
-    with open("cascade.png", "xb", opener=_safe_opener) as fp:
-        plt.savefig(fp, bbox_inches="tight")
-
-    plt.clf()
-
     pp = p3analysis.metrics.pp(snap)
     pp = _sort_by_app_order(pp, app_order)
 
-    div = p3analysis.metrics.divergence(df, cov)
-    div = _sort_by_app_order(div, app_order)
-
-    plt.figure(figsize=(5, 5))
-    p3analysis.plot.navchart(pp, div)
-    plt.tight_layout()
-    with open("navchart.png", "xb", opener=_safe_opener) as fp:
-        plt.savefig(fp, bbox_inches="tight")
-
-    p3df = df.join(cov.set_index("coverage_key"), on="coverage_key")
-    p3df["coverage"] = p3df["coverage"].apply(_coverage_string_to_json)
-    p3df = p3df.drop_duplicates(
+    # Identify the coverage data used by a set of rows
+    def _coverage_inputs(rows):
+        columns = ["problem", "platform", "application"]
+        if cov is None:
+            return [rows[columns + ["coverage"]]]
+        used = cov[cov["coverage_key"].isin(rows["coverage_key"])]
+        return [
+            rows[columns + ["coverage_key"]],
+            used[["coverage_key", "coverage"]],
+        ]
+
+    latest = df.drop_duplicates(
         ["platform", "application"],
         keep="last",
         ignore_index=True,
     ).dropna()
-
-    # This function is defined inline so that it can access the platform name.
-    def coverage_to_setmap(maps):
-        """
-        Fold a list of coverage maps into a setmap.
-        """
-        linemap = collections.defaultdict(set)
-        for index, coverage in maps.items():
-            platform = p3df.loc[index]["platform"]
-            for entry in coverage:
-                fn = entry["file"]
-                for region in entry["regions"]:
-                    linemap[(fn, tuple(region))].add(platform)
-
-        setmap = collections.defaultdict(int)
-        for key, platforms in linemap.items():
-            fn, triple = key
-            start, end, num_lines = triple
-            setmap[frozenset(platforms)] += num_lines
-
-        return setmap
-
-    groups = p3df[["problem", "application", "coverage"]].groupby(
-        ["problem", "application"],
-    )
-    setmaps = groups.agg(coverage_to_setmap)
-    setmaps.reset_index(inplace=True)
-    setmaps.rename(columns={"coverage": "setmap"}, inplace=True)
-
-    # Generate an HTML report
-    # this is a minified CSS to be embedded in the HTML report
-    css = """
-td,th{padding-left:10px;padding-right:10px}body{margin:24px}html{font-family:'Gill Sans','Gill Sans MT',Calibri,'Trebuchet MS',sans-serif}@media only screen and (min-width:768px){html{width:auto}}.cascade-navchart{display:inline-flex;align-content:end;margin:auto;gap:15px;min-width:100%}.cascade-navchart>figure>img{max-width:40vw;max-height:40vw}figcaption::before{content:"Figure:"}figcaption{font-style:italic}table{border-collapse:collapse;max-width:60%}th{font-size:1.1rem}tr:nth-of-type(2n){background-color:rgba(0,0,0,.15)}tr:first-of-type{border-top:2px solid #000}tr:last-of-type{border-bottom:2px solid #000}    # noqa: E501
-    """
-    html = []
-    html += ["<html>"]
-    html += ['<meta charset="UTF-8">']
-    html += [
-        '<meta name="viewport" content="width=device-width, initial-scale=1.0">',  # noqa: E501
-    ]
-    html += ['<meta http-equiv="X-UA-Compatible" content="ie=edge">']
-    html += [
-        "<title>Performance, Portability & Productivity (P3) Snapshot</title>",
-    ]
-    html += [f"<style>{css}</style>"]
-
-    # now start working on the material
-    html += ["<body>"]
-    html += ["<header>"]
-    html += ["<h1>Performance, Portability & Productivity (P3) Snapshot</h1>"]
-    html += ["</header>"]
-
-    # section containing the plots
-    html += [
-        """<section>
-        <h2>Performance Portability, Code Convergence</h2>
-        <div class="cascade-navchart">
-            <figure>
-                <img src="cascade.png" alt="cascade-plot" />
-                <figcaption>
-                    <p>Performance Portability</p>
-                </figcaption>
-            </figure>
-            <figure>
-                <img src="navchart.png" alt="navchart" />
-                <figcaption>
-                    <p>Performance Portability vs Code Convergence</p>
-                </figcaption>
-            </figure>
-        </div>
-    </section>""",
-    ]
-
-    html += ["<section>"]
-    html += ["<h2>Code Divergence</h2>"]
-    html += ["<table>"]
-    # table header
-    html += [
-        """<tr>
-                <th>Application</th>
-                <th>Platform Set</th>
-                <th>LOC</th>
-            </tr>""",
-    ]
-    for index, row in setmaps.iterrows():
-        application = row["application"]
-        for platforms, lines in row["setmap"].items():
-            pstring = "{" + ", ".join(platforms) + "}"
-            html += ["<tr>"]
-            html += [
-                f"<td>{application}</td><td>{pstring}</td><td>{lines}</td>",
-            ]
-            html += ["</tr>"]
-    html += ["</table>"]
-    html += ["</body>"]
-    html += ["</html>"]
-    with open("index.html", "x", opener=_safe_opener) as fp:
-        fp.write("\n".join(html))
+    digests = {
+        "cascade.png": _digest(snap),
+        "navchart.png": _digest(pp, *_coverage_inputs(df)),
+        "index.html": _digest(*_coverage_inputs(latest)),
+    }
+    if table == "compact":
+        # The table also depends on the number of sets shown
+        digest = hashlib.sha256(f"{table}:{max_sets}".encode())
+        digest.update(digests["index.html"].encode())
+        digests["index.html"] = digest.hexdigest()
+    if format == "svg-inline":
+        # The figures are embedded, so the report depends on every input
+        digest = hashlib.sha256(format.encode())
+        for name in sorted(digests):
+            digest.update(digests[name].encode())
+        digests = {"index.html": digest.hexdigest()}
+
+    # Files from a report in a different format are removed
+    for name in set(manifest) - set(digests):
+        if name in ["cascade.png", "navchart.png"]:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(name, dir_fd=dir_fd)
+        del manifest[name]
+
+    outdated = {
+        name
+        for name, digest in digests.items()
+        if manifest.get(name) != digest or not _exists(name, dir_fd)
+    }
+
+    # Outdated files are removed from the manifest before being replaced,
+    # so that an interrupted update is repeated
+    for name in outdated:
+        manifest.pop(name, None)
+    _write_manifest()
+
+    def _record(name):
+        manifest[name] = digests[name]
+        _write_manifest()
+
+    # Embedded figures are regenerated together with the report
+    render = outdated
+    if format == "svg-inline" and outdated:
+        render = {"cascade.png", "navchart.png", "index.html"}
+    figures = {}
+
+    def _savefig(name):
+        if format == "svg-inline":
+            with _stage("savefig"):
+                buffer = io.StringIO()
+                plt.savefig(buffer, format="svg", bbox_inches="tight")
+            svg = buffer.getvalue()
+            figures[name.removesuffix(".png")] = svg[svg.index("<svg") :]
+            return
+        with _stage("savefig"):
+            _atomic_write(
+                name,
+                "xb",
+                lambda fp: plt.savefig(fp, bbox_inches="tight"),
+            )
+        _record(name)
+
+    if "cascade.png" in render:
+        plt.figure(figsize=(6, 5))
+        p3analysis.plot.cascade(snap)
+        _savefig("cascade.png")
+        plt.clf()
+
+    # Coverage is parsed once, and shared by all of the following steps
+    if render & {"navchart.png", "index.html"}:
+        p3df = _join_coverage(df, cov, n_jobs)
+
+    if "navchart.png" in render:
+        div = p3analysis.metrics.divergence(p3df, n_jobs=n_jobs)
+        div = _sort_by_app_order(div, app_order)
+
+        plt.figure(figsize=(5, 5))
+        p3analysis.plot.navchart(pp, div)
+        plt.tight_layout()
+        _savefig("navchart.png")
+
+    if "index.html" in render:
+        html = _html(
+            _setmaps(p3df),
+            **figures,
+            table=table,
+            max_sets=max_sets,
+        )
+        _atomic_write("index.html", "x", lambda fp: fp.write(html))
+        _record("index.html")
 
     os.close(dir_fd)
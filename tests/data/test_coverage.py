@@ -0,0 +1,209 @@
+# Copyright (C) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import tempfile
+import unittest
+
+import numpy
+import pandas as pd
+
+from p3analysis.data import (
+    deduplicate_coverage,
+    parse_coverage,
+    read_coverage,
+)
+from p3analysis.data._coverage import _parse_coverage
+from p3analysis.metrics import divergence
+
+
+class TestCoverage(unittest.TestCase):
+    """
+    Test p3analysis.data.read_coverage functionality.
+    """
+
+    def setUp(self):
+        self.coverage = [
+            [
+                {
+                    "file": "foo.cpp",
+                    "id": "0",
+                    "used_lines": [0, 1, 2, 3],
+                    "unused_lines": [4, 5],
+                },
+                {
+                    "file": "bar.cpp",
+                    "id": "1",
+                    "used_lines": [0, 1],
+                    "unused_lines": [],
+                },
+            ],
+            [
+                {
+                    "file": "foo.cpp",
+                    "id": "0",
+                    "used_lines": [2, 3, 4, 5],
+                    "unused_lines": [0, 1],
+                },
+            ],
+        ]
+        self.cov = pd.DataFrame(
+            {
+                "coverage_key": ["source1", "source2"],
+                "coverage": [json.dumps(c) for c in self.coverage],
+            },
+        )
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "coverage.csv")
+        self.cov.to_csv(self.path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parse_coverage(self):
+        """Check that _parse_coverage() decodes each entry."""
+        string = ' [ {"file": "a", "id": "0", "used_lines": [1, 2],'
+        string += ' "unused_lines": [3]} ] '
+        result = _parse_coverage(string, unused_lines=True)
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0]["used_lines"].dtype, numpy.int32)
+        self.assertEqual(result[0]["used_lines"].tolist(), [1, 2])
+        self.assertEqual(result[0]["unused_lines"].tolist(), [3])
+
+        self.assertEqual(_parse_coverage("[]"), [])
+
+        for invalid in ["{}", "[1]", '[{"file": "a"}]', "[[] []]", "[] []"]:
+            with self.assertRaises(ValueError):
+                _parse_coverage(invalid)
+
+        with self.assertRaises(TypeError):
+            _parse_coverage(3)
+
+    def test_parse_coverage_batch(self):
+        """Check that parse_coverage() preserves the order of results."""
+        strings = [json.dumps(c) for c in self.coverage] * 3
+        values = strings + [read_coverage(self.path)["coverage"][0]]
+
+        timings = {}
+        expected = parse_coverage(values, timings=timings)
+        self.assertEqual(len(expected), len(values))
+        for stage in ["decode", "validate", "convert", "elapsed"]:
+            self.assertGreaterEqual(timings[stage], 0)
+
+        for coverage, expected_coverage in zip(expected, self.coverage * 4):
+            self.assertEqual(
+                [entry["used_lines"].tolist() for entry in coverage],
+                [entry["used_lines"] for entry in expected_coverage],
+            )
+
+        result = parse_coverage(values, n_jobs=2, chunksize=2)
+        for coverage, expected_coverage in zip(result, expected):
+            self.assertEqual(
+                [entry["used_lines"].tolist() for entry in coverage],
+                [entry["used_lines"].tolist() for entry in expected_coverage],
+            )
+
+        with self.assertRaises(ValueError):
+            parse_coverage(["[1]"] * 4, n_jobs=2, chunksize=1)
+
+        with self.assertRaises(TypeError):
+            parse_coverage([3])
+
+        with self.assertRaises(ValueError):
+            parse_coverage(strings, n_jobs=0)
+
+    def test_read_coverage(self):
+        """Check that read_coverage() stores lines as NumPy arrays."""
+        result = read_coverage(self.path, chunksize=1)
+        self.assertEqual(list(result["coverage_key"]), ["source1", "source2"])
+
+        for coverage, expected in zip(result["coverage"], self.coverage):
+            self.assertEqual(len(coverage), len(expected))
+            for entry, expected_entry in zip(coverage, expected):
+                self.assertEqual(entry["file"], expected_entry["file"])
+                self.assertEqual(
+                    entry["used_lines"].tolist(),
+                    expected_entry["used_lines"],
+                )
+                self.assertEqual(len(entry["unused_lines"]), 0)
+
+        result = read_coverage(self.path, unused_lines=True)
+        self.assertEqual(
+            result["coverage"][0][0]["unused_lines"].tolist(),
+            [4, 5],
+        )
+
+    def test_divergence(self):
+        """Check that divergence() accepts coverage from read_coverage()."""
+        df = pd.DataFrame(
+            {
+                "problem": ["test"] * 2,
+                "platform": ["A", "B"],
+                "application": ["latest"] * 2,
+                "coverage_key": ["source1", "source2"],
+            },
+        )
+        expected = divergence(df, self.cov)
+        result = divergence(df, read_coverage(self.path))
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_deduplicate_coverage(self):
+        """Check that deduplicate_coverage() stores distinct traces once."""
+        # The same trace, with entries and lines in a different order.
+        reordered = [
+            {
+                "file": "bar.cpp",
+                "id": "1",
+                "used_lines": [1, 0],
+                "unused_lines": [],
+            },
+            {
+                "file": "foo.cpp",
+                "id": "0",
+                "used_lines": [[0, 3]],
+                "unused_lines": [5, 4],
+            },
+        ]
+        coverage = [
+            json.dumps(self.coverage[0]),
+            json.dumps(reordered),
+            json.dumps(self.coverage[1]),
+            json.dumps(self.coverage[0]),
+        ]
+        df = pd.DataFrame(
+            {
+                "problem": ["test"] * 4,
+                "platform": ["A", "B", "C", "D"],
+                "application": ["latest"] * 4,
+                "coverage": coverage,
+            },
+        )
+
+        result, cov = deduplicate_coverage(df)
+        self.assertNotIn("coverage", result)
+        self.assertEqual(len(cov), 2)
+        keys = result["coverage_key"].tolist()
+        self.assertEqual(keys[0], keys[1])
+        self.assertEqual(keys[0], keys[3])
+        self.assertNotEqual(keys[0], keys[2])
+        self.assertEqual(set(keys), set(cov["coverage_key"]))
+        pd.testing.assert_frame_equal(divergence(result, cov), divergence(df))
+
+        # Keys from an existing coverage DataFrame are replaced by hashes.
+        cov_before = pd.DataFrame(
+            {"coverage_key": [0, 1, 2], "coverage": coverage[:3]},
+        )
+        df_before = df.drop(columns=["coverage"])
+        df_before["coverage_key"] = [0, 1, 2, 0]
+        result2, cov2 = deduplicate_coverage(df_before, cov_before)
+        self.assertEqual(result2["coverage_key"].tolist(), keys)
+        pd.testing.assert_frame_equal(cov2, cov)
+
+        df_before["coverage_key"] = [0, 1, 2, 3]
+        with self.assertRaises(ValueError):
+            deduplicate_coverage(df_before, cov_before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+# Copyright (C) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import unittest
+
+import numpy
+
+from p3analysis.data._intervals import _to_array, _to_intervals, _to_lines
+
+
+class TestIntervals(unittest.TestCase):
+    """
+    Test p3analysis.data.intervals functionality.
+    """
+
+    def test_to_array(self):
+        """p3analysis.data.intervals.to_array"""
+        result = _to_array([1, 2, 3])
+        self.assertEqual(result.ndim, 1)
+
+        result = _to_array([1, [3, 5]], numpy.int32)
+        self.assertEqual(result.dtype, numpy.int32)
+        self.assertEqual(result.tolist(), [[1, 1], [3, 5]])
+
+        # Integral floats are valid line numbers
+        result = _to_array([1.0, 2, 3])
+        self.assertEqual(result.dtype, numpy.int64)
+        self.assertEqual(result.tolist(), [1, 2, 3])
+
+        result = _to_array([1.0, [3, 5.0]])
+        self.assertEqual(result.tolist(), [[1, 1], [3, 5]])
+
+        with self.assertRaises(ValueError):
+            _to_array([1, [3, 5, 7]])
+
+    def test_to_intervals(self):
+        """p3analysis.data.intervals.to_intervals"""
+        starts, ends = _to_intervals([8, 10, 11, 12, 14, 15, 16, 17, 19])
+        self.assertEqual(starts.tolist(), [8, 10, 14, 19])
+        self.assertEqual(ends.tolist(), [9, 13, 18, 20])
+
+        # Intervals may be unsorted, overlapping or duplicated.
+        starts, ends = _to_intervals([[10, 12], 9, [11, 15], 20, 20])
+        self.assertEqual(starts.tolist(), [9, 20])
+        self.assertEqual(ends.tolist(), [16, 21])
+
+        starts, ends = _to_intervals([])
+        self.assertEqual(len(starts), 0)
+
+        with self.assertRaises(ValueError):
+            _to_intervals([[5, 4]])
+
+    def test_to_lines(self):
+        """p3analysis.data.intervals.to_lines"""
+        result = _to_lines([1, 3, 2])
+        self.assertEqual(result.tolist(), [1, 3, 2])
+
+        result = _to_lines([[1, 3], 7, [6, 6]])
+        self.assertEqual(result.tolist(), [1, 2, 3, 6, 7])
+
+
+if __name__ == "__main__":
+    unittest.main()
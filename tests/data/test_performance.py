@@ -0,0 +1,103 @@
+# Copyright (C) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import importlib.util
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from p3analysis.data import read_performance, write_performance
+
+
+@unittest.skipUnless(importlib.util.find_spec("pyarrow"), "requires pyarrow")
+class TestPerformance(unittest.TestCase):
+    """
+    Test p3analysis.data.read_performance and write_performance functionality.
+    """
+
+    def setUp(self):
+        data = {
+            "problem": ["x", "x", "y", "y"],
+            "application": ["A", "B", "A", "B"],
+            "platform": ["X", "X", "Y", "Y"],
+            "fom": [1.0, 2.0, None, 4.0],
+            "coverage_key": ["k1", "k2", "k1", "k2"],
+            "date": pd.to_datetime(["2023-01-01"] * 4),
+        }
+        self.df = pd.DataFrame(data)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """Check that data is unchanged by writing and reading."""
+        for extension in [".parquet", ".arrow"]:
+            path = os.path.join(self.tmp.name, "performance" + extension)
+            write_performance(self.df, path)
+            result = read_performance(path)
+            pd.testing.assert_frame_equal(
+                result,
+                self.df,
+                check_dtype=False,
+            )
+            self.assertEqual(result["fom"].dtype, "float64")
+
+    def test_round_trip_labels(self):
+        """Check that missing and non-string labels are preserved."""
+        self.df.loc[1, "application"] = None
+        self.df["platform"] = [1.0, 1.0, None, 2.0]
+        for extension in [".parquet", ".arrow"]:
+            path = os.path.join(self.tmp.name, "performance" + extension)
+            write_performance(self.df, path)
+            result = read_performance(path)
+            pd.testing.assert_frame_equal(
+                result,
+                self.df,
+                check_dtype=False,
+            )
+            self.assertTrue(pd.isna(result.loc[1, "application"]))
+            self.assertNotIn("nan", result["application"].tolist())
+            self.assertEqual(result["platform"].dtype, "float64")
+
+    def test_filters(self):
+        """Check that read_performance() selects columns and rows."""
+        for extension in [".parquet", ".arrow"]:
+            path = os.path.join(self.tmp.name, "performance" + extension)
+            write_performance(self.df, path)
+
+            result = read_performance(path, ["problem", "fom"], problem=["y"])
+            expected = self.df.loc[self.df["problem"] == "y"]
+            expected = expected[["problem", "fom"]].reset_index(drop=True)
+            pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+            result = read_performance(
+                path,
+                application=["B"],
+                platform=["Y"],
+            )
+            self.assertEqual(len(result), 1)
+            self.assertEqual(result["fom"].iloc[0], 4.0)
+
+    def test_invalid(self):
+        """Check that invalid arguments are reported as errors."""
+        path = os.path.join(self.tmp.name, "performance.csv")
+        with self.assertRaises(ValueError):
+            write_performance(self.df, path)
+        with self.assertRaises(ValueError):
+            write_performance(self.df, path, format="csv")
+        with self.assertRaises(ValueError):
+            write_performance(pd.DataFrame(), path, format="parquet")
+
+        path = os.path.join(self.tmp.name, "performance.parquet")
+        write_performance(self.df, path)
+        with self.assertRaises(TypeError):
+            read_performance(path, "fom")
+        with self.assertRaises(TypeError):
+            read_performance(path, problem="x")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,7 @@ import unittest
 
 import pandas as pd
 
-from p3analysis.data import projection
+from p3analysis.data import projection, projection_iter
 from p3analysis.data._projection import _collapse
 
 
@@ -110,6 +110,47 @@ class TestProjection(unittest.TestCase):
         expected_df = pd.DataFrame(data)
         pd.testing.assert_frame_equal(result, expected_df)
 
+    def test_projection_iter(self):
+        """p3analysis.data.projection_iter"""
+        data = {
+            "c1": ["x", "y", "z"],
+            "c2": ["1", "2", "3"],
+            "c3": ["A", "B", "C"],
+            "c4": ["X", "Y", "Z"],
+        }
+        df = pd.DataFrame(data)
+        chunks = [df.iloc[0:2], df.iloc[2:3]]
+        chunks_before = [chunk.copy(deep=True) for chunk in chunks]
+
+        prob = ["c1", "c2"]
+        appl = ["c3"]
+        plat = ["c4"]
+        result = projection_iter(
+            chunks,
+            problem=prob,
+            application=appl,
+            platform=plat,
+        )
+        result = pd.concat(list(result))
+
+        expected_df = projection(
+            df,
+            problem=prob,
+            application=appl,
+            platform=plat,
+        )
+        pd.testing.assert_frame_equal(result, expected_df)
+
+        # Check that the chunks have no side effects
+        for before, after in zip(chunks_before, chunks):
+            pd.testing.assert_frame_equal(before, after)
+
+        with self.assertRaises(TypeError):
+            projection_iter(chunks, platform="c4")
+
+        with self.assertRaises(ValueError):
+            list(projection_iter(chunks, platform=["c5"]))
+
 
 if __name__ == "__main__":
     unittest.main()
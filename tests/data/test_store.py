@@ -0,0 +1,151 @@
+# Copyright (C) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy
+import pandas as pd
+
+from p3analysis.data import read_coverage_store, write_coverage_store
+from p3analysis.data._intervals import _to_lines
+from p3analysis.data._trace import _CoverageTrace
+from p3analysis.metrics import divergence
+
+
+class TestCoverageStore(unittest.TestCase):
+    """
+    Test p3analysis.data coverage store functionality.
+    """
+
+    def setUp(self):
+        self.coverage = [
+            [
+                {
+                    "file": "foo.cpp",
+                    "id": "0",
+                    "used_lines": [0, 1, 2, 3],
+                    "unused_lines": [4, 5],
+                },
+                {
+                    "file": "bar.cpp",
+                    "id": "1",
+                    "used_lines": [0, 1],
+                    "unused_lines": [],
+                },
+            ],
+            [],
+            [
+                {
+                    "file": "foo.cpp",
+                    "id": "0",
+                    "used_lines": [2, 3, 4, 5],
+                    "unused_lines": [0, 1],
+                },
+            ],
+        ]
+        self.cov = pd.DataFrame(
+            {
+                "coverage_key": ["source1", "source2", "source3"],
+                "coverage": [json.dumps(c) for c in self.coverage],
+            },
+        )
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "store")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """Check that coverage is unchanged by a coverage store."""
+        write_coverage_store(self.cov, self.path)
+
+        for mmap in [True, False]:
+            result = read_coverage_store(self.path, mmap=mmap)
+            self.assertEqual(
+                list(result["coverage_key"]),
+                ["source1", "source2", "source3"],
+            )
+            for coverage, expected in zip(result["coverage"], self.coverage):
+                self.assertEqual(len(coverage), len(expected))
+                for entry, expected_entry in zip(coverage, expected):
+                    self.assertIsInstance(entry["used_lines"], numpy.ndarray)
+                    for key in ["used_lines", "unused_lines"]:
+                        entry[key] = _to_lines(entry[key]).tolist()
+                    self.assertEqual(entry, expected_entry)
+
+    def test_exists(self):
+        """Check that write_coverage_store() does not overwrite data."""
+        os.makedirs(self.path)
+        with self.assertRaises(FileExistsError):
+            write_coverage_store(self.cov, self.path)
+
+    def test_invalid(self):
+        """Check that write_coverage_store() validates coverage."""
+        with self.assertRaises(ValueError):
+            write_coverage_store(pd.DataFrame(), self.path)
+
+        cov = pd.DataFrame({"coverage_key": [0], "coverage": ["[{}]"]})
+        with self.assertRaises(ValueError):
+            write_coverage_store(cov, self.path)
+
+    def test_divergence(self):
+        """Check that divergence() accepts coverage from a store."""
+        df = pd.DataFrame(
+            {
+                "problem": ["test"] * 3,
+                "platform": ["A", "B", "C"],
+                "application": ["latest"] * 3,
+                "coverage_key": ["source1", "source2", "source3"],
+            },
+        )
+        write_coverage_store(self.cov, self.path)
+        stored = read_coverage_store(self.path)
+        expected = divergence(df, self.cov)
+        for kwargs in [{}, {"engine": "sparse"}, {"approximate": True}]:
+            with self.subTest(**kwargs):
+                result = divergence(df, stored, **kwargs)
+                pd.testing.assert_frame_equal(
+                    result,
+                    divergence(df, self.cov, **kwargs),
+                )
+
+        # Intervals are read from the stored arrays, without building entries
+        with mock.patch.object(
+            _CoverageTrace,
+            "__getitem__",
+            side_effect=AssertionError,
+        ):
+            result = divergence(df, stored)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_intervals(self):
+        """Check that runs of lines are stored as intervals."""
+        coverage = [
+            {
+                "file": "foo.cpp",
+                "id": "0",
+                "used_lines": [[i, i + 499] for i in range(0, 10**7, 1000)],
+                "unused_lines": [],
+            },
+        ]
+        cov = pd.DataFrame(
+            {"coverage_key": ["source1"], "coverage": [json.dumps(coverage)]},
+        )
+        write_coverage_store(cov, self.path)
+        size = sum(
+            os.path.getsize(os.path.join(self.path, name))
+            for name in os.listdir(self.path)
+            if name.endswith(".npy")
+        )
+        self.assertLess(size, len(cov["coverage"][0]))
+
+        result = read_coverage_store(self.path)["coverage"][0]
+        self.assertEqual(result.tolist(), coverage)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# Copyright (C) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from p3analysis.data import parse_coverage, read_coverage, synthetic
+from p3analysis.metrics import divergence
+
+
+class TestSynthetic(unittest.TestCase):
+    """
+    Test p3analysis.data.synthetic functionality.
+    """
+
+    def test_shape(self):
+        """Check that synthetic() generates the requested data."""
+        df, cov = synthetic(2, 3, 4, n_lines=100, seed=0)
+        self.assertEqual(len(df), 2 * 3 * 4)
+        self.assertEqual(len(cov), 3 * 4)
+        self.assertEqual(df["problem"].nunique(), 2)
+        self.assertEqual(df["platform"].nunique(), 3)
+        self.assertEqual(df["application"].nunique(), 4)
+        self.assertFalse(df["fom"].isna().any())
+        self.assertTrue(df["coverage_key"].isin(cov["coverage_key"]).all())
+
+        # Every coverage trace must be schema-valid
+        coverage = parse_coverage(cov["coverage"])
+        self.assertEqual(len(coverage), len(cov))
+
+        df, cov = synthetic(support_density=0, seed=0)
+        self.assertTrue(df["fom"].isna().all())
+
+    def test_seed(self):
+        """Check that synthetic() is reproducible."""
+        df1, cov1 = synthetic(seed=42, support_density=0.5)
+        df2, cov2 = synthetic(seed=42, support_density=0.5)
+        pd.testing.assert_frame_equal(df1, df2)
+        pd.testing.assert_frame_equal(cov1, cov2)
+
+    def test_sharing(self):
+        """Check that sharing controls code divergence."""
+        results = []
+        for sharing in [0, 0.5, 1]:
+            df, cov = synthetic(n_lines=100, sharing=sharing, seed=0)
+            results.append(divergence(df, cov)["divergence"].iloc[0])
+        self.assertEqual(results[0], 1)
+        self.assertTrue(0 < results[1] < 1)
+        self.assertEqual(results[2], 0)
+
+    def test_directory(self):
+        """Check that synthetic() can write data to a directory."""
+        df, cov = synthetic(3, 2, 5, n_lines=50, seed=7)
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = os.path.join(tmp, "synthetic")
+            result = synthetic(
+                3,
+                2,
+                5,
+                n_lines=50,
+                seed=7,
+                directory=directory,
+            )
+            self.assertIsNone(result)
+
+            df_read = pd.read_csv(os.path.join(directory, "performance.csv"))
+            pd.testing.assert_frame_equal(df_read, df)
+
+            path = os.path.join(directory, "coverage.csv")
+            cov_read = pd.read_csv(path)
+            pd.testing.assert_frame_equal(cov_read, cov)
+            pd.testing.assert_frame_equal(
+                divergence(df, read_coverage(path)),
+                divergence(df, cov),
+            )
+
+            with self.assertRaises(FileExistsError):
+                synthetic(directory=directory)
+
+    def test_invalid(self):
+        """Check that synthetic() validates its arguments."""
+        for kwargs in [
+            {"n_problems": 0},
+            {"n_platforms": 1.5},
+            {"n_lines": -1},
+            {"support_density": 2},
+            {"sharing": -0.1},
+        ]:
+            with self.assertRaises(ValueError):
+                synthetic(**kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,8 @@
 
 import unittest
 
+import numpy
+
 from p3analysis.data._validation import _validate_coverage_json
 
 
@@ -41,5 +43,20 @@ class TestValidation(unittest.TestCase):
         with self.assertRaises(ValueError):
             _validate_coverage_json({})
 
+    def test_coverage_json_numpy(self):
+        """Check that lines may be stored as NumPy arrays of integers."""
+        lines = numpy.array([1, 2, 3, 5], dtype=numpy.int32)
+        json_object = [{"file": "path", "id": "sha", "used_lines": lines, "unused_lines": lines[:0]}]
+        result_object = _validate_coverage_json(json_object)
+        self.assertIs(result_object, json_object)
+
+        json_object[0]["used_lines"] = lines.astype(float)
+        with self.assertRaises(ValueError):
+            _validate_coverage_json(json_object)
+
+        json_object[0]["used_lines"] = lines.reshape(1, 4)
+        with self.assertRaises(ValueError):
+            _validate_coverage_json(json_object)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,21 @@
+# Copyright (C) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+
+import json
+
+
+def _coverage(lines, file="foo.cpp", id="0"):
+    """
+    Return a coverage string for a single region of a single file.
+    """
+    return json.dumps(
+        [
+            {
+                "file": file,
+                "id": id,
+                "used_lines": lines,
+                "unused_lines": [],
+            },
+        ],
+    )
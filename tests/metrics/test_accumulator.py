@@ -0,0 +1,94 @@
+# Copyright (C) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import unittest
+
+import pandas as pd
+
+from p3analysis.metrics import DivergenceAccumulator, divergence
+
+from ._utils import _coverage
+
+
+class TestDivergenceAccumulator(unittest.TestCase):
+    """
+    Test p3analysis.metrics.DivergenceAccumulator functionality.
+    """
+
+    def setUp(self):
+        self.coverage = {
+            "A": _coverage([0, 1, 2, 3, 4, 5, 6, 7, 8, 9]),
+            "B": _coverage([0, 1, 2, 3, 4, 10, 11]),
+            "C": _coverage([5, 6, 7, 8, 9, 10, 11, 12]),
+            "D": _coverage([0, 1, 2], file="bar.cpp"),
+        }
+
+    def _expected(self, platforms):
+        df = pd.DataFrame(
+            {
+                "problem": ["test"] * len(platforms),
+                "platform": platforms,
+                "application": ["latest"] * len(platforms),
+                "coverage": [self.coverage[p] for p in platforms],
+            },
+        )
+        return divergence(df)["divergence"].iloc[0]
+
+    def test_empty(self):
+        """Check that an empty accumulator has zero divergence."""
+        acc = DivergenceAccumulator()
+        self.assertEqual(len(acc), 0)
+        self.assertEqual(acc.divergence(), 0)
+
+        acc.add("A", self.coverage["A"])
+        self.assertEqual(acc.divergence(), 0)
+
+    def test_add(self):
+        """Check that add() matches divergence() after each platform."""
+        acc = DivergenceAccumulator()
+        platforms = []
+        for platform, coverage in self.coverage.items():
+            acc.add(platform, coverage)
+            platforms.append(platform)
+            self.assertAlmostEqual(acc.divergence(), self._expected(platforms))
+        self.assertEqual(acc.platforms, platforms)
+
+    def test_replace(self):
+        """Check that adding a platform twice replaces its coverage."""
+        acc = DivergenceAccumulator()
+        acc.add("A", self.coverage["A"])
+        acc.add("B", self.coverage["A"])
+        self.assertEqual(acc.divergence(), 0)
+
+        acc.add("B", self.coverage["B"])
+        self.assertEqual(len(acc), 2)
+        self.assertAlmostEqual(acc.divergence(), self._expected(["A", "B"]))
+
+    def test_remove(self):
+        """Check that remove() matches divergence() for the remainder."""
+        acc = DivergenceAccumulator()
+        for platform, coverage in self.coverage.items():
+            acc.add(platform, coverage)
+
+        acc.remove("C")
+        self.assertNotIn("C", acc)
+        self.assertAlmostEqual(
+            acc.divergence(),
+            self._expected(["A", "B", "D"]),
+        )
+
+        with self.assertRaises(KeyError):
+            acc.remove("C")
+
+    def test_invalid(self):
+        """Check that add() validates coverage."""
+        acc = DivergenceAccumulator()
+        with self.assertRaises(ValueError):
+            acc.add("A", "[{}]")
+        with self.assertRaises(TypeError):
+            acc.add("A", 3)
+        self.assertEqual(len(acc), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
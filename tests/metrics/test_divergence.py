@@ -1,12 +1,14 @@
 # Copyright (C) 2022-2023 Intel Corporation
 # SPDX-License-Identifier: MIT
 
+import importlib.util
 import json
 import unittest
+from unittest import mock
 
 import pandas as pd
 
-from p3analysis.metrics import divergence
+from p3analysis.metrics import _minhash, divergence
 
 
 class TestDivergence(unittest.TestCase):
@@ -198,6 +200,261 @@ class TestDivergence(unittest.TestCase):
 
         pd.testing.assert_frame_equal(result, expected_result)
 
+    def test_divergence_intervals(self):
+        """Check that divergence() accepts intervals of lines."""
+        data = {
+            "problem": ["test"] * 2,
+            "platform": ["A", "B"],
+            "application": ["latest"] * 2,
+            "coverage_key": ["source1", "source2"],
+        }
+        df = pd.DataFrame(data)
+
+        lines = [
+            [0, 1, 2, 3, 4, 5, 6, 7, 8, 9],
+            [5, 6, 7, 8, 9, 10, 11, 12, 13, 14],
+        ]
+        intervals = [[[0, 4], [5, 9]], [5, 6, [7, 14]]]
+        floats = [[0.0, 1, [2.0, 9]], [5.0, 6, 7, 8, 9, 10, 11, 12, 13, 14]]
+
+        expected_result = pd.DataFrame(
+            {
+                "problem": ["test"],
+                "application": ["latest"],
+                "divergence": [2.0 / 3.0],
+            },
+        )
+        for used_lines in [lines, intervals, floats]:
+            cov = pd.DataFrame(
+                {
+                    "coverage_key": ["source1", "source2"],
+                    "coverage": [
+                        json.dumps(
+                            [
+                                {
+                                    "file": "foo.cpp",
+                                    "id": "0",
+                                    "used_lines": used,
+                                    "unused_lines": [],
+                                },
+                            ],
+                        )
+                        for used in used_lines
+                    ],
+                },
+            )
+            result = divergence(df, cov)
+            pd.testing.assert_frame_equal(result, expected_result)
+
+    def test_divergence_n_jobs(self):
+        """Check that divergence() results do not depend on n_jobs."""
+        platforms = ["A", "B", "C"]
+        applications = ["X", "Y", "Z"]
+        data = {
+            "problem": ["test"] * 9,
+            "platform": platforms * 3,
+            "application": [a for a in applications for _ in platforms],
+            "coverage": [
+                json.dumps(
+                    [
+                        {
+                            "file": "foo.cpp",
+                            "id": "0",
+                            "used_lines": [[i, i + 10 * (j + 1)]],
+                            "unused_lines": [],
+                        },
+                    ],
+                )
+                for j in range(3)
+                for i in range(3)
+            ],
+        }
+        df = pd.DataFrame(data)
+
+        expected_result = divergence(df)
+        for n_jobs in [1, 2]:
+            result = divergence(df, n_jobs=n_jobs)
+            pd.testing.assert_frame_equal(result, expected_result)
+
+        with self.assertRaises(ValueError):
+            divergence(df, n_jobs=0)
+
+    def test_divergence_engine(self):
+        """Check that divergence() engines produce the same results."""
+        platforms = ["A", "B", "C", "D"]
+        data = {
+            "problem": ["test"] * 4,
+            "platform": platforms,
+            "application": ["latest"] * 4,
+            "coverage": [
+                json.dumps(
+                    [
+                        {
+                            "file": "foo.cpp",
+                            "id": "0",
+                            "used_lines": [[i, 10 + 5 * i]],
+                            "unused_lines": [],
+                        },
+                        {
+                            "file": "bar.cpp",
+                            "id": str(i % 2),
+                            "used_lines": [0, 1, 2, [i, 2 * i]],
+                            "unused_lines": [],
+                        },
+                    ],
+                )
+                for i in range(3)
+            ]
+            + ["[]"],
+        }
+        df = pd.DataFrame(data)
+
+        expected_result = divergence(df, engine="setmap")
+        result = divergence(df, engine="sparse")
+        pd.testing.assert_frame_equal(result, expected_result)
+
+        with self.assertRaises(ValueError):
+            divergence(df, engine="invalid")
+
+    def test_divergence_approximate(self):
+        """Check that divergence() estimates divergence with MinHash."""
+        lines = [
+            [[0, 99]],
+            [[0, 99]],
+            [[50, 149]],
+            [[1000, 1099]],
+        ]
+        data = {
+            "problem": ["test"] * 6,
+            "platform": ["A", "B", "A", "C", "A", "D"],
+            "application": ["same", "same", "overlap", "overlap"]
+            + ["disjoint"] * 2,
+            "coverage": [
+                json.dumps(
+                    [
+                        {
+                            "file": "foo.cpp",
+                            "id": "0",
+                            "used_lines": lines[i],
+                            "unused_lines": [],
+                        },
+                    ],
+                )
+                for i in [0, 1, 0, 2, 0, 3]
+            ],
+        }
+        df = pd.DataFrame(data)
+
+        expected_result = divergence(df)
+        result = divergence(df, approximate=True, num_perm=256)
+        pd.testing.assert_frame_equal(
+            result,
+            expected_result,
+            check_exact=False,
+            atol=0.1,
+        )
+        pd.testing.assert_frame_equal(
+            result,
+            divergence(df, approximate=True, num_perm=256, n_jobs=2),
+        )
+
+        # Each run of lines used by the same platforms is hashed once
+        lines = [
+            [[0, 999999]],
+            [[0, 999999]],
+            [[500000, 1499999]],
+            [[2000000, 2999999]],
+        ]
+        df["coverage"] = [
+            json.dumps(
+                [
+                    {
+                        "file": "foo.cpp",
+                        "id": "0",
+                        "used_lines": lines[i],
+                        "unused_lines": [],
+                    },
+                ],
+            )
+            for i in [0, 1, 0, 2, 0, 3]
+        ]
+        hash = mock.Mock(wraps=_minhash._hash)
+        with mock.patch.object(_minhash, "_hash", hash):
+            result = divergence(df, approximate=True, num_perm=256)
+        self.assertEqual(
+            sum(len(call.args[2]) for call in hash.call_args_list),
+            2 + 4 + 2,
+        )
+        pd.testing.assert_frame_equal(
+            result,
+            divergence(df),
+            check_exact=False,
+            atol=0.1,
+        )
+
+        with self.assertRaises(ValueError):
+            divergence(df, approximate=True, num_perm=0)
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("polars"),
+        "requires polars",
+    )
+    def test_divergence_polars(self):
+        """Check that the polars engine matches the pandas engine."""
+        import polars as pl
+
+        coverage = [
+            [
+                {
+                    "file": "foo.cpp",
+                    "id": "0",
+                    "used_lines": [[i, 10 + 5 * i]],
+                    "unused_lines": [],
+                },
+            ]
+            for i in range(3)
+        ]
+        df = pd.DataFrame(
+            {
+                "problem": ["test"] * 5,
+                "platform": ["A", "B", "C", "A", "B"],
+                "application": ["latest"] * 3 + ["best"] * 2,
+                "coverage_key": ["0", "1", "2", "0", "0"],
+            },
+        )
+        cov = pd.DataFrame(
+            {
+                "coverage_key": ["0", "1", "2"],
+                "coverage": [json.dumps(c) for c in coverage],
+            },
+        )
+        expected_df = divergence(df, cov)
+
+        result = divergence(df, cov, engine="polars")
+        pd.testing.assert_frame_equal(result, expected_df)
+
+        result = divergence(pl.from_pandas(df), cov, engine="polars")
+        self.assertIsInstance(result, pl.DataFrame)
+        pd.testing.assert_frame_equal(result.to_pandas(), expected_df)
+
+        result = divergence(
+            pl.from_pandas(df).lazy(),
+            pl.from_pandas(cov).lazy(),
+            engine="polars",
+        )
+        self.assertIsInstance(result, pl.LazyFrame)
+        pd.testing.assert_frame_equal(
+            result.collect().to_pandas(),
+            expected_df,
+        )
+
+        p3df = df.join(cov.set_index("coverage_key"), on="coverage_key")
+        result = divergence(pl.from_pandas(p3df), engine="polars")
+        pd.testing.assert_frame_equal(result.to_pandas(), expected_df)
+
+        with self.assertRaises(TypeError):
+            divergence(df, cov.iloc[:2], engine="polars")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,80 @@
+# Copyright (C) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import itertools
+import unittest
+
+import pandas as pd
+
+from p3analysis.metrics import divergence, divergence_subsets
+
+from ._utils import _coverage
+
+
+class TestDivergenceSubsets(unittest.TestCase):
+    """
+    Test p3analysis.metrics.divergence_subsets functionality.
+    """
+
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "problem": ["test"] * 7,
+                "platform": ["A", "B", "C", "D", "A", "B", "C"],
+                "application": ["latest"] * 4 + ["best"] * 3,
+                "coverage": [
+                    _coverage([0, 1, 2, 3, 4, 5, 6, 7, 8, 9]),
+                    _coverage([0, 1, 2, 3, 4, 10, 11]),
+                    _coverage([5, 6, 7, 8, 9, 10, 11, 12]),
+                    _coverage([0, 1, 2], file="bar.cpp"),
+                    _coverage([0, 1, 2]),
+                    _coverage([0, 1, 2]),
+                    _coverage([]),
+                ],
+            },
+        )
+
+    def test_required_columns(self):
+        """Check that divergence_subsets() validates required columns."""
+        with self.assertRaises(ValueError):
+            divergence_subsets(pd.DataFrame(), pd.DataFrame())
+
+        with self.assertRaises(ValueError):
+            divergence_subsets(self.df, max_size=0)
+
+        with self.assertRaises(ValueError):
+            divergence_subsets(self.df, chunksize=0)
+
+    def test_divergence_subsets(self):
+        """Check that divergence_subsets() matches divergence()."""
+        result = divergence_subsets(self.df)
+        self.assertEqual(len(result), 2 * (2**4 - 1))
+
+        for size in range(1, 5):
+            for subset in itertools.combinations(["A", "B", "C", "D"], size):
+                actual = result[result["platforms"] == subset]
+                actual = actual.set_index(["problem", "application"])
+                df = self.df[self.df["platform"].isin(subset)]
+                expected = divergence(df).set_index(["problem", "application"])
+                for index, row in expected.iterrows():
+                    self.assertAlmostEqual(
+                        actual.loc[index, "divergence"],
+                        row["divergence"],
+                    )
+
+    def test_max_size(self):
+        """Check that divergence_subsets() respects max_size."""
+        result = divergence_subsets(self.df, max_size=2)
+        self.assertEqual(len(result), 2 * (4 + 6))
+        self.assertTrue((result["platforms"].apply(len) <= 2).all())
+
+    def test_chunksize(self):
+        """Check that divergence_subsets() streams results in chunks."""
+        chunks = list(divergence_subsets(self.df, chunksize=4))
+        self.assertTrue(len(chunks) > 1)
+        result = pd.concat(chunks, ignore_index=True)
+        pd.testing.assert_frame_equal(result, divergence_subsets(self.df))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,18 @@
 # Copyright (C) 2022-2023 Intel Corporation
 # SPDX-License-Identifier: MIT
 
+import importlib.util
+import os
+import tempfile
 import unittest
 
 import pandas as pd
 
 from p3analysis._utils import _cast_to_numeric
-from p3analysis.metrics import application_efficiency
+from p3analysis.metrics import (
+    application_efficiency,
+    application_efficiency_iter,
+)
 
 
 class TestEfficiency(unittest.TestCase):
@@ -145,6 +151,156 @@ class TestEfficiency(unittest.TestCase):
         expected_df = _cast_to_numeric(expected_df, ["fom", "app eff"])
         pd.testing.assert_frame_equal(result, expected_df)
 
+    def test_efficiency_iter(self):
+        """Check that chunked efficiencies match application_efficiency()."""
+        data = {
+            "problem": ["test"] * 10,
+            "platform": ["A", "B", "C", "D", "E"] * 2,
+            "application": ["latest"] * 5 + ["best"] * 5,
+            "fom": [25.0, 12.5, 25.0, None, 5.0]
+            + [25.0, 10.0, 12.5, 5.0, 1.0],
+            "date": list(range(10)),
+        }
+        df = pd.DataFrame(data)
+        chunks = [df.iloc[i : i + 3] for i in range(0, 10, 3)]
+
+        for foms in ["lower", "higher"]:
+            expected_df = application_efficiency(df, foms=foms)
+
+            result = application_efficiency_iter(chunks, foms=foms)
+            pd.testing.assert_frame_equal(pd.concat(result), expected_df)
+
+            result = application_efficiency_iter(lambda: iter(chunks), foms)
+            pd.testing.assert_frame_equal(pd.concat(result), expected_df)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "performance.csv")
+            df.to_csv(path, index=False)
+            result = application_efficiency_iter(path, chunksize=4)
+            result = pd.concat(result, ignore_index=True)
+        expected_df = application_efficiency(df)
+        pd.testing.assert_frame_equal(result, expected_df)
+
+        # Iterators can only be read once.
+        with self.assertRaises(TypeError):
+            application_efficiency_iter(iter(chunks))
+
+        with self.assertRaises(ValueError):
+            application_efficiency_iter(chunks, foms="invalid")
+
+        with self.assertRaises(ValueError):
+            application_efficiency_iter([pd.DataFrame()])
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("polars"),
+        "requires polars",
+    )
+    def test_efficiency_polars(self):
+        """Check that the polars engine matches the pandas engine."""
+        import polars as pl
+
+        data = {
+            "problem": ["test"] * 10,
+            "platform": ["A", "B", "C", "D", "E"] * 2,
+            "application": ["latest"] * 5 + ["best"] * 5,
+            "fom": [25.0, 12.5, 25.0, None, 5.0]
+            + [25.0, 10.0, 12.5, 5.0, 1.0],
+            "date": ["2023-01-01"] * 10,
+        }
+        df = pd.DataFrame(data)
+
+        for foms in ["lower", "higher"]:
+            expected_df = application_efficiency(df, foms=foms)
+
+            result = application_efficiency(df, foms=foms, engine="polars")
+            pd.testing.assert_frame_equal(result, expected_df)
+
+            result = application_efficiency(
+                pl.from_pandas(df),
+                foms=foms,
+                engine="polars",
+            )
+            self.assertIsInstance(result, pl.DataFrame)
+            pd.testing.assert_frame_equal(result.to_pandas(), expected_df)
+
+            result = application_efficiency(
+                pl.from_pandas(df).lazy(),
+                foms=foms,
+                engine="polars",
+            )
+            self.assertIsInstance(result, pl.LazyFrame)
+            pd.testing.assert_frame_equal(
+                result.collect().to_pandas(),
+                expected_df,
+            )
+
+        with self.assertRaises(ValueError):
+            application_efficiency(df, engine="invalid")
+
+        with self.assertRaises(ValueError):
+            application_efficiency(df, foms="invalid", engine="polars")
+
+        with self.assertRaises(ValueError):
+            application_efficiency(df.drop(columns="fom"), engine="polars")
+
+        with self.assertRaises(TypeError):
+            application_efficiency(df.astype(str), engine="polars")
+
+        with self.assertRaises(TypeError):
+            application_efficiency(data, engine="polars")
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("duckdb"),
+        "requires duckdb",
+    )
+    def test_efficiency_duckdb(self):
+        """Check that the duckdb engine matches the pandas engine."""
+        import duckdb
+
+        data = {
+            "problem": ["test"] * 10 + ["other"] * 2,
+            "platform": ["A", "B", "C", "D", "E"] * 2 + ["A", "B"],
+            "application": ["latest"] * 5 + ["best"] * 5 + ["latest"] * 2,
+            "fom": [25.0, 12.5, 25.0, None, 5.0]
+            + [25.0, 10.0, 12.5, 5.0, 1.0]
+            + [float("nan"), 2.0],
+            "date": ["2023-01-01"] * 12,
+        }
+        df = pd.DataFrame(data)
+        key = ["problem", "platform", "application"]
+
+        for foms in ["lower", "higher"]:
+            expected_df = application_efficiency(df, foms=foms)
+            expected_df = expected_df.sort_values(key, ignore_index=True)
+
+            result = application_efficiency(df, foms=foms, engine="duckdb")
+            result = result.sort_values(key, ignore_index=True)
+            pd.testing.assert_frame_equal(result, expected_df)
+
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "performance.parquet")
+                duckdb.from_df(df).write_parquet(path)
+                result = application_efficiency(
+                    path,
+                    foms=foms,
+                    engine="duckdb",
+                )
+                self.assertIsInstance(result, duckdb.DuckDBPyRelation)
+                result = result.df().sort_values(key, ignore_index=True)
+                pd.testing.assert_frame_equal(result, expected_df)
+
+        with self.assertRaises(ValueError):
+            application_efficiency(df, foms="invalid", engine="duckdb")
+
+        with self.assertRaises(ValueError):
+            application_efficiency(df.drop(columns="fom"), engine="duckdb")
+
+        with self.assertRaises(TypeError):
+            application_efficiency(df.astype(str), engine="duckdb")
+
+        with self.assertRaises(TypeError):
+            application_efficiency(data, engine="duckdb")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,11 +1,15 @@
 # Copyright (C) 2022-2023 Intel Corporation
 # SPDX-License-Identifier: MIT
 
+import importlib.util
+import os
+import tempfile
 import unittest
+from unittest import mock
 
 import pandas as pd
 
-from p3analysis.metrics import pp
+from p3analysis.metrics import _bootstrap, pp
 
 
 class TestPP(unittest.TestCase):
@@ -166,5 +170,191 @@ class TestPP(unittest.TestCase):
         with self.assertRaises(ValueError):
             _ = pp(df)
 
+    def test_pp_bootstrap(self):
+        """Check that pp() estimates confidence intervals from FOMs."""
+        data = {
+            "problem": ["test"] * 12,
+            "platform": ["A", "A", "A", "B", "B", "B"] * 2,
+            "application": ["latest"] * 6 + ["best"] * 6,
+            "fom": [2.0, 2.0, 2.0, 10.0, 12.0, 8.0]
+            + [1.0, 1.0, 1.0, 5.0, 6.0, 4.0],
+        }
+        df = pd.DataFrame(data)
+
+        result = pp(df, bootstrap=200, ci=0.9, seed=0)
+        self.assertEqual(
+            list(result.columns),
+            [
+                "problem",
+                "application",
+                "app pp",
+                "app pp lower",
+                "app pp upper",
+            ],
+        )
+        self.assertEqual(list(result["application"]), ["latest", "best"])
+
+        # Point estimates are calculated from mean FOMs.
+        latest = result.iloc[0]
+        best = result.iloc[1]
+        self.assertAlmostEqual(latest["app pp"], 0.5)
+        self.assertAlmostEqual(best["app pp"], 1.0)
+        self.assertAlmostEqual(best["app pp lower"], 1.0)
+        self.assertLessEqual(latest["app pp lower"], latest["app pp"])
+        self.assertGreaterEqual(latest["app pp upper"], latest["app pp"])
+        self.assertLess(latest["app pp lower"], latest["app pp upper"])
+
+        # Results depend only on the seed, not the number of jobs.
+        parallel = pp(df, bootstrap=1000, seed=0, n_jobs=4)
+        serial = pp(df, bootstrap=1000, seed=0)
+        pd.testing.assert_frame_equal(parallel, serial)
+
+        # Chunks of resamples are limited by the memory budget.
+        resample = mock.Mock(wraps=_bootstrap._resample_means)
+        with (
+            mock.patch.object(_bootstrap, "_MEMORY", 1024),
+            mock.patch.object(_bootstrap, "_resample_means", resample),
+        ):
+            parallel = pp(df, bootstrap=10, seed=0, n_jobs=4)
+            serial = pp(df, bootstrap=10, seed=0)
+        pd.testing.assert_frame_equal(parallel, serial)
+        self.assertEqual(resample.call_count, 20)
+        for call in resample.call_args_list:
+            self.assertEqual(call.args[3], 1)
+
+    def test_pp_bootstrap_invalid(self):
+        """Check that pp() validates bootstrap options."""
+        data = {
+            "problem": ["test"],
+            "platform": ["A"],
+            "application": ["latest"],
+            "fom": [1.0],
+        }
+        df = pd.DataFrame(data)
+
+        with self.assertRaises(ValueError):
+            pp(df, bootstrap=0)
+        with self.assertRaises(ValueError):
+            pp(df, bootstrap=10, ci=1.5)
+        with self.assertRaises(ValueError):
+            pp(df, bootstrap=10, foms="invalid")
+        with self.assertRaises(ValueError):
+            pp(df.drop(columns="fom"), bootstrap=10)
+
+        # Efficiency columns would be ignored, and are rejected instead
+        with self.assertRaises(ValueError):
+            pp(df.assign(**{"app eff": 1.0}), bootstrap=10)
+        with self.assertRaises(ValueError):
+            pp(df.assign(**{"arch eff": 1.0}), bootstrap=10)
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("polars"),
+        "requires polars",
+    )
+    def test_pp_polars(self):
+        """Check that the polars engine matches the pandas engine."""
+        import polars as pl
+
+        data = {
+            "problem": ["test"] * 13,
+            "platform": ["A", "B", "C", "D", "E"] * 2 + ["A", "B", "C"],
+            "application": ["latest"] * 5 + ["best"] * 5 + ["dummy"] * 3,
+            "app eff": [1.0, 0.8, 0.5, 1.0, 0.2]
+            + [1.0, 1.0, 1.0, 1.0, 1.0]
+            + [1.0, 0.8, 0.5],
+            "arch eff": [0.5] * 13,
+        }
+        df = pd.DataFrame(data)
+        expected_df = pp(df)
+
+        result = pp(df, engine="polars")
+        pd.testing.assert_frame_equal(result, expected_df)
+
+        result = pp(pl.from_pandas(df), engine="polars")
+        self.assertIsInstance(result, pl.DataFrame)
+        pd.testing.assert_frame_equal(result.to_pandas(), expected_df)
+
+        result = pp(pl.from_pandas(df).lazy(), engine="polars")
+        self.assertIsInstance(result, pl.LazyFrame)
+        pd.testing.assert_frame_equal(
+            result.collect().to_pandas(),
+            expected_df,
+        )
+
+        with self.assertRaises(ValueError):
+            pp(df, engine="invalid")
+
+        with self.assertRaises(ValueError):
+            pp(df, bootstrap=10, engine="polars")
+
+        with self.assertRaises(ValueError):
+            pp(df.drop(columns=["app eff", "arch eff"]), engine="polars")
+
+        invalid = df.copy()
+        invalid["app eff"] = invalid["app eff"] * 100
+        with self.assertRaises(ValueError):
+            pp(invalid, engine="polars")
+
+        with self.assertRaises(ValueError):
+            pp(pd.concat([df, df.assign(**{"app eff": 0.1})]), engine="polars")
+
+        with self.assertRaises(TypeError):
+            pp(df.astype({"app eff": str}), engine="polars")
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("duckdb"),
+        "requires duckdb",
+    )
+    def test_pp_duckdb(self):
+        """Check that the duckdb engine matches the pandas engine."""
+        import duckdb
+
+        data = {
+            "problem": ["test"] * 13 + ["other"] * 5,
+            "platform": ["A", "B", "C", "D", "E"] * 2
+            + ["A", "B", "C"]
+            + ["A", "B", "C", "D", "E"],
+            "application": ["latest"] * 5
+            + ["best"] * 5
+            + ["dummy"] * 3
+            + ["latest"] * 5,
+            "app eff": [1.0, 0.8, 0.5, 1.0, 0.2]
+            + [1.0, 1.0, 1.0, 1.0, 1.0]
+            + [1.0, 0.8, 0.5]
+            + [1.0, 0.8, 0.5, 1.0, 0.2],
+            "arch eff": [0.5] * 18,
+        }
+        df = pd.DataFrame(data)
+        key = ["problem", "application"]
+        expected_df = pp(df).sort_values(key, ignore_index=True)
+
+        result = pp(df, engine="duckdb")
+        pd.testing.assert_frame_equal(result, expected_df)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "efficiency.parquet")
+            duckdb.from_df(df).write_parquet(path)
+            result = pp(path, engine="duckdb")
+            self.assertIsInstance(result, duckdb.DuckDBPyRelation)
+            pd.testing.assert_frame_equal(result.df(), expected_df)
+
+        with self.assertRaises(ValueError):
+            pp(df, bootstrap=10, engine="duckdb")
+
+        with self.assertRaises(ValueError):
+            pp(df.drop(columns=["app eff", "arch eff"]), engine="duckdb")
+
+        invalid = df.copy()
+        invalid["app eff"] = invalid["app eff"] * 100
+        with self.assertRaises(ValueError):
+            pp(invalid, engine="duckdb")
+
+        with self.assertRaises(ValueError):
+            pp(pd.concat([df, df.assign(**{"app eff": 0.1})]), engine="duckdb")
+
+        with self.assertRaises(TypeError):
+            pp(df.astype({"app eff": str}), engine="duckdb")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,98 @@
+# Copyright (C) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import itertools
+import unittest
+
+import pandas as pd
+
+from p3analysis.metrics import pp, pp_subsets
+
+
+class TestPPSubsets(unittest.TestCase):
+    """
+    Test p3analysis.metrics.pp_subsets functionality.
+    """
+
+    def setUp(self):
+        data = {
+            "problem": ["test"] * 10,
+            "platform": ["A", "B", "C", "D", "E"] * 2,
+            "application": ["latest"] * 5 + ["best"] * 5,
+            "app eff": [1.0, 0.8, 0.5, 0.0, 0.2] + [1.0, 1.0, 1.0, 0.5, 1.0],
+            "arch eff": [0.5] * 10,
+        }
+        self.df = pd.DataFrame(data)
+
+    def test_required_columns(self):
+        """Check that pp_subsets() validates required columns."""
+        with self.assertRaises(ValueError):
+            pp_subsets(pd.DataFrame())
+
+        with self.assertRaises(ValueError):
+            pp_subsets(self.df, max_size=0)
+
+        with self.assertRaises(ValueError):
+            pp_subsets(self.df, chunksize=0)
+
+    def test_pp_subsets(self):
+        """Check that pp_subsets() matches pp() for every subset."""
+        result = pp_subsets(self.df)
+        self.assertEqual(len(result), 2 * (2**5 - 1))
+
+        platforms = ["A", "B", "C", "D", "E"]
+        for size in range(1, 6):
+            for subset in itertools.combinations(platforms, size):
+                df = self.df[self.df["platform"].isin(subset)]
+                expected = pp(df)
+                actual = result[result["platforms"] == subset]
+                actual = actual.drop(columns="platforms")
+                actual = actual.set_index(["problem", "application"])
+                expected = expected.set_index(["problem", "application"])
+                pd.testing.assert_frame_equal(
+                    actual.loc[expected.index],
+                    expected,
+                )
+
+    def test_missing_applications(self):
+        """Check that pp_subsets() matches pp() for missing applications."""
+        data = {
+            "problem": ["small"] * 6 + ["large"] * 3,
+            "platform": ["A", "B", "C"] * 3,
+            "application": ["latest"] * 3 + ["best"] * 3 + ["latest"] * 3,
+            "app eff": [1.0, 0.8, 0.5] + [1.0, 1.0, 0.5] + [1.0, 0.8, 0.5],
+        }
+        df = pd.DataFrame(data)
+        result = pp_subsets(df)
+        self.assertEqual(len(result), 4 * (2**3 - 1))
+
+        for size in range(1, 4):
+            for subset in itertools.combinations(["A", "B", "C"], size):
+                expected = pp(df[df["platform"].isin(subset)])
+                expected = expected.set_index(["problem", "application"])
+                actual = result[result["platforms"] == subset]
+                actual = actual.drop(columns="platforms")
+                actual = actual.set_index(["problem", "application"])
+                self.assertEqual(len(actual), len(expected))
+                pd.testing.assert_frame_equal(
+                    actual.loc[expected.index],
+                    expected,
+                )
+                self.assertEqual(actual.loc[("large", "best"), "app pp"], 0)
+
+    def test_max_size(self):
+        """Check that pp_subsets() respects max_size."""
+        result = pp_subsets(self.df, max_size=2)
+        self.assertEqual(len(result), 2 * (5 + 10))
+        self.assertTrue((result["platforms"].apply(len) <= 2).all())
+
+    def test_chunksize(self):
+        """Check that pp_subsets() streams the same results in chunks."""
+        chunks = list(pp_subsets(self.df, chunksize=8))
+        self.assertTrue(len(chunks) > 1)
+        result = pd.concat(chunks, ignore_index=True)
+        pd.testing.assert_frame_equal(result, pp_subsets(self.df))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+# Copyright (C) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import pstats
+import tempfile
+import unittest
+
+import matplotlib.pyplot as plt
+import pandas as pd
+
+import p3analysis.profiling._profile as _profile
+from p3analysis.metrics import application_efficiency, divergence
+from p3analysis.profiling import add_callback, profile, remove_callback
+from p3analysis.report import snapshot
+
+
+class TestProfile(unittest.TestCase):
+    """
+    Test p3analysis.profiling functionality.
+    """
+
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "problem": ["test"] * 4,
+                "platform": ["A", "B", "A", "B"],
+                "application": ["latest"] * 2 + ["best"] * 2,
+                "fom": [1.0, 2.0, 2.0, 1.0],
+                "coverage_key": ["source1", "source2", "source1", "source1"],
+            },
+        )
+        coverage = [
+            [
+                {
+                    "file": "foo.cpp",
+                    "id": "0",
+                    "used_lines": [[0, 9]],
+                    "unused_lines": [],
+                },
+            ],
+            [
+                {
+                    "file": "foo.cpp",
+                    "id": "0",
+                    "used_lines": [[5, 14]],
+                    "unused_lines": [],
+                },
+            ],
+        ]
+        self.cov = pd.DataFrame(
+            {
+                "coverage_key": ["source1", "source2"],
+                "coverage": [json.dumps(c) for c in coverage],
+            },
+        )
+
+    def test_stages(self):
+        """p3analysis.profiling.profile records stages"""
+        with profile() as profiler:
+            divergence(self.df, self.cov)
+        self.assertFalse(_profile._enabled)
+
+        records = profiler.to_dataframe()
+        self.assertEqual(
+            list(records.columns),
+            ["stage", "parent", "wall time", "cpu time", "rows"],
+        )
+        self.assertEqual(
+            records["stage"].tolist(),
+            ["parse_coverage", "divergence"],
+        )
+        self.assertEqual(
+            [record["parent"] for record in profiler.records],
+            ["divergence", None],
+        )
+        self.assertEqual(records["rows"].tolist(), [2, 4])
+        self.assertTrue((records["wall time"] >= 0).all())
+
+        # Stages outside of the profiler are not recorded
+        divergence(self.df, self.cov)
+        self.assertEqual(len(profiler.records), 2)
+
+    def test_snapshot(self):
+        """p3analysis.profiling.profile records nested stages"""
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = os.path.join(tmp, "snapshot")
+            with profile() as profiler:
+                snapshot(self.df, self.cov, directory)
+        plt.close("all")
+
+        records = profiler.to_dataframe()
+        self.assertEqual(records["stage"].iloc[-1], "snapshot")
+        stages = set(records["stage"])
+        for stage in [
+            "application_efficiency",
+            "pp",
+            "divergence",
+            "cascade",
+            "navchart",
+            "savefig",
+        ]:
+            self.assertIn(stage, stages)
+        nested = records[records["stage"] != "snapshot"]
+        self.assertTrue(nested["parent"].notna().all())
+
+    def test_memory(self):
+        """p3analysis.profiling.profile records peak memory"""
+        with profile(memory=True) as profiler:
+            application_efficiency(self.df)
+
+        records = profiler.to_dataframe()
+        self.assertIn("peak memory", records.columns)
+        self.assertTrue((records["peak memory"] >= 0).all())
+
+    def test_cprofile(self):
+        """p3analysis.profiling.profile records cProfile statistics"""
+        with profile(cprofile=True) as profiler:
+            divergence(self.df, self.cov)
+
+        records = profiler.to_dataframe()
+        self.assertIn("profile", records.columns)
+        for stats in records["profile"]:
+            self.assertIsInstance(stats, pstats.Stats)
+
+    def test_callback(self):
+        """p3analysis.profiling.add_callback"""
+        records = []
+        add_callback(records.append)
+        try:
+            application_efficiency(self.df)
+        finally:
+            remove_callback(records.append)
+        self.assertFalse(_profile._enabled)
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["stage"], "application_efficiency")
+        self.assertEqual(records[0]["rows"], 4)
+
+        application_efficiency(self.df)
+        self.assertEqual(len(records), 1)
+
+        with self.assertRaises(TypeError):
+            add_callback("not callable")
+
+        with self.assertRaises(ValueError):
+            remove_callback(records.append)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,253 @@
+# Copyright (C) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from p3analysis.report import snapshot
+from p3analysis.report._snapshot import _tmpdir
+
+
+class TestSnapshot(unittest.TestCase):
+    """
+    Test p3analysis.report.snapshot functionality.
+    """
+
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "problem": ["test"] * 4,
+                "platform": ["A", "B", "A", "B"],
+                "application": ["latest"] * 2 + ["best"] * 2,
+                "fom": [1.0, 2.0, 2.0, 1.0],
+                "coverage_key": ["source1", "source2", "source1", "source1"],
+            },
+        )
+        coverage = [
+            [
+                {
+                    "file": "foo.cpp",
+                    "id": "0",
+                    "used_lines": [[0, 9]],
+                    "unused_lines": [],
+                },
+            ],
+            [
+                {
+                    "file": "foo.cpp",
+                    "id": "0",
+                    "used_lines": [[5, 14]],
+                    "unused_lines": [],
+                },
+            ],
+        ]
+        self.cov = pd.DataFrame(
+            {
+                "coverage_key": ["source1", "source2"],
+                "coverage": [json.dumps(c) for c in coverage],
+            },
+        )
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, "snapshot")
+
+    def tearDown(self):
+        plt.close("all")
+        self.tmp.cleanup()
+
+    def test_required_columns(self):
+        """Check that snapshot() validates required columns."""
+        with self.assertRaises(ValueError):
+            snapshot(pd.DataFrame(), self.cov, self.directory)
+
+        with self.assertRaises(ValueError):
+            snapshot(self.df, pd.DataFrame(), self.directory)
+
+    def test_snapshot(self):
+        """Check that snapshot() generates a report."""
+        snapshot(self.df, self.cov, self.directory)
+        files = sorted(os.listdir(self.directory))
+        self.assertEqual(
+            files,
+            ["cascade.png", "index.html", "manifest.json", "navchart.png"],
+        )
+
+        with open(os.path.join(self.directory, "index.html")) as fp:
+            html = fp.read()
+        self.assertIn("<td>latest</td><td>{A, B}</td><td>5</td>", html)
+        self.assertIn("<td>best</td><td>{A, B}</td><td>10</td>", html)
+
+        with self.assertRaises(FileExistsError):
+            snapshot(self.df, self.cov, self.directory)
+
+    def test_snapshot_update(self):
+        """Check that snapshot() only regenerates outdated files."""
+        names = ["cascade.png", "navchart.png", "index.html"]
+
+        def inodes():
+            return {
+                name: os.stat(os.path.join(self.directory, name)).st_ino
+                for name in names
+            }
+
+        def changed(before):
+            after = inodes()
+            return sorted(
+                name for name in names if before[name] != after[name]
+            )
+
+        # A new directory is created if required
+        snapshot(self.df, self.cov, self.directory, update=True)
+        plt.close("all")
+
+        before = inodes()
+        snapshot(self.df, self.cov, self.directory, update=True)
+        self.assertEqual(changed(before), [])
+
+        # Changing performance data does not affect the table
+        self.df.loc[0, "fom"] = 0.5
+        before = inodes()
+        snapshot(self.df, self.cov, self.directory, update=True)
+        plt.close("all")
+        self.assertEqual(changed(before), ["cascade.png", "navchart.png"])
+
+        # Changing coverage data does not affect the cascade
+        coverage = [
+            {
+                "file": "foo.cpp",
+                "id": "0",
+                "used_lines": [[5, 19]],
+                "unused_lines": [],
+            },
+        ]
+        self.cov.loc[1, "coverage"] = json.dumps(coverage)
+        before = inodes()
+        snapshot(self.df, self.cov, self.directory, update=True)
+        plt.close("all")
+        self.assertEqual(changed(before), ["index.html", "navchart.png"])
+        with open(os.path.join(self.directory, "index.html")) as fp:
+            self.assertIn("<td>latest</td><td>{B}</td><td>10</td>", fp.read())
+
+        # Missing files are regenerated
+        os.remove(os.path.join(self.directory, "index.html"))
+        snapshot(self.df, self.cov, self.directory, update=True)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.directory, "index.html")),
+        )
+
+        files = [f for f in os.listdir(self.directory) if f.endswith(".tmp")]
+        self.assertEqual(files, [])
+
+        with self.assertRaises(ValueError):
+            snapshot(self.df, self.cov, update=True)
+
+    def test_snapshot_svg_inline(self):
+        """Check that snapshot() can embed figures in a single file."""
+        snapshot(self.df, self.cov, self.directory, format="svg-inline")
+        files = sorted(os.listdir(self.directory))
+        self.assertEqual(files, ["index.html", "manifest.json"])
+
+        with open(os.path.join(self.directory, "index.html")) as fp:
+            html = fp.read()
+        self.assertEqual(html.count("<svg"), 2)
+        self.assertNotIn("<?xml", html)
+        self.assertNotIn("<img", html)
+        self.assertIn("<td>latest</td><td>{A, B}</td><td>5</td>", html)
+
+        with self.assertRaises(ValueError):
+            snapshot(self.df, self.cov, format="pdf")
+
+    def test_snapshot_update_format(self):
+        """Check that snapshot() updates reports in a different format."""
+        snapshot(self.df, self.cov, self.directory, update=True)
+        plt.close("all")
+
+        snapshot(
+            self.df,
+            self.cov,
+            self.directory,
+            update=True,
+            format="svg-inline",
+        )
+        plt.close("all")
+        files = sorted(os.listdir(self.directory))
+        self.assertEqual(files, ["index.html", "manifest.json"])
+
+        # An up-to-date report is not regenerated
+        index = os.path.join(self.directory, "index.html")
+        before = os.stat(index).st_ino
+        snapshot(
+            self.df,
+            self.cov,
+            self.directory,
+            update=True,
+            format="svg-inline",
+        )
+        self.assertEqual(os.stat(index).st_ino, before)
+
+        snapshot(self.df, self.cov, self.directory, update=True)
+        files = sorted(os.listdir(self.directory))
+        self.assertEqual(
+            files,
+            ["cascade.png", "index.html", "manifest.json", "navchart.png"],
+        )
+        with open(index) as fp:
+            self.assertIn('<img src="cascade.png"', fp.read())
+
+    def test_snapshot_compact(self):
+        """Check that snapshot() can generate a compact table."""
+        snapshot(
+            self.df,
+            self.cov,
+            self.directory,
+            table="compact",
+            max_sets=1,
+        )
+        with open(os.path.join(self.directory, "index.html")) as fp:
+            html = fp.read()
+        self.assertNotIn("<td>", html)
+
+        start = html.index('<script type="application/json"')
+        start = html.index(">", start) + 1
+        end = html.index("</script>", start)
+        rows = json.loads(html[start:end])["rows"]
+        self.assertEqual(len(rows), 3)
+        self.assertIn(["best", "{A, B}", 10], rows)
+        self.assertEqual(rows[-1], ["latest", "(2 other platform sets)", 10])
+
+        with self.assertRaises(ValueError):
+            snapshot(self.df, self.cov, table="paginated")
+
+        with self.assertRaises(ValueError):
+            snapshot(self.df, self.cov, table="compact", max_sets=0)
+
+    def test_tmpdir(self):
+        """Check that snapshot directories are allocated atomically."""
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+        # Directories are numbered after the highest existing directory
+        os.mkdir("snapshot000")
+        os.mkdir("snapshot005")
+        open("snapshot999.html", "w").close()
+        self.assertEqual(_tmpdir("snapshot"), "snapshot006")
+        self.assertTrue(os.path.isdir("snapshot006"))
+
+        # Concurrent callers never receive the same directory
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            names = list(executor.map(_tmpdir, ["snapshot"] * 32))
+        self.assertEqual(len(set(names)), 32)
+        self.assertTrue(all(os.path.isdir(name) for name in names))
+
+        snapshot(self.df, self.cov)
+        self.assertTrue(os.path.exists("snapshot039/index.html"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+# Copyright (C) 2022-2023 Intel Corporation
+# SPDX-License-Identifier: MIT
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+import p3analysis.plot
+from p3analysis._cli import _run_problem, main
+from p3analysis.data import synthetic
+from p3analysis.metrics import application_efficiency, pp
+
+
+class TestCommandLine(unittest.TestCase):
+    """
+    Test the p3analysis command-line interface.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        data = os.path.join(self.tmp.name, "data")
+        synthetic(
+            n_problems=2,
+            n_platforms=3,
+            n_applications=2,
+            n_lines=50,
+            seed=0,
+            directory=data,
+        )
+        self.performance = os.path.join(data, "performance.csv")
+        self.coverage = os.path.join(data, "coverage.csv")
+        self.output = os.path.join(self.tmp.name, "output")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_main(self, *args):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            status = main(
+                [
+                    self.performance,
+                    "--coverage",
+                    self.coverage,
+                    "--output",
+                    self.output,
+                    *args,
+                ],
+            )
+        return status, stdout.getvalue()
+
+    def test_main(self):
+        """p3analysis._cli.main"""
+        status, stdout = self.run_main()
+        self.assertEqual(status, 0)
+        self.assertIn("Stage timing summary", stdout)
+        self.assertIn("divergence", stdout)
+
+        df = pd.read_csv(self.performance)
+        expected = pd.concat(
+            [
+                pp(application_efficiency(group))
+                for _, group in df.groupby("problem")
+            ],
+            ignore_index=True,
+        )
+        result = pd.read_csv(os.path.join(self.output, "pp.csv"))
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+        divergence = pd.read_csv(os.path.join(self.output, "divergence.csv"))
+        self.assertEqual(len(divergence), 4)
+
+        problems = os.listdir(os.path.join(self.output, "problems"))
+        self.assertEqual(len(problems), 2)
+        for problem in problems:
+            directory = os.path.join(self.output, "problems", problem)
+            for name in ["cascade.png", "navchart.png", "manifest.json"]:
+                self.assertTrue(os.path.exists(os.path.join(directory, name)))
+
+    def test_resume(self):
+        """Check that complete problems are skipped."""
+        self.run_main()
+
+        status, stdout = self.run_main()
+        self.assertEqual(status, 0)
+        self.assertIn("Skipping 2 problem(s)", stdout)
+
+        # Changing the data for one problem only repeats that problem
+        df = pd.read_csv(self.performance)
+        df.loc[0, "fom"] = 1000.0
+        df.to_csv(self.performance, index=False)
+        status, stdout = self.run_main()
+        self.assertEqual(status, 0)
+        self.assertIn("Skipping 1 problem(s)", stdout)
+        self.assertIn("[1/1]", stdout)
+
+        status, stdout = self.run_main("--restart")
+        self.assertNotIn("Skipping", stdout)
+
+    def test_resume_failure(self):
+        """Check that stale results of failed problems are not combined."""
+        self.run_main()
+
+        # Changing the data for one problem, which then fails
+        df = pd.read_csv(self.performance)
+        problem = df.loc[0, "problem"]
+        df.loc[0, "fom"] = 1000.0
+        df.to_csv(self.performance, index=False)
+
+        def run_problem(task):
+            if task["problem"] == problem:
+                raise RuntimeError("failed")
+            return _run_problem(task)
+
+        with mock.patch("p3analysis._cli._run_problem", run_problem):
+            status, stdout = self.run_main()
+        self.assertEqual(status, 1)
+        self.assertIn("failed", stdout)
+
+        result = pd.read_csv(os.path.join(self.output, "pp.csv"))
+        self.assertNotIn(problem, result["problem"].tolist())
+        self.assertEqual(len(result["problem"].unique()), 1)
+
+        # The failed problem is repeated by the next run
+        status, stdout = self.run_main()
+        self.assertEqual(status, 0)
+        self.assertIn("Skipping 1 problem(s)", stdout)
+        result = pd.read_csv(os.path.join(self.output, "pp.csv"))
+        self.assertIn(problem, result["problem"].tolist())
+
+    def test_jobs(self):
+        """Check that parallel runs produce the same results."""
+        self.run_main()
+        expected = pd.read_csv(os.path.join(self.output, "efficiency.csv"))
+
+        status, stdout = self.run_main("--restart", "--jobs", "2")
+        self.assertEqual(status, 0)
+        self.assertIn("[2/2]", stdout)
+        result = pd.read_csv(os.path.join(self.output, "efficiency.csv"))
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_snapshot(self):
+        """Check that snapshots are generated for each problem."""
+        status, _ = self.run_main("--snapshot")
+        self.assertEqual(status, 0)
+        for problem in os.listdir(os.path.join(self.output, "problems")):
+            index = os.path.join(
+                self.output,
+                "problems",
+                problem,
+                "snapshot",
+                "index.html",
+            )
+            self.assertTrue(os.path.exists(index))
+
+    def test_snapshot_foms(self):
+        """Check that snapshots use the same FOM interpretation."""
+        navchart = p3analysis.plot.navchart
+        with mock.patch("p3analysis.plot.navchart", wraps=navchart) as m:
+            status, _ = self.run_main("--foms", "higher", "--snapshot")
+        self.assertEqual(status, 0)
+
+        # The CLI and the snapshot each plot a navchart for every problem
+        self.assertEqual(m.call_count, 4)
+        expected = pd.read_csv(os.path.join(self.output, "pp.csv"))
+        expected = expected.set_index(["problem", "application"])
+        for call in m.call_args_list:
+            result = call.args[0].set_index(["problem", "application"])
+            pd.testing.assert_series_equal(
+                result["app pp"].sort_index(),
+                expected.loc[result.index, "app pp"].sort_index(),
+                check_dtype=False,
+                check_index_type=False,
+            )
+
+    def test_invalid(self):
+        """Check that invalid arguments are rejected."""
+        with contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                self.run_main("--jobs", "0")
+
+            with self.assertRaises(SystemExit):
+                main([self.performance, "--snapshot"])
+
+
+if __name__ == "__main__":
+    unittest.main()